@@ -0,0 +1,166 @@
+"""
+Öğrenci bazlı not ve ödev analitiği.
+
+Bir öğrencinin (veya bir grup öğrencinin) sınav sonuçları ve teslimleri tek
+seferde yüklenir; ders ortalamaları, son sonuçlar, not histogramı, geç
+teslimler ve teslim sayıları bu anlık görüntüden bellekte türetilir. Böylece
+danışman sayfaları aynı tabloyu farklı filtrelerle tekrar tekrar sorgulamaz.
+"""
+from collections import defaultdict
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+from functools import cached_property
+
+from django.utils import timezone
+
+from .models import Assignment, CourseThreshold, ExamResult, Submission
+from .stats import DEFAULT_THRESHOLDS
+
+# (etiket, alt sınır); bir not alt sınırı karşılayan son kovaya düşer.
+HISTOGRAM_BUCKETS = [
+    ("0-49", Decimal("0")),
+    ("50-59", Decimal("50")),
+    ("60-69", Decimal("60")),
+    ("70-84", Decimal("70")),
+    ("85-100", Decimal("85")),
+]
+_OLDEST = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def _average(scores):
+    return sum(scores) / len(scores) if scores else None
+
+
+def _pass_min(course):
+    try:
+        return course.threshold.pass_min
+    except CourseThreshold.DoesNotExist:
+        return DEFAULT_THRESHOLDS["pass_min"]
+
+
+class StudentAnalytics:
+    def __init__(self, student, exam_results, submissions, now=None):
+        self.student = student
+        # Ders kodu, sınav tarihi sırasıyla.
+        self.exam_results = exam_results
+        # En yeni teslim önce.
+        self.submissions = submissions
+        self.now = now or timezone.now()
+
+    @classmethod
+    def load(cls, student, now=None):
+        """Tek öğrenci için iki sorguda anlık görüntü."""
+        return cls.load_many([student], now=now)[student.id]
+
+    @classmethod
+    def load_many(cls, students, now=None):
+        """{öğrenci_id: StudentAnalytics}; öğrenci sayısından bağımsız olarak iki sorgu."""
+        students = list(students)
+        results = defaultdict(list)
+        for res in (
+            ExamResult.objects.filter(student__in=students)
+            .select_related("exam__course__threshold")
+            .order_by("exam__course__code", "exam__scheduled_at", "exam__id")
+        ):
+            results[res.student_id].append(res)
+        submissions = defaultdict(list)
+        for sub in (
+            Submission.objects.filter(student__in=students)
+            .select_related("assignment__course")
+            .order_by("-submitted_at")
+        ):
+            submissions[sub.student_id].append(sub)
+        return {
+            student.id: cls(student, results[student.id], submissions[student.id], now=now)
+            for student in students
+        }
+
+    @cached_property
+    def _scores_by_course(self):
+        scores = defaultdict(list)
+        for res in self.exam_results:
+            if res.score is not None:
+                scores[res.exam.course_id].append(res.score)
+        return scores
+
+    def course_averages(self):
+        """
+        Sonucu olan her ders için {course_id, code, name, avg_score, pass_min, at_risk},
+        ders koduna göre sıralı; at_risk ortalamanın dersin geçme eşiğinin altında olmasıdır.
+        """
+        scores = self._scores_by_course
+        courses = {}
+        for res in self.exam_results:
+            courses.setdefault(res.exam.course_id, res.exam.course)
+        rows = []
+        for course_id, course in courses.items():
+            avg_score = _average(scores.get(course_id, []))
+            pass_min = _pass_min(course)
+            rows.append({
+                "course_id": course_id,
+                "code": course.code,
+                "name": course.name,
+                "avg_score": avg_score,
+                "pass_min": pass_min,
+                "at_risk": avg_score is not None and avg_score < pass_min,
+            })
+        return rows
+
+    def course_average(self, course_id):
+        return _average(self._scores_by_course.get(course_id, []))
+
+    def overall_average(self):
+        return _average([res.score for res in self.exam_results if res.score is not None])
+
+    def recent_exam_results(self, limit=5):
+        """Son güncellenen limit sonuç, eskiden yeniye."""
+        recent = sorted(self.exam_results, key=lambda res: res.updated_at, reverse=True)[:limit]
+        recent.reverse()
+        return recent
+
+    def recent_assignment_results(self, limit=5):
+        """Son notlanan limit teslim, eskiden yeniye."""
+        graded = [sub for sub in self.submissions if sub.score is not None]
+        graded.sort(key=lambda sub: (sub.graded_at or _OLDEST, sub.submitted_at), reverse=True)
+        recent = graded[:limit]
+        recent.reverse()
+        return recent
+
+    def histogram(self):
+        """[{label, count, width}] — width en kalabalık kovaya göre yüzde."""
+        counts = [0] * len(HISTOGRAM_BUCKETS)
+        for res in self.exam_results:
+            if res.score is None or res.score < 0:
+                continue
+            index = 0
+            for position, (_, low) in enumerate(HISTOGRAM_BUCKETS):
+                if res.score >= low:
+                    index = position
+            counts[index] += 1
+        max_count = max(counts) if counts else 0
+        return [
+            {"label": label, "count": count, "width": int(count / max_count * 100) if max_count else 0}
+            for (label, _), count in zip(HISTOGRAM_BUCKETS, counts)
+        ]
+
+    def late_submissions(self):
+        return [
+            sub for sub in self.submissions
+            if sub.assignment.due_at and sub.submitted_at and sub.submitted_at > sub.assignment.due_at
+        ]
+
+    def submission_counts(self):
+        return {
+            "total": len(self.submissions),
+            "graded": sum(1 for sub in self.submissions if sub.score is not None),
+        }
+
+    def overdue_assignments(self):
+        """Süresi geçmiş ve teslim edilmemiş ödevler (tek sorgu; teslimler anlık görüntüden)."""
+        submitted = {sub.assignment_id for sub in self.submissions}
+        return list(
+            Assignment.objects.filter(course__students=self.student, due_at__lt=self.now)
+            .exclude(id__in=submitted)
+            .select_related("course")
+            .order_by("due_at")
+        )
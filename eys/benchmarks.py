@@ -0,0 +1,203 @@
+"""
+View seviyesinde performans ölçümü.
+
+Sentetik üniversite (eys.datagen) üzerinde ana sayfalar Django test
+istemcisiyle tekrar tekrar çağrılır; her senaryo için p50/p95 gecikme, SQL
+sorgu sayısı ve tepe bellek (tracemalloc) kaydedilir. Sonuçlar JSON baseline
+ile karşılaştırılır: gecikme ve bellek yüzde tolerans, sorgu sayısı mutlak
+tolerans ile denetlenir. Komut arayüzü: `manage.py run_benchmarks`.
+"""
+from dataclasses import asdict
+import json
+import statistics
+import time
+import tracemalloc
+
+from django.db import connection
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import Assignment, Course, Exam, User
+
+BASELINE_VERSION = 1
+# Ölçüm komutları test veritabanı kullanır; önbellekleri de paylaşılan önbellekten ayrı tutulur.
+ISOLATED_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+# Küçük ölçümlerde gürültü gerileme sayılmasın diye bellek karşılaştırmasına eklenen pay.
+MEMORY_SLACK_KIB = 64
+
+# (senaryo adı, kullanıcı anahtarı, url üreticisi)
+SCENARIOS = [
+    ("student_dashboard", "student", lambda t: reverse("student_dashboard")),
+    ("student_courses", "student", lambda t: reverse("student_courses")),
+    ("student_course_detail", "student", lambda t: reverse("student_course_detail", args=[t["student_course"]])),
+    ("student_calendar", "student", lambda t: reverse("student_calendar")),
+    ("student_assignments", "student", lambda t: reverse("student_assignments")),
+    ("notifications", "student", lambda t: reverse("notifications")),
+    ("global_search", "student", lambda t: reverse("global_search") + "?q=Algoritmalar"),
+    ("teacher_dashboard", "teacher", lambda t: reverse("teacher_dashboard")),
+    ("course_detail", "teacher", lambda t: reverse("course_detail", args=[t["course"]])),
+    ("teacher_calendar", "teacher", lambda t: reverse("teacher_calendar")),
+    ("exam_detail", "teacher", lambda t: reverse("exam_detail", args=[t["exam"]])),
+    ("manage_exam_scores", "teacher", lambda t: reverse("manage_exam_scores", args=[t["exam"]])),
+    ("export_exam_scores_csv", "teacher", lambda t: reverse("export_exam_scores_csv", args=[t["exam"]])),
+    ("teacher_assignment_detail", "teacher",
+     lambda t: reverse("teacher_assignment_detail", args=[t["assignment"]])),
+    ("export_submissions_csv", "teacher", lambda t: reverse("export_submissions_csv", args=[t["assignment"]])),
+    ("export_submissions_zip", "teacher", lambda t: reverse("export_submissions_zip", args=[t["assignment"]])),
+    ("advisor_students", "advisor", lambda t: reverse("advisor_students")),
+    ("advisor_student_detail", "advisor", lambda t: reverse("advisor_student_detail", args=[t["advisee"]])),
+    ("department_overview", "head", lambda t: reverse("department_overview")),
+    ("department_courses", "head", lambda t: reverse("department_courses")),
+    ("department_instructors", "head", lambda t: reverse("department_instructors")),
+    ("department_course_detail", "head", lambda t: reverse("department_course_detail", args=[t["course"]])),
+]
+
+
+class BenchmarkError(Exception):
+    pass
+
+
+def collect_targets(prefix):
+    """Üretilmiş veriden her senaryonun kullanıcısını ve nesnelerini seçer (en kalabalık ders)."""
+    course = (
+        Course.objects.filter(code__startswith=f"{prefix.upper()}-")
+        .annotate(enrolled=Count("students")).order_by("-enrolled", "id").first()
+    )
+    if course is None:
+        raise BenchmarkError(f"'{prefix}' önekiyle üretilmiş ders yok; önce generate_university çalıştırın.")
+    exam = (
+        Exam.objects.filter(course=course, scheduled_at__lte=timezone.now()).order_by("-scheduled_at").first()
+        or Exam.objects.filter(course=course).order_by("scheduled_at").first()
+    )
+    assignment = Assignment.objects.filter(course=course).order_by("id").first()
+    student = course.students.order_by("id").first()
+    advisor = User.objects.get(username=f"{prefix}_adv0")
+    advisee = User.objects.filter(advisor=advisor).order_by("id").first()
+    if not (exam and assignment and student and advisee):
+        raise BenchmarkError("Üretilmiş veri senaryolar için yetersiz (sınav, ödev, öğrenci veya danışan eksik).")
+    return {
+        "users": {
+            "student": student,
+            "teacher": course.instructor,
+            "advisor": advisor,
+            "head": User.objects.get(username=f"{prefix}_head"),
+        },
+        "course": course.id,
+        "student_course": course.id,
+        "exam": exam.id,
+        "assignment": assignment.id,
+        "advisee": advisee.id,
+    }
+
+
+def _request(client, url):
+    response = client.get(url)
+    if response.status_code != 200:
+        raise BenchmarkError(f"{url} {response.status_code} döndü.")
+    # Akışlı yanıtlarda asıl iş gövde tüketilirken yapılır.
+    for _ in response.streaming_content if response.streaming else [response.content]:
+        pass
+    response.close()
+
+
+def _percentile(samples, fraction):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def measure(client, url, iterations=20, warmup=2):
+    for _ in range(warmup):
+        _request(client, url)
+
+    with CaptureQueriesContext(connection) as ctx:
+        _request(client, url)
+    query_count = len(ctx.captured_queries)
+
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        _request(client, url)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    already_tracing = tracemalloc.is_tracing()
+    if not already_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline_memory = tracemalloc.get_traced_memory()[0]
+    try:
+        _request(client, url)
+        peak = tracemalloc.get_traced_memory()[1] - baseline_memory
+    finally:
+        if not already_tracing:
+            tracemalloc.stop()
+
+    return {
+        "p50_ms": round(statistics.median(timings), 2),
+        "p95_ms": round(_percentile(timings, 0.95), 2),
+        "queries": query_count,
+        "peak_kib": round(max(peak, 0) / 1024, 1),
+    }
+
+
+def run_scenarios(targets, iterations=20, warmup=2, only=None, log=None):
+    """{senaryo: ölçüm} döner; only verilirse yalnızca o adlar çalışır."""
+    log = log or (lambda message: None)
+    clients = {}
+    results = {}
+    for name, user_key, url_for in SCENARIOS:
+        if only and name not in only:
+            continue
+        if user_key not in clients:
+            clients[user_key] = Client()
+            clients[user_key].force_login(targets["users"][user_key])
+        results[name] = measure(clients[user_key], url_for(targets), iterations=iterations, warmup=warmup)
+        log(f"{name}: p50={results[name]['p50_ms']} ms, p95={results[name]['p95_ms']} ms, "
+            f"{results[name]['queries']} sorgu, {results[name]['peak_kib']} KiB")
+    return results
+
+
+def build_report(spec, results, iterations):
+    return {
+        "version": BASELINE_VERSION,
+        "spec": asdict(spec),
+        "iterations": iterations,
+        "scenarios": results,
+    }
+
+
+def load_baseline(path):
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def write_report(path, report):
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, ensure_ascii=False, indent=2, sort_keys=True)
+        handle.write("\n")
+
+
+def compare(baseline, report, tolerance=0.25, query_tolerance=0, min_slack_ms=2.0):
+    """
+    Baseline'a göre gerilemeleri metin listesi olarak döner (boş liste: geçti).
+    Gecikme p95 ve tepe bellek en fazla tolerance oranında (gecikmede en az
+    min_slack_ms), sorgu sayısı en fazla query_tolerance kadar artabilir.
+    """
+    if baseline.get("spec") != report.get("spec"):
+        raise BenchmarkError("Baseline farklı veri boyutu/seed ile alınmış; karşılaştırma anlamsız.")
+    regressions = []
+    for name, current in report["scenarios"].items():
+        previous = baseline["scenarios"].get(name)
+        if previous is None:
+            continue
+        if current["queries"] > previous["queries"] + query_tolerance:
+            regressions.append(f"{name}: sorgu sayısı {previous['queries']} -> {current['queries']}")
+        limit = max(previous["p95_ms"] * (1 + tolerance), previous["p95_ms"] + min_slack_ms)
+        if current["p95_ms"] > limit:
+            regressions.append(f"{name}: p95 {previous['p95_ms']} ms -> {current['p95_ms']} ms")
+        if current["peak_kib"] > previous["peak_kib"] * (1 + tolerance) + MEMORY_SLACK_KIB:
+            regressions.append(f"{name}: tepe bellek {previous['peak_kib']} KiB -> {current['peak_kib']} KiB")
+    return regressions
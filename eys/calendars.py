@@ -0,0 +1,106 @@
+"""
+Öğrenci ve öğretmen takvimleri için ortak motor.
+
+Takvim sayfaları yalnızca görünen aralığın (ay veya hafta) sınavlarını
+(course, scheduled_at) indeksi üzerinden okur; "yaklaşanlar" listesi bugünden
+başlayan küçük bir LIMIT sorgusudur. Böylece sayfa maliyeti sınav geçmişinin
+toplam boyutuyla büyümez. Ay ve hafta ızgaraları tarihe göre gruplanmış
+kartlardan burada kurulur.
+"""
+from calendar import monthrange
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+
+from django.utils import timezone
+
+from .models import Exam
+
+WEEKDAY_LABELS = ["Pzt", "Salı", "Çar", "Per", "Cum", "Cmt", "Paz"]
+UPCOMING_LIMIT = 6
+
+
+def shift_month(year, month, delta):
+    month += delta
+    while month < 1:
+        month += 12
+        year -= 1
+    while month > 12:
+        month -= 12
+        year += 1
+    return year, month
+
+
+def _start_of(day):
+    """Yerel saat diliminde günün başlangıcı (aware)."""
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def month_window(year, month):
+    """[ayın ilk günü, sonraki ayın ilk günü) aralığı."""
+    next_year, next_month = shift_month(year, month, 1)
+    return _start_of(date(year, month, 1)), _start_of(date(next_year, next_month, 1))
+
+
+def week_window(start_of_week):
+    return _start_of(start_of_week), _start_of(start_of_week + timedelta(days=7))
+
+
+def exams_between(course_ids, start, end):
+    """Derslerin [start, end) aralığındaki sınavları, tarih sırasıyla."""
+    return (
+        Exam.objects.filter(course_id__in=course_ids, scheduled_at__gte=start, scheduled_at__lt=end)
+        .select_related("course")
+        .order_by("scheduled_at", "id")
+    )
+
+
+def upcoming_exams(course_ids, today, limit=UPCOMING_LIMIT):
+    """Bugünden itibaren ilk limit sınav."""
+    return (
+        Exam.objects.filter(course_id__in=course_ids, scheduled_at__gte=_start_of(today))
+        .select_related("course")
+        .order_by("scheduled_at", "id")[:limit]
+    )
+
+
+def group_by_date(cards):
+    """Serileştirilmiş sınav kartlarını yerel tarihe göre gruplar."""
+    by_date = defaultdict(list)
+    for card in cards:
+        if card["scheduled_local"]:
+            by_date[card["scheduled_local"].date()].append(card)
+    return by_date
+
+
+def month_grid(year, month, items_by_date, today):
+    """Pazartesi ile başlayan 7 sütunlu satırlar; ay dışındaki hücreler None."""
+    cells = [None] * date(year, month, 1).weekday()
+    for day in range(1, monthrange(year, month)[1] + 1):
+        current = date(year, month, day)
+        cells.append({
+            "day": day,
+            "date": current,
+            "is_today": current == today,
+            "items": items_by_date.get(current, []),
+        })
+    while len(cells) % 7:
+        cells.append(None)
+    return [cells[i:i + 7] for i in range(0, len(cells), 7)]
+
+
+def week_days(start_of_week, items_by_date, today, month_labels):
+    days = []
+    for offset in range(7):
+        current = start_of_week + timedelta(days=offset)
+        days.append({
+            "date": current,
+            "label": f"{current.day} {month_labels[current.month - 1]} {current.year}",
+            "weekday": WEEKDAY_LABELS[offset],
+            "is_today": current == today,
+            "items": items_by_date.get(current, []),
+        })
+    return days
+
+
+def has_events(rows):
+    return any(cell and cell["items"] for row in rows for cell in row)
@@ -1,3 +1,8 @@
+from contextlib import contextmanager
+import threading
+
+from django.core.cache import cache
+from django.db import transaction
 from django.urls import reverse
 from django.utils import timezone
 
@@ -5,28 +10,53 @@ from .models import Exam, Notification
 
 TEACHER_ROLES = {"Regular Instructor", "Advisor Instructor", "Head of Department"}
 
+# Yaklaşan sınav sayısı zamana bağlı olduğundan önbellek kısa ömürlüdür;
+# bildirim, sınav ve ders kaydı değişikliklerinde ayrıca hemen silinir.
+NAVBAR_CACHE_TIMEOUT = 60
 
-def navbar(request):
+
+def _navbar_cache_key(user_id):
+    return f"eys:navbar:{user_id}"
+
+
+_signals = threading.local()
+
+
+@contextmanager
+def navbar_signals_suspended():
     """
-    Navbar'da kullanılacak bildirim ve yaklaşan etkinlik sayıları.
+    Toplu silme/yazmalarda satır başına navbar silen sinyalleri susturur;
+    çağıran kod etkilenen kullanıcılar için invalidate_navbar'ı bir kez çağırır.
     """
-    data = {
-        "nav_notification_count": 0,
-        "nav_notification_target": "/",
-        "nav_upcoming_count": 0,
-        "nav_search_placeholder": "Ders, sınav veya duyuru ara...",
-        "nav_activity_items": [],
-    }
+    previous = getattr(_signals, "suspended", False)
+    _signals.suspended = True
+    try:
+        yield
+    finally:
+        _signals.suspended = previous
+
+
+def navbar_signals_active():
+    return not getattr(_signals, "suspended", False)
+
+
+def invalidate_navbar(user_ids):
+    """
+    Verilen kullanıcıların navbar önbelleğini siler. Commit öncesinde başka bir
+    isteğin eski veriyi yeniden yazabilmesine karşı silme commit sonrasında
+    bir kez daha yapılır.
+    """
+    keys = [_navbar_cache_key(user_id) for user_id in set(user_ids) if user_id]
+    if keys:
+        cache.delete_many(keys)
+        transaction.on_commit(lambda: cache.delete_many(keys))
 
-    user = getattr(request, "user", None)
-    if not user or not user.is_authenticated:
-        data["nav_notification_target"] = reverse("login")
-        return data
 
+def _navbar_values(user):
     role_name = user.role.name if getattr(user, "role", None) else None
     now = timezone.now()
 
-    notifications = Notification.objects.filter(user=user).order_by("-created_at")[:5]
+    notifications = Notification.objects.filter(user=user).order_by("-created_at", "-id")[:5]
     unread_count = Notification.objects.filter(user=user, is_read=False).count()
 
     activity_items = []
@@ -42,17 +72,44 @@ def navbar(request):
             }
         )
 
+    upcoming_count = 0
     if role_name == "Student":
         courses = user.courses_taken.all()
-        upcoming_qs = Exam.objects.filter(course__in=courses, scheduled_at__gte=now)
-        data["nav_upcoming_count"] = upcoming_qs.count()
+        upcoming_count = Exam.objects.filter(course__in=courses, scheduled_at__gte=now).count()
     elif role_name in TEACHER_ROLES:
         courses = user.courses_given.all()
-        upcoming_qs = Exam.objects.filter(course__in=courses, scheduled_at__gte=now)
-        data["nav_upcoming_count"] = upcoming_qs.count()
+        upcoming_count = Exam.objects.filter(course__in=courses, scheduled_at__gte=now).count()
+
+    return {
+        "nav_notification_count": min(unread_count, 99),
+        "nav_upcoming_count": min(upcoming_count, 99),
+        "nav_activity_items": activity_items,
+    }
+
+
+def navbar(request):
+    """
+    Navbar'da kullanılacak bildirim ve yaklaşan etkinlik sayıları.
+    """
+    data = {
+        "nav_notification_count": 0,
+        "nav_notification_target": "/",
+        "nav_upcoming_count": 0,
+        "nav_search_placeholder": "Ders, sınav veya duyuru ara...",
+        "nav_activity_items": [],
+    }
+
+    user = getattr(request, "user", None)
+    if not user or not user.is_authenticated:
+        data["nav_notification_target"] = reverse("login")
+        return data
+
+    key = _navbar_cache_key(user.pk)
+    values = cache.get(key)
+    if values is None:
+        values = _navbar_values(user)
+        cache.set(key, values, NAVBAR_CACHE_TIMEOUT)
 
-    data["nav_notification_count"] = min(unread_count, 99)
-    data["nav_upcoming_count"] = min(data["nav_upcoming_count"], 99)
-    data["nav_activity_items"] = activity_items
+    data.update(values)
     data["nav_notification_target"] = reverse("notifications")
     return data
@@ -0,0 +1,83 @@
+"""
+Öğrenci paneli veri yükleyicisi.
+
+Panelin ihtiyaç duyduğu her şey (dersler, sınavlar, sonuçlar, örnek LO'ların
+ağırlıkları, duyurular) öğrencinin ders sayısından bağımsız sabit sayıda
+sorguyla bir kez okunur; view tüm bölümleri bu bellek içi koleksiyonlardan
+türetir. Sorgu bütçesi testlerde DASHBOARD_QUERY_BUDGET ile denetlenir.
+"""
+from django.db.models import Q
+
+from .models import Announcement, Exam, ExamLOWeight, ExamResult, LearningOutcome
+from .outcomes import OutcomeEngine
+
+# Panelde başarı grafiği çizilen LO sayısı.
+LO_SAMPLE_SIZE = 4
+ANNOUNCEMENT_LIMIT = 3
+# load() tarafından yapılan sorgu sayısı (oturum ve kullanıcı sorguları hariç).
+DASHBOARD_QUERY_BUDGET = 6
+
+
+class StudentDashboardData:
+    def __init__(self, student, course_ids, exams, results, learning_outcomes, lo_weights, announcements):
+        self.student = student
+        self.course_ids = course_ids
+        # Tarih, id sırasıyla; tarihi olmayanlar dahil.
+        self.exams = exams
+        # {exam_id: score}
+        self.results = results
+        # [(id, title)], id sırasıyla
+        self.learning_outcomes = learning_outcomes
+        # Örnek LO'lar için (lo_id, exam_id, weight)
+        self.lo_weights = lo_weights
+        self.announcements = announcements
+
+    @classmethod
+    def load(cls, student):
+        course_ids = list(student.courses_taken.order_by("id").values_list("id", flat=True))
+        exams = list(
+            Exam.objects.filter(course_id__in=course_ids).select_related("course").order_by("scheduled_at", "id")
+        )
+        results = dict(
+            ExamResult.objects.filter(student=student, exam__course_id__in=course_ids)
+            .values_list("exam_id", "score")
+        )
+        learning_outcomes = list(
+            LearningOutcome.objects.filter(course_id__in=course_ids).order_by("id").values_list("id", "title")
+        )
+        sample_ids = [lo_id for lo_id, _ in learning_outcomes[:LO_SAMPLE_SIZE]]
+        lo_weights = list(
+            ExamLOWeight.objects.filter(learning_outcome_id__in=sample_ids)
+            .order_by("learning_outcome_id", "id")
+            .values_list("learning_outcome_id", "exam_id", "weight")
+        )
+        announcements = list(
+            Announcement.objects.filter(Q(course_id__in=course_ids) | Q(course__isnull=True))
+            .select_related("course", "author")
+            .order_by("-pinned", "-created_at")[:ANNOUNCEMENT_LIMIT]
+        )
+        return cls(student, course_ids, exams, results, learning_outcomes, lo_weights, announcements)
+
+    @property
+    def scheduled_exams(self):
+        return [exam for exam in self.exams if exam.scheduled_at]
+
+    def latest_exams(self, limit=5):
+        """En son tarihli limit sınav; tarihi olmayanlar sona düşer (SQL "-scheduled_at" gibi)."""
+        latest = sorted(self.scheduled_exams, key=lambda exam: exam.scheduled_at, reverse=True)
+        latest += [exam for exam in self.exams if not exam.scheduled_at]
+        return latest[:limit]
+
+    def upcoming_exams(self, now, limit=5):
+        return [exam for exam in self.scheduled_exams if exam.scheduled_at >= now][:limit]
+
+    def lo_success(self):
+        """Örnek LO'lar için [(başlık, yüzde)]; skoru olmayan LO'lar atlanır."""
+        sample = self.learning_outcomes[:LO_SAMPLE_SIZE]
+        engine = OutcomeEngine([lo_id for lo_id, _ in sample], self.lo_weights, [])
+        scores = engine.lo_scores(self.results, require_positive=True)
+        return [
+            (title or f"LO {lo_id}", scores[lo_id])
+            for lo_id, title in sample
+            if scores[lo_id] is not None
+        ]
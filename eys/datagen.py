@@ -0,0 +1,370 @@
+"""
+Büyük ölçekli sentetik üniversite verisi üretimi.
+
+Her tablo bulk_create ile partiler halinde yazılır; model save() ve sinyaller
+çalışmaz, türetilmiş tablolar (CourseStats, StudentOutcomeScore, StudentRisk,
+arama indeksi) sonda toplu olarak yenilenir. Aynı seed ve parametreler aynı
+içeriği üretir (zaman damgaları hariç), bu yüzden benchmark'lar
+tekrarlanabilir. Üretilen kullanıcı adları ve ders kodları `prefix` ile
+başlar; aynı prefix ile tekrar çalıştırmadan önce purge() çağrılmalıdır.
+purge() da çocuk tabloları parti parti siler, türetilmiş veri sinyallerini
+susturur ve türetilmiş tabloları sonda bir kez yeniler.
+"""
+from dataclasses import dataclass
+from datetime import timedelta
+from decimal import Decimal
+import random
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from . import deferred
+from .context_processors import navbar_signals_suspended
+from .models import (
+    Announcement,
+    Assignment,
+    AssignmentCriterion,
+    Course,
+    CourseMaterial,
+    Exam,
+    ExamLOWeight,
+    ExamResult,
+    LearningOutcome,
+    LOPOWeight,
+    Notification,
+    ProgrammingOutcome,
+    Role,
+    StudentOutcomeScore,
+    StudentRisk,
+    Submission,
+    SubmissionAttachment,
+    SubmissionCriterionScore,
+    User,
+)
+from .outcomes import refresh_student_outcomes
+from .risk import refresh_risk_snapshot
+from .search import rebuild_index
+from .stats import refresh_course_stats
+
+FIRST_NAMES = ["Ahmet", "Ayşe", "Mehmet", "Zeynep", "Can", "Elif", "Emre", "Selin", "Burak", "Deniz",
+               "Ece", "Kerem", "Merve", "Onur", "Derya", "Murat", "Seda", "Tolga", "İrem", "Kaan"]
+LAST_NAMES = ["Yılmaz", "Kaya", "Demir", "Şahin", "Çelik", "Yıldız", "Öztürk", "Aydın", "Arslan", "Doğan",
+              "Kılıç", "Aslan", "Çetin", "Koç", "Kurt", "Özdemir", "Polat", "Erdoğan", "Güneş", "Aksoy"]
+SUBJECTS = ["Algoritmalar", "Veri Yapıları", "Veritabanı", "İşletim Sistemleri", "Ağlar", "Yapay Zeka",
+            "Makine Öğrenmesi", "Bilgisayar Grafiği", "Derleyiciler", "Yazılım Mühendisliği", "Mikroişlemciler",
+            "Olasılık", "Lineer Cebir", "Sayısal Analiz", "Dağıtık Sistemler", "Güvenlik"]
+EXAM_NAMES = ["Vize", "Final", "Quiz", "Proje", "Lab", "Ödev Sınavı", "Bütünleme", "Sunum"]
+# purge() her tabloyu bu kadar satırlık delete() partileriyle siler.
+PURGE_BATCH_SIZE = 5000
+
+
+@dataclass
+class UniversitySpec:
+    seed: int = 42
+    prefix: str = "gen"
+    students: int = 2000
+    instructors: int = 60
+    advisors: int = 20
+    courses: int = 80
+    courses_per_student: int = 5
+    exams_per_course: int = 10
+    los_per_course: int = 5
+    assignments_per_course: int = 3
+    criteria_per_assignment: int = 3
+    submission_rate: float = 0.7
+    announcements_per_course: int = 3
+    materials_per_course: int = 4
+    notifications_per_student: int = 5
+    batch_size: int = 5000
+
+
+class _Writer:
+    """Nesneleri biriktirip batch_size dolunca bulk_create ile yazar; yazılan sayıları tutar."""
+
+    def __init__(self, batch_size):
+        self.batch_size = batch_size
+        self.pending = {}
+        self.counts = {}
+
+    def add(self, obj):
+        model = type(obj)
+        batch = self.pending.setdefault(model, [])
+        batch.append(obj)
+        if len(batch) >= self.batch_size:
+            self.flush(model)
+
+    def flush(self, model=None):
+        models = [model] if model else list(self.pending)
+        for current in models:
+            batch = self.pending.get(current)
+            if batch:
+                current.objects.bulk_create(batch, batch_size=self.batch_size)
+                self.counts[current.__name__] = self.counts.get(current.__name__, 0) + len(batch)
+                self.pending[current] = []
+
+
+def _bulk(model, objects, batch_size, counts):
+    created = model.objects.bulk_create(objects, batch_size=batch_size)
+    counts[model.__name__] = counts.get(model.__name__, 0) + len(created)
+    return created
+
+
+def _score(rng, ability):
+    return Decimal(str(round(max(0.0, min(100.0, rng.gauss(ability, 12))), 2)))
+
+
+def _delete_in_batches(queryset, batch_size):
+    """
+    queryset'i birincil anahtar sırasıyla batch_size'lık partiler halinde
+    delete() ile siler; collector'ın tüm tabloyu belleğe yüklemesini önler.
+    """
+    model = queryset.model
+    ids_query = queryset.order_by("pk").values_list("pk", flat=True)
+    while True:
+        ids = list(ids_query[:batch_size])
+        if not ids:
+            return
+        model.objects.filter(pk__in=ids).delete()
+
+
+def purge(prefix, refresh=True, batch_size=PURGE_BATCH_SIZE):
+    """
+    prefix ile üretilmiş kullanıcıları ve dersleri bağlı tüm verileriyle siler.
+
+    Çocuk tablolar bağımlılık sırasıyla (önce yapraklar) parti parti silinir;
+    böylece collector her partide yalnızca o tabloyu toplar ve sonradan eklenen
+    yabancı anahtarlar da normal cascade kurallarıyla işlenir. Silme boyunca
+    türetilmiş veri ve navbar sinyalleri susturulur (satır başına yenileme
+    birikmesin); refresh verilirse türetilmiş tablolar, üretilmiş kullanıcıların
+    dokunduğu diğer dersler için sonunda bir kez yenilenir.
+    """
+    course_ids = list(Course.objects.filter(code__startswith=f"{prefix.upper()}-").values_list("id", flat=True))
+    user_ids = list(User.objects.filter(username__startswith=f"{prefix}_").values_list("id", flat=True))
+    enrollments = Course.students.through.objects.filter(Q(course_id__in=course_ids) | Q(user_id__in=user_ids))
+    affected = set(enrollments.exclude(course_id__in=course_ids).values_list("course_id", flat=True))
+    affected |= set(
+        ExamResult.objects.filter(student_id__in=user_ids).exclude(exam__course_id__in=course_ids)
+        .values_list("exam__course_id", flat=True)
+    )
+
+    submissions = Submission.objects.filter(Q(assignment__course_id__in=course_ids) | Q(student_id__in=user_ids))
+    children = [
+        SubmissionCriterionScore.objects.filter(submission__in=submissions),
+        SubmissionAttachment.objects.filter(submission__in=submissions),
+        submissions,
+        ExamResult.objects.filter(Q(exam__course_id__in=course_ids) | Q(student_id__in=user_ids)),
+        ExamLOWeight.objects.filter(exam__course_id__in=course_ids),
+        LOPOWeight.objects.filter(learning_outcome__course_id__in=course_ids),
+        StudentOutcomeScore.objects.filter(Q(course_id__in=course_ids) | Q(student_id__in=user_ids)),
+        StudentRisk.objects.filter(student_id__in=user_ids),
+        Notification.objects.filter(user_id__in=user_ids),
+        enrollments,
+    ]
+    with transaction.atomic(), deferred.suspended(), navbar_signals_suspended():
+        for queryset in children:
+            _delete_in_batches(queryset, batch_size)
+        Course.objects.filter(id__in=course_ids).delete()
+        User.objects.filter(id__in=user_ids).delete()
+    if refresh:
+        refresh_derived(sorted(affected))
+    return len(user_ids), len(course_ids)
+
+
+def generate_university(spec, log=None):
+    """spec'e göre veri üretir; ({model_adı: satır_sayısı}, üretilen ders kimlikleri) döner."""
+    log = log or (lambda message: None)
+    rng = random.Random(spec.seed)
+    now = timezone.now()
+    counts = {}
+    batch = spec.batch_size
+    password = make_password("pass")
+
+    roles = {name: Role.objects.get_or_create(name=name)[0]
+             for name in ["Student", "Regular Instructor", "Advisor Instructor", "Head of Department"]}
+    po_ids = list(ProgrammingOutcome.objects.order_by("id").values_list("id", flat=True))
+    if not po_ids:
+        po_ids = [po.id for po in _bulk(
+            ProgrammingOutcome,
+            [ProgrammingOutcome(code=f"{spec.prefix.upper()}-PO{i}", title=f"PO {i}") for i in range(1, 11)],
+            batch, counts,
+        )]
+
+    def person(username, role, **extra):
+        return User(
+            username=username,
+            first_name=rng.choice(FIRST_NAMES),
+            last_name=rng.choice(LAST_NAMES),
+            email=f"{username}@example.edu",
+            password=password,
+            role=role,
+            **extra,
+        )
+
+    with transaction.atomic():
+        log("Öğretim elemanları...")
+        staff = [person(f"{spec.prefix}_head", roles["Head of Department"])]
+        staff += [person(f"{spec.prefix}_adv{i}", roles["Advisor Instructor"]) for i in range(spec.advisors)]
+        staff += [person(f"{spec.prefix}_inst{i}", roles["Regular Instructor"]) for i in range(spec.instructors)]
+        staff = _bulk(User, staff, batch, counts)
+        advisors = staff[1:1 + spec.advisors]
+
+        log(f"{spec.students} öğrenci...")
+        students = []
+        abilities = {}
+        for i in range(spec.students):
+            advisor = advisors[i % len(advisors)] if advisors else None
+            students.append(person(f"{spec.prefix}_s{i}", roles["Student"], advisor=advisor))
+        students = _bulk(User, students, batch, counts)
+        for student in students:
+            abilities[student.id] = rng.uniform(35, 95)
+
+        log(f"{spec.courses} ders...")
+        courses = _bulk(
+            Course,
+            [
+                Course(
+                    code=f"{spec.prefix.upper()}-{i:05d}",
+                    name=f"{rng.choice(SUBJECTS)} {i % 4 + 1}",
+                    instructor=rng.choice(staff),
+                )
+                for i in range(spec.courses)
+            ],
+            batch, counts,
+        )
+
+        log("Ders kayıtları...")
+        enrolled = {course.id: [] for course in courses}
+        through = Course.students.through
+        writer = _Writer(batch)
+        per_student = min(spec.courses_per_student, len(courses))
+        for student in students:
+            for course in rng.sample(courses, per_student):
+                enrolled[course.id].append(student.id)
+                writer.add(through(course_id=course.id, user_id=student.id))
+        writer.flush()
+
+        log("Öğrenim çıktıları ve sınavlar...")
+        los = _bulk(
+            LearningOutcome,
+            [LearningOutcome(course=course, title=f"LO {j + 1} - {course.code}")
+             for course in courses for j in range(spec.los_per_course)],
+            batch, counts,
+        )
+        los_by_course = {}
+        for lo in los:
+            los_by_course.setdefault(lo.course_id, []).append(lo)
+        exams = _bulk(
+            Exam,
+            [
+                Exam(
+                    course=course,
+                    name=f"{EXAM_NAMES[j % len(EXAM_NAMES)]} {j // len(EXAM_NAMES) + 1}",
+                    description=f"{course.name} değerlendirmesi",
+                    scheduled_at=now + timedelta(days=rng.randint(-90, 60), hours=rng.randint(8, 17)),
+                )
+                for course in courses for j in range(spec.exams_per_course)
+            ],
+            batch, counts,
+        )
+        for exam in exams:
+            for lo in rng.sample(los_by_course.get(exam.course_id, []), min(2, spec.los_per_course)):
+                writer.add(ExamLOWeight(exam=exam, learning_outcome=lo, weight=rng.choice([10, 15, 20, 25])))
+        for lo in los:
+            for po_id in rng.sample(po_ids, min(2, len(po_ids))):
+                writer.add(LOPOWeight(learning_outcome=lo, programming_outcome_id=po_id, weight=rng.choice([30, 50, 70])))
+        writer.flush()
+
+        log("Sınav sonuçları...")
+        for exam in exams:
+            if exam.scheduled_at > now:
+                continue
+            for student_id in enrolled[exam.course_id]:
+                writer.add(ExamResult(exam=exam, student_id=student_id, score=_score(rng, abilities[student_id])))
+        writer.flush()
+
+        log("Ödevler ve teslimler...")
+        assignments = _bulk(
+            Assignment,
+            [
+                Assignment(
+                    course=course,
+                    title=f"Ödev {j + 1}: {rng.choice(SUBJECTS)}",
+                    description="Sentetik ödev açıklaması.",
+                    due_at=now + timedelta(days=rng.randint(-30, 30)),
+                    published_at=now - timedelta(days=rng.randint(1, 40)),
+                    created_by_id=course.instructor_id,
+                )
+                for course in courses for j in range(spec.assignments_per_course)
+            ],
+            batch, counts,
+        )
+        criteria = _bulk(
+            AssignmentCriterion,
+            [AssignmentCriterion(assignment=assignment, title=f"Kriter {k + 1}", max_score=Decimal("20"), order=k + 1)
+             for assignment in assignments for k in range(spec.criteria_per_assignment)],
+            batch, counts,
+        )
+        criteria_by_assignment = {}
+        for criterion in criteria:
+            criteria_by_assignment.setdefault(criterion.assignment_id, []).append(criterion)
+        for assignment in assignments:
+            submitters = [sid for sid in enrolled[assignment.course_id] if rng.random() < spec.submission_rate]
+            graded = []
+            for student_id in submitters:
+                submission = Submission(assignment=assignment, student_id=student_id, text="Cevap metni.")
+                if rng.random() < 0.6:
+                    submission.score = _score(rng, abilities[student_id])
+                    submission.graded_at = now
+                    submission.graded_by_id = assignment.created_by_id
+                graded.append(submission)
+            graded = _bulk(Submission, graded, batch, counts)
+            for submission in graded:
+                if submission.score is None:
+                    continue
+                for criterion in criteria_by_assignment.get(assignment.id, []):
+                    writer.add(SubmissionCriterionScore(
+                        submission=submission, criterion=criterion,
+                        score=Decimal(str(round(rng.uniform(5, 20), 2))),
+                    ))
+        writer.flush()
+
+        log("Duyurular, materyaller ve bildirimler...")
+        for course in courses:
+            for j in range(spec.announcements_per_course):
+                writer.add(Announcement(
+                    title=f"{course.code} duyuru {j + 1}", body="<p>Sentetik duyuru metni.</p>",
+                    course=course, author_id=course.instructor_id,
+                ))
+            for week in range(1, spec.materials_per_course + 1):
+                writer.add(CourseMaterial(
+                    course=course, week=week, title=f"Hafta {week} notları",
+                    description=f"{course.name} ders notları", created_by_id=course.instructor_id,
+                ))
+        kinds = [choice[0] for choice in Notification.KIND_CHOICES]
+        for student in students:
+            for j in range(spec.notifications_per_student):
+                writer.add(Notification(
+                    user=student, kind=rng.choice(kinds), message=f"Sentetik bildirim {j + 1}",
+                    is_read=rng.random() < 0.5,
+                ))
+        writer.flush()
+
+    for name, count in writer.counts.items():
+        counts[name] = counts.get(name, 0) + count
+    return counts, [course.id for course in courses]
+
+
+def refresh_derived(course_ids, log=None):
+    """bulk_create sinyal göndermediği için türetilmiş tabloları toplu yeniler."""
+    log = log or (lambda message: None)
+    log("CourseStats...")
+    refresh_course_stats(course_ids)
+    log("Öğrenci LO/PO skorları...")
+    for course_id in course_ids:
+        refresh_student_outcomes(course_id)
+    log("Risk skorları...")
+    refresh_risk_snapshot()
+    log("Arama indeksi...")
+    rebuild_index()
@@ -0,0 +1,66 @@
+"""
+Commit sonrasına ertelenen toplu yenilemeler.
+
+Sinyaller aynı transaction içinde defalarca "şunu yenile" der. Bu istekler
+bağlantı (ve açık savepoint) başına tek bir bekleyen kümede birleştirilir ve
+transaction başına tek on_commit callback'i ile işlenir. Transaction ya da
+savepoint geri alınırsa Django callback'i atar; küme bir sonraki planlamada bunu
+fark edip atılır, böylece geri alınan değişikliklerin kimlikleri ilgisiz bir
+sonraki commit'e taşınmaz.
+"""
+from contextlib import contextmanager
+import threading
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+_local = threading.local()
+
+
+def _registered(connection, callback):
+    return any(func is callback for _, func, _ in connection.run_on_commit)
+
+
+@contextmanager
+def suspended():
+    """
+    Bu iş parçacığında schedule() çağrılarını yok sayar. Toplu silmelerde satır
+    başına sinyaller iş biriktirmesin diye kullanılır; çağıran kod türetilmiş
+    verileri sonunda kendisi yeniler.
+    """
+    previous = getattr(_local, "suspended", False)
+    _local.suspended = True
+    try:
+        yield
+    finally:
+        _local.suspended = previous
+
+
+def schedule(name, factory, update, flush, using=None):
+    """
+    Bu transaction'ın (ve açık savepoint'in) `name` adlı bekleyen kümesini alır,
+    yoksa factory() ile oluşturur; update(küme) ile günceller ve commit sonrasında
+    flush(küme)'nin bir kez çalışmasını sağlar. Transaction dışında flush hemen çalışır.
+    """
+    if getattr(_local, "suspended", False):
+        return
+    alias = using or DEFAULT_DB_ALIAS
+    connection = connections[alias]
+    pending = _local.__dict__.setdefault("pending", {})
+    key = (alias, name)
+    scope = tuple(connection.savepoint_ids)
+    # Callback'i artık beklemeyen kümelerin transaction'ı ya da savepoint'i geri alınmıştır.
+    entries = pending[key] = [entry for entry in pending.get(key, ()) if _registered(connection, entry[2])]
+    for entry_scope, batch, _ in entries:
+        if entry_scope == scope:
+            update(batch)
+            return
+
+    batch = factory()
+
+    def run():
+        pending[key] = [entry for entry in pending.get(key, ()) if entry[2] is not run]
+        flush(batch)
+
+    entries.append((scope, batch, run))
+    update(batch)
+    transaction.on_commit(run, using=alias)
@@ -0,0 +1,111 @@
+"""
+Büyük dışa aktarımlar için akış (streaming) yardımcıları.
+
+Yanıt bellekte biriktirilmez: ZIP arşivi dosyalar parça parça okunurken
+üretilir ve her parça hemen istemciye gönderilir. Böylece bellek kullanımı
+toplam dosya boyutundan bağımsız kalır.
+
+CSV dışa aktarımları da satırları veritabanından parça parça okuyup
+birkaç KB'lık bloklar halinde gönderir.
+"""
+import csv
+import zipfile
+
+from django.utils import timezone
+
+# Zaten sıkıştırılmış biçimler yeniden sıkıştırılmaz (ZIP_STORED).
+STORED_EXTENSIONS = {"pdf", "zip", "jpg", "jpeg", "png", "gif", "gz", "rar", "7z", "docx", "xlsx", "pptx"}
+CHUNK_SIZE = 64 * 1024
+QUERY_CHUNK_SIZE = 2000
+
+
+class _StreamBuffer:
+    """ZipFile'ın yazdığı baytları toplar; tell() olmadığı için zipfile akış kipine geçer."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def compression_for(filename):
+    extension = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    return zipfile.ZIP_STORED if extension in STORED_EXTENSIONS else zipfile.ZIP_DEFLATED
+
+
+def zip_date_time(moment):
+    """ZIP başlığı için yerel saatle (yıl, ay, gün, saat, dakika, saniye); ZIP 1980 öncesini tutamaz."""
+    return max(timezone.localtime(moment).timetuple()[:6], (1980, 1, 1, 0, 0, 0))
+
+
+def stream_zip(entries, chunk_size=CHUNK_SIZE):
+    """
+    entries: (arşiv_adı, FieldFile, değişiklik_zamanı) üçlüleri üreten yinelenebilir;
+    zaman None ise dışa aktarma anı kullanılır.
+    ZIP arşivini bayt parçaları halinde üreten bir generator döner.
+    """
+    exported_at = timezone.now()
+    buffer = _StreamBuffer()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        for arcname, field_file, modified in entries:
+            info = zipfile.ZipInfo(arcname, date_time=zip_date_time(modified or exported_at))
+            info.compress_type = compression_for(arcname)
+            # Boyut önceden bilinirse zipfile gerektiğinde ZIP64 başlığı yazar.
+            info.file_size = field_file.size
+            with field_file.open("rb") as src, zf.open(info, "w") as dest:
+                for chunk in iter(lambda: src.read(chunk_size), b""):
+                    dest.write(chunk)
+                    data = buffer.drain()
+                    if data:
+                        yield data
+            data = buffer.drain()
+            if data:
+                yield data
+    yield buffer.drain()
+
+
+def submission_zip_entries(assignment):
+    """Ödevin tüm teslim eklerini (arşiv_adı, FieldFile, yüklenme_zamanı) olarak üretir."""
+    submissions = assignment.submissions.select_related("student").prefetch_related("attachments")
+    for sub in submissions:
+        for att in sub.attachments.all():
+            filename = f"{sub.student.username}_v{att.version}_{att.file.name.split('/')[-1]}"
+            yield filename, att.file, att.created_at
+
+
+class _Echo:
+    """csv.writer için: yazılan satırı saklamadan geri döndürür."""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(header, rows, chunk_size=CHUNK_SIZE):
+    """
+    Başlığı hemen, satırları ise yaklaşık chunk_size karakterlik CSV blokları
+    olarak üretir; ilk bayt sorgu tamamlanmadan istemciye ulaşır.
+    """
+    writer = csv.writer(_Echo())
+    yield writer.writerow(header)
+    pending = []
+    size = 0
+    for row in rows:
+        line = writer.writerow(row)
+        pending.append(line)
+        size += len(line)
+        if size >= chunk_size:
+            yield "".join(pending)
+            pending = []
+            size = 0
+    if pending:
+        yield "".join(pending)
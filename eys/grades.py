@@ -0,0 +1,177 @@
+"""
+Sınav notlarının toplu yazılması.
+
+CSV içe aktarma ve not tablosu kaydı aynı yolu kullanır: önce tüm girdi
+bellekte doğrulanıp bir değişiklik planına çevrilir, sonra plan tek
+transaction içinde bulk_create / bulk_update / tek delete ile uygulanır.
+"""
+import csv
+import io
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import ExamResult
+from .outcomes import schedule_outcome_refresh
+from .stats import schedule_course_stats_refresh
+
+_SCORE_FIELD = ExamResult._meta.get_field("score")
+_CENT = Decimal("0.01")
+
+
+def parse_score(raw):
+    """'85,5' gibi bir değeri 0-100 aralığına sıkıştırılmış Decimal'e çevirir; geçersizse ValueError."""
+    value = float(raw.replace(",", "."))
+    value = max(0, min(100, value))
+    return _SCORE_FIELD.to_python(value).quantize(_CENT)
+
+
+def apply_exam_result_plan(exam, existing, upserts, deletions):
+    """
+    existing: {student_id: ExamResult}, upserts: {student_id: (score, feedback)},
+    deletions: silinecek student_id'ler.
+
+    Yalnızca gerçekten değişen satırlar yazılır. Dönüş: yazılan
+    (created, updated, deleted) satır sayıları.
+    """
+    now = timezone.now()
+    to_create = []
+    to_update = []
+    for student_id, (score, feedback) in upserts.items():
+        result = existing.get(student_id)
+        if result is None:
+            to_create.append(ExamResult(exam=exam, student_id=student_id, score=score, feedback=feedback))
+        elif result.score != score or result.feedback != feedback:
+            result.score = score
+            result.feedback = feedback
+            result.updated_at = now
+            to_update.append(result)
+    delete_ids = [student_id for student_id in deletions if student_id in existing]
+
+    if not (to_create or to_update or delete_ids):
+        return 0, 0, 0
+    with transaction.atomic():
+        if to_create:
+            ExamResult.objects.bulk_create(to_create, batch_size=500)
+        if to_update:
+            ExamResult.objects.bulk_update(to_update, ["score", "feedback", "updated_at"], batch_size=500)
+        if delete_ids:
+            ExamResult.objects.filter(exam=exam, student_id__in=delete_ids).delete()
+        touched = [r.student_id for r in to_create] + [r.student_id for r in to_update] + delete_ids
+        schedule_outcome_refresh(course_id=exam.course_id, student_ids=touched)
+        schedule_course_stats_refresh(course_id=exam.course_id)
+    for student_id in delete_ids:
+        existing.pop(student_id, None)
+    for result in to_create:
+        existing[result.student_id] = result
+    return len(to_create), len(to_update), len(delete_ids)
+
+
+def save_grade_grid(exam, students, existing, data, error_template):
+    """
+    Not tablosundan gelen score_<id>/feedback_<id> alanlarını kaydeder.
+
+    Gönderilen değerler mevcut sonuçlarla karşılaştırılır; yalnızca değişen
+    satırlar tek bulk insert, tek bulk update ve tek delete ile yazılır.
+    Geçersiz skorlu öğrenciler atlanır ve error_template ile hata döner.
+    """
+    errors = []
+    upserts = {}
+    deletions = set()
+    for student in students:
+        score_raw = data.get(f"score_{student.id}", "").strip()
+        feedback = data.get(f"feedback_{student.id}", "").strip()
+        if score_raw == "":
+            deletions.add(student.id)
+            continue
+        try:
+            upserts[student.id] = (parse_score(score_raw), feedback)
+        except ValueError:
+            errors.append(error_template.format(name=student.get_full_name() or student.username))
+    apply_exam_result_plan(exam, existing, upserts, deletions)
+    return errors
+
+
+def _read_csv_rows(uploaded_file):
+    try:
+        text = io.TextIOWrapper(uploaded_file.file, encoding="utf-8")
+    except Exception:
+        text = io.StringIO(uploaded_file.read().decode("utf-8", errors="ignore"))
+    return list(csv.DictReader(text))
+
+
+def import_exam_scores_csv(exam, uploaded_file, existing):
+    """
+    student_id,username,score,feedback sütunlu CSV'yi içe aktarır.
+
+    Dosyanın tamamı önce doğrulanır; herhangi bir satır hatalıysa hiçbir
+    değişiklik yazılmaz. Dönüş: (sayaçlar, hatalar). Sayaçlar satır satır
+    işlenmiş gibi hesaplanır (processed/created/updated/deleted).
+    """
+    rows = _read_csv_rows(uploaded_file)
+    ids = set()
+    usernames = set()
+    for row in rows:
+        sid = (row.get("student_id") or "").strip()
+        username = (row.get("username") or "").strip()
+        if sid.isdigit():
+            ids.add(int(sid))
+        if username:
+            usernames.add(username)
+    by_id = {}
+    by_username = {}
+    if ids or usernames:
+        for student in exam.course.students.filter(Q(id__in=ids) | Q(username__in=usernames)):
+            by_id[student.id] = student
+            by_username[student.username] = student
+
+    errors = []
+    counts = {"processed": 0, "created": 0, "updated": 0, "deleted": 0}
+    state = {student_id: True for student_id in existing}
+    upserts = {}
+    deletions = set()
+    for row in rows:
+        sid = (row.get("student_id") or "").strip()
+        username = (row.get("username") or "").strip()
+        score_raw = (row.get("score") or "").strip()
+        feedback = (row.get("feedback") or "").strip()
+        student = by_id.get(int(sid)) if sid.isdigit() else None
+        if not student and username:
+            student = by_username.get(username)
+        if not student:
+            errors.append(f"Öğrenci bulunamadı: id={sid} username={username}")
+            continue
+        counts["processed"] += 1
+        if score_raw == "":
+            if state.get(student.id):
+                state[student.id] = False
+                upserts.pop(student.id, None)
+                deletions.add(student.id)
+                counts["deleted"] += 1
+            continue
+        try:
+            score_val = parse_score(score_raw)
+        except ValueError:
+            errors.append(f"{student.get_full_name() or student.username} için skor değeri sayı olmalı.")
+            continue
+        if state.get(student.id):
+            counts["updated"] += 1
+        else:
+            counts["created"] += 1
+            state[student.id] = True
+        # Silinip aynı dosyada yeniden eklenen öğrenci mevcut satır üzerinden güncellenir.
+        deletions.discard(student.id)
+        upserts[student.id] = (score_val, feedback)
+
+    if not errors:
+        apply_exam_result_plan(exam, existing, upserts, deletions)
+    return counts, errors
+
+
+def format_import_counts(counts):
+    return (
+        f"CSV içe aktarma tamamlandı. Toplam: {counts['processed']}, Yeni: {counts['created']}, "
+        f"Güncellenen: {counts['updated']}, Silinen: {counts['deleted']}."
+    )
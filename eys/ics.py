@@ -0,0 +1,193 @@
+"""
+Takvim (ICS) beslemeleri.
+
+Takvim istemcileri beslemeyi birkaç dakikada bir yoklar. Her istekte önce
+yalnızca küçük bir parmak izi hesaplanır: kullanıcının derslerinin kimlik,
+kod ve adları ile sınav ve ödevlerin sayısı ve en büyük updated_at değeri.
+ETag bu parmak izinden üretilir, eşleşen If-None-Match isteklerine 304
+döner. Last-Modified kullanılmaz: silinen sınav, yayından kaldırılan ödev
+veya bırakılan ders en büyük updated_at değerini artırmaz, bu yüzden
+If-Modified-Since ile doğrulama silinmiş olayları istemcide bırakırdı. İçerik değişmediği sürece aynı ETag'e ait gövde önbellekten verilir;
+çok büyük takvimler önbelleğe alınmadan akıtılır. DTSTAMP olay kaydının
+kendi zaman damgasıdır, böylece aynı veri her zaman aynı gövdeyi üretir.
+
+Abonelik adresi kullanıcıya özel gizli bir anahtar (User.calendar_token)
+taşır; anahtar sıfırlandığında eski adres geçersiz olur.
+"""
+from datetime import timedelta, timezone as dt_timezone
+import hashlib
+import json
+import secrets
+
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.http import HttpResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+
+from .context_processors import TEACHER_ROLES
+from .models import Assignment, Course, Exam, User
+
+FEED_VERSION = 2
+# Bu sayıdan fazla olay içeren takvimler önbelleğe alınmadan akıtılır.
+CACHE_MAX_EVENTS = 2000
+CACHE_TIMEOUT = 60 * 60 * 24
+STREAM_CHUNK_SIZE = 500
+# İstemciler bu süre içinde tekrar sormaz; sonrasında koşullu istekle doğrular.
+FEED_MAX_AGE = 300
+EVENT_DURATION = timedelta(hours=1)
+
+
+def ensure_calendar_token(user):
+    """Kullanıcının abonelik anahtarını döner; yoksa üretip kaydeder."""
+    if not user.calendar_token:
+        return reset_calendar_token(user)
+    return user.calendar_token
+
+
+def reset_calendar_token(user):
+    """Yeni bir anahtar üretir; eski abonelik adresleri artık çalışmaz."""
+    user.calendar_token = secrets.token_urlsafe(32)
+    # User.save danışman rolünü yeniden hesapladığı için doğrudan UPDATE.
+    User.objects.filter(pk=user.pk).update(calendar_token=user.calendar_token)
+    return user.calendar_token
+
+
+def _escape(text):
+    return (
+        (text or "").replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+        .replace("\r\n", "\\n").replace("\n", "\\n")
+    )
+
+
+def _stamp(value):
+    return timezone.localtime(value, dt_timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+class CalendarFeed:
+    """Bir kullanıcının (isteğe bağlı olarak ders filtreli) sınav ve ödev takvimi."""
+
+    def __init__(self, user, course_ids=None, include_assignments=True):
+        role_name = user.role.name if user.role else None
+        self.is_teacher = role_name in TEACHER_ROLES
+        if self.is_teacher:
+            courses = Course.objects.filter(instructor=user)
+        else:
+            courses = user.courses_taken.all()
+        if course_ids:
+            courses = courses.filter(id__in=course_ids)
+        # Ders kodu ve adı SUMMARY'ye yazıldığı için parmak izine dahildir.
+        self.courses = list(courses.order_by("id").values_list("id", "code", "name"))
+        self.course_ids = [course_id for course_id, _, _ in self.courses]
+        self.include_assignments = include_assignments
+
+        self.exams = Exam.objects.filter(course_id__in=self.course_ids, scheduled_at__isnull=False)
+        self.assignments = Assignment.objects.none()
+        if include_assignments:
+            self.assignments = Assignment.objects.filter(course_id__in=self.course_ids, due_at__isnull=False)
+            if not self.is_teacher:
+                self.assignments = self.assignments.filter(published_at__isnull=False)
+        self.name = "EYS Öğretmen Takvimi" if self.is_teacher else "EYS Takvimim"
+        self._fingerprint = None
+
+    def fingerprint(self):
+        """(sınav sayısı, son sınav değişikliği, ödev sayısı, son ödev değişikliği)."""
+        if self._fingerprint is None:
+            exams = self.exams.order_by().aggregate(count=Count("id"), last=Max("updated_at"))
+            assignments = {"count": 0, "last": None}
+            if self.include_assignments:
+                assignments = self.assignments.order_by().aggregate(count=Count("id"), last=Max("updated_at"))
+            self._fingerprint = (exams["count"], exams["last"], assignments["count"], assignments["last"])
+        return self._fingerprint
+
+    @property
+    def event_count(self):
+        exam_count, _, assignment_count, _ = self.fingerprint()
+        return exam_count + assignment_count
+
+    @property
+    def etag(self):
+        exam_count, exams_last, assignment_count, assignments_last = self.fingerprint()
+        key = json.dumps([
+            FEED_VERSION, self.is_teacher, self.courses, self.include_assignments,
+            exam_count, exams_last and exams_last.isoformat(),
+            assignment_count, assignments_last and assignments_last.isoformat(),
+        ])
+        return '"%s"' % hashlib.sha256(key.encode()).hexdigest()[:32]
+
+    def _event(self, uid, stamp, start, summary, description, url):
+        start_utc = timezone.localtime(start, dt_timezone.utc)
+        return "\r\n".join([
+            "BEGIN:VEVENT",
+            f"UID:{uid}",
+            f"DTSTAMP:{_stamp(stamp)}",
+            f"DTSTART:{_stamp(start_utc)}",
+            f"DTEND:{_stamp(start_utc + EVENT_DURATION)}",
+            f"SUMMARY:{_escape(summary)}",
+            f"DESCRIPTION:{_escape(description)}\\nURL:{url}",
+            "END:VEVENT",
+        ]) + "\r\n"
+
+    def chunks(self):
+        """Takvimi STREAM_CHUNK_SIZE olaylık metin parçaları halinde üretir."""
+        yield "\r\n".join([
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            "PRODID:-//EYS//Calendar//TR",
+            f"X-WR-CALNAME:{self.name}",
+        ]) + "\r\n"
+        exam_url = "exam_detail" if self.is_teacher else "student_course_detail"
+        buffer = []
+        exams = self.exams.select_related("course").order_by("scheduled_at", "id")
+        for exam in exams.iterator(chunk_size=STREAM_CHUNK_SIZE):
+            url_arg = exam.id if self.is_teacher else exam.course_id
+            buffer.append(self._event(
+                f"exam-{exam.id}@eys", exam.updated_at, exam.scheduled_at,
+                f"{exam.course.code} - {exam.name}", exam.description,
+                reverse(exam_url, args=[url_arg]),
+            ))
+            if len(buffer) >= STREAM_CHUNK_SIZE:
+                yield "".join(buffer)
+                buffer = []
+        assignment_url = "teacher_assignment_detail" if self.is_teacher else "student_assignment_detail"
+        assignments = self.assignments.select_related("course").order_by("due_at", "id")
+        for assignment in assignments.iterator(chunk_size=STREAM_CHUNK_SIZE):
+            buffer.append(self._event(
+                f"assignment-{assignment.id}@eys", assignment.updated_at, assignment.due_at,
+                f"Ödev - {assignment.course.code} - {assignment.title}", assignment.description,
+                reverse(assignment_url, args=[assignment.id]),
+            ))
+            if len(buffer) >= STREAM_CHUNK_SIZE:
+                yield "".join(buffer)
+                buffer = []
+        buffer.append("END:VCALENDAR\r\n")
+        yield "".join(buffer)
+
+    def render(self):
+        return "".join(self.chunks())
+
+
+def feed_response(request, feed, filename="calendar.ics"):
+    """
+    Koşullu GET destekli takvim yanıtı: eşleşen If-None-Match için 304,
+    küçük takvimler için önbellekteki gövde, büyük takvimler için akış.
+    """
+    etag = feed.etag
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        if feed.event_count > CACHE_MAX_EVENTS:
+            response = StreamingHttpResponse(
+                (chunk.encode("utf-8") for chunk in feed.chunks()), content_type="text/calendar; charset=utf-8",
+            )
+        else:
+            cache_key = f"eys:ics:{etag.strip(chr(34))}"
+            body = cache.get(cache_key)
+            if body is None:
+                body = feed.render()
+                cache.set(cache_key, body, CACHE_TIMEOUT)
+            response = HttpResponse(body, content_type="text/calendar; charset=utf-8")
+        response["Content-Disposition"] = f"attachment; filename={filename}"
+    response["ETag"] = etag
+    patch_cache_control(response, private=True, max_age=FEED_MAX_AGE)
+    return response
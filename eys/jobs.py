@@ -0,0 +1,214 @@
+"""
+Veritabanı tabanlı hafif iş kuyruğu.
+
+Uzun süren işlemler (CSV içe aktarma, ZIP dışa aktarma, toplu hatırlatma)
+BackgroundJob satırı olarak kuyruğa alınır ve `python manage.py run_eys_worker`
+tarafından istek/yanıt döngüsünün dışında çalıştırılır. Ek bir broker
+gerekmez; iş sahiplenme, durum alanı üzerinde koşullu UPDATE ile yapılır, bu
+yüzden SQLite üzerinde birden fazla worker aynı işi iki kez almaz.
+
+İş türlerinin bağımlılıkları (CSV, ZIP, bildirim, risk) işleyicilerin içinde
+içe aktarılır; iş kuyruğa alan view'lar bu modülleri yüklemez.
+"""
+import os
+import socket
+import tempfile
+from datetime import timedelta
+
+from django.core.files import File
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Assignment, BackgroundJob, Exam, ExamResult
+
+MAX_ATTEMPTS = 3
+# Çalışan iş en fazla HEARTBEAT_INTERVAL'da bir heartbeat_at yazar; bu kadar
+# süre sinyal vermeyen işin worker'ı çökmüş sayılır.
+HEARTBEAT_INTERVAL = timedelta(seconds=30)
+STALE_AFTER = timedelta(minutes=10)
+# Bitmiş işler ve dosyaları (media/jobs/) bu süreden sonra silinir.
+JOB_RETENTION = timedelta(days=7)
+PRUNE_BATCH_SIZE = 500
+
+
+class JobError(Exception):
+    """İşin beklenen bir nedenle başarısız olduğunu belirtir; mesaj kullanıcıya gösterilir."""
+
+
+def _exam_scores_import(job):
+    from .grades import format_import_counts, import_exam_scores_csv
+
+    exam = Exam.objects.select_related("course").get(id=job.params["exam_id"])
+    existing = {res.student_id: res for res in ExamResult.objects.filter(exam=exam)}
+    with job.input_file.open("rb") as csv_file:
+        counts, errors = import_exam_scores_csv(exam, csv_file, existing)
+    if errors:
+        raise JobError("\n".join(errors + ["Dosyada hata olduğu için hiçbir not kaydedilmedi."]))
+    return format_import_counts(counts)
+
+
+def _submissions_zip(job):
+    from .exports import stream_zip, submission_zip_entries
+
+    assignment = Assignment.objects.get(id=job.params["assignment_id"])
+    with tempfile.TemporaryFile() as tmp:
+        for chunk in stream_zip(submission_zip_entries(assignment)):
+            tmp.write(chunk)
+            heartbeat(job)
+        tmp.seek(0)
+        job.result_file.save(f"assignment-{assignment.id}-submissions.zip", File(tmp), save=False)
+    return "ZIP arşivi hazır."
+
+
+def _assignment_reminders(job):
+    from .notifications import send_assignment_reminders_for
+
+    assignment = Assignment.objects.select_related("course").get(id=job.params["assignment_id"])
+    count = send_assignment_reminders_for(assignment)
+    return f"Hatirlatma gonderildi ({count} ogrenci)."
+
+
+def _exam_reminders(job):
+    from .notifications import send_exam_reminders_for
+
+    exam = Exam.objects.select_related("course").get(id=job.params["exam_id"])
+    count = send_exam_reminders_for(exam)
+    return f"Sinav hatirlatmasi gonderildi ({count} ogrenci)."
+
+
+def _risk_refresh(job):
+    from .risk import refresh_risk_snapshot
+
+    count = refresh_risk_snapshot(job.params.get("student_ids"), progress=lambda: heartbeat(job))
+    return f"Risk skorlari guncellendi ({count} ogrenci)."
+
+
+JOB_HANDLERS = {
+    "exam_scores_import": _exam_scores_import,
+    "submissions_zip": _submissions_zip,
+    "assignment_reminders": _assignment_reminders,
+    "exam_reminders": _exam_reminders,
+    "risk_refresh": _risk_refresh,
+}
+
+
+def enqueue_job(user, kind, params=None, input_file=None):
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f"Bilinmeyen iş türü: {kind}")
+    job = BackgroundJob(created_by=user, kind=kind, params=params or {})
+    if input_file is not None:
+        job.input_file.save(input_file.name, input_file, save=False)
+    job.save()
+    return job
+
+
+def active_job(kind):
+    """Kuyrukta bekleyen veya çalışan aynı türden ilk iş; yoksa None."""
+    return (
+        BackgroundJob.objects.filter(
+            kind=kind, status__in=[BackgroundJob.STATUS_QUEUED, BackgroundJob.STATUS_RUNNING]
+        ).order_by("created_at", "id").first()
+    )
+
+
+def default_worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def heartbeat(job, now=None):
+    """Çalışan işin canlı olduğunu kaydeder; HEARTBEAT_INTERVAL'dan sık yazmaz."""
+    now = now or timezone.now()
+    if job.heartbeat_at and now - job.heartbeat_at < HEARTBEAT_INTERVAL:
+        return
+    job.heartbeat_at = now
+    BackgroundJob.objects.filter(id=job.id, status=BackgroundJob.STATUS_RUNNING).update(heartbeat_at=now)
+
+
+def requeue_stale_jobs(now=None):
+    """
+    Worker'ı çöktüğü için STALE_AFTER süresince heartbeat yazmamış 'running'
+    işleri yeniden kuyruğa alır; deneme hakkı bitenleri başarısız sayar.
+    Etkilenen iş sayısını döner.
+    """
+    now = now or timezone.now()
+    cutoff = now - STALE_AFTER
+    stale = BackgroundJob.objects.filter(
+        Q(heartbeat_at__lt=cutoff) | Q(heartbeat_at__isnull=True, started_at__lt=cutoff),
+        status=BackgroundJob.STATUS_RUNNING,
+    )
+    failed = stale.filter(attempts__gte=MAX_ATTEMPTS).update(
+        status=BackgroundJob.STATUS_FAILED, error="Worker yanıt vermedi.", finished_at=now
+    )
+    requeued = stale.update(status=BackgroundJob.STATUS_QUEUED, worker="")
+    return failed + requeued
+
+
+def prune_jobs(older_than=JOB_RETENTION, now=None):
+    """
+    older_than süresinden önce bitmiş (done/failed) işleri girdi ve sonuç
+    dosyalarıyla birlikte siler; silinen iş sayısını döner.
+    """
+    now = now or timezone.now()
+    finished = BackgroundJob.objects.filter(
+        status__in=[BackgroundJob.STATUS_DONE, BackgroundJob.STATUS_FAILED], finished_at__lt=now - older_than
+    ).order_by("id")
+    deleted = 0
+    while True:
+        batch = list(finished[:PRUNE_BATCH_SIZE])
+        if not batch:
+            return deleted
+        for job in batch:
+            for stored in (job.input_file, job.result_file):
+                if stored:
+                    stored.delete(save=False)
+        BackgroundJob.objects.filter(id__in=[job.id for job in batch]).delete()
+        deleted += len(batch)
+
+
+def claim_next_job(worker_name):
+    """Sıradaki işi koşullu UPDATE ile sahiplenir; kuyruk boşsa None döner."""
+    queued = BackgroundJob.objects.filter(status=BackgroundJob.STATUS_QUEUED).order_by("created_at", "id")
+    while True:
+        job_id = queued.values_list("id", flat=True).first()
+        if job_id is None:
+            return None
+        now = timezone.now()
+        claimed = BackgroundJob.objects.filter(id=job_id, status=BackgroundJob.STATUS_QUEUED).update(
+            status=BackgroundJob.STATUS_RUNNING,
+            worker=worker_name,
+            started_at=now,
+            heartbeat_at=now,
+            attempts=F("attempts") + 1,
+        )
+        if claimed:
+            return BackgroundJob.objects.get(id=job_id)
+
+
+def run_job(job):
+    handler = JOB_HANDLERS[job.kind]
+    try:
+        job.result_message = handler(job) or ""
+        job.status = BackgroundJob.STATUS_DONE
+        job.error = ""
+    except JobError as exc:
+        job.status = BackgroundJob.STATUS_FAILED
+        job.error = str(exc)
+    except Exception as exc:
+        job.status = BackgroundJob.STATUS_FAILED
+        job.error = f"{exc.__class__.__name__}: {exc}"
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "result_message", "result_file", "error", "finished_at"])
+    return job
+
+
+def run_pending_jobs(worker_name=None, limit=None):
+    """Kuyruk boşalana (veya limit dolana) kadar işleri sırayla çalıştırır; çalışan iş sayısını döner."""
+    worker_name = worker_name or default_worker_name()
+    processed = 0
+    while limit is None or processed < limit:
+        job = claim_next_job(worker_name)
+        if job is None:
+            break
+        run_job(job)
+        processed += 1
+    return processed
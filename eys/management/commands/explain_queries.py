@@ -0,0 +1,88 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from eys.benchmarks import ISOLATED_CACHES, SCENARIOS, BenchmarkError, collect_targets
+from eys.datagen import UniversitySpec, generate_university, refresh_derived
+from eys.queryplan import DEFAULT_MIN_ROWS, QueryPlanError, audit
+
+
+class Command(BaseCommand):
+    help = "Ana view'ların SQL sorgularına EXPLAIN QUERY PLAN uygular ve indekssiz tam taramaları raporlar"
+
+    def add_arguments(self, parser):
+        defaults = UniversitySpec()
+        parser.add_argument("--only", default="", help="Virgülle ayrılmış senaryo adları")
+        parser.add_argument("--min-rows", type=int, default=DEFAULT_MIN_ROWS,
+                            help="Bundan az satırlı tabloların taranması raporlanmaz")
+        parser.add_argument("--ignore-table", action="append", default=[],
+                            help="Bilerek taranan tablo (birden çok kez verilebilir)")
+        parser.add_argument("--show-plans", action="store_true", help="Tam taramalı sorguların tüm planını yazdır")
+        parser.add_argument("--strict", action="store_true", help="Tam tarama bulunursa hata koduyla çık")
+        parser.add_argument("--seed", type=int, default=defaults.seed)
+        parser.add_argument("--students", type=int, default=defaults.students)
+        parser.add_argument("--courses", type=int, default=defaults.courses)
+        parser.add_argument("--instructors", type=int, default=defaults.instructors)
+        parser.add_argument("--advisors", type=int, default=defaults.advisors)
+
+    def handle(self, *args, **options):
+        only = {name.strip() for name in options["only"].split(",") if name.strip()}
+        unknown = only - {name for name, _, _ in SCENARIOS}
+        if unknown:
+            raise CommandError(f"Bilinmeyen senaryo: {', '.join(sorted(unknown))}")
+        spec = UniversitySpec(
+            seed=options["seed"],
+            prefix="bench",
+            students=options["students"],
+            courses=options["courses"],
+            instructors=options["instructors"],
+            advisors=max(options["advisors"], 1),
+        )
+
+        # Geliştirme veritabanına ve paylaşılan önbelleğe dokunmamak için denetim ayrı bir test
+        # veritabanında ve süreç içi önbellekle yapılır.
+        old_name = connection.settings_dict["NAME"]
+        setup_test_environment()
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            with override_settings(CACHES=ISOLATED_CACHES):
+                report = self._run(spec, options, only)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        scan_count = self.write_report(report, show_plans=options["show_plans"])
+        if not scan_count:
+            self.stdout.write(self.style.SUCCESS("✅ Tam tarama yapan sorgu bulunmadı."))
+        elif options["strict"]:
+            raise CommandError(f"{scan_count} sorgu tam tarama yapıyor.")
+
+    def _run(self, spec, options, only):
+        started = time.perf_counter()
+        self.stdout.write(f"🎲 Veri üretiliyor ({spec.students} öğrenci, {spec.courses} ders)...")
+        _, course_ids = generate_university(spec)
+        refresh_derived(course_ids)
+        self.stdout.write(f"  veri hazır ({time.perf_counter() - started:.1f} sn)")
+        try:
+            return audit(
+                collect_targets(spec.prefix), only=only, ignore_tables=set(options["ignore_table"]),
+                min_rows=options["min_rows"], log=lambda message: self.stdout.write(f"  … {message}"),
+            )
+        except (BenchmarkError, QueryPlanError) as exc:
+            raise CommandError(str(exc))
+
+    def write_report(self, report, show_plans=False):
+        scan_count = 0
+        for name, entries in report.items():
+            for entry in entries:
+                if not entry["scans"]:
+                    continue
+                scan_count += 1
+                tables = ", ".join(sorted({table for table, _ in entry["scans"]}))
+                self.stdout.write(self.style.WARNING(f"⚠️  {name}: {tables}"))
+                self.stdout.write(f"    {entry['sql'][:300]}")
+                for detail in entry["plan"] if show_plans else [detail for _, detail in entry["scans"]]:
+                    self.stdout.write(f"    - {detail}")
+        return scan_count
@@ -0,0 +1,72 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from eys.datagen import UniversitySpec, generate_university, purge, refresh_derived
+
+
+class Command(BaseCommand):
+    help = "Benchmark için parametreli, seed ile tekrarlanabilir büyük bir sentetik üniversite üretir"
+
+    def add_arguments(self, parser):
+        defaults = UniversitySpec()
+        parser.add_argument("--seed", type=int, default=defaults.seed)
+        parser.add_argument("--prefix", default=defaults.prefix,
+                            help="Kullanıcı adı / ders kodu öneki (ör. gen_s1, GEN-00001)")
+        parser.add_argument("--students", type=int, default=defaults.students)
+        parser.add_argument("--instructors", type=int, default=defaults.instructors)
+        parser.add_argument("--advisors", type=int, default=defaults.advisors)
+        parser.add_argument("--courses", type=int, default=defaults.courses)
+        parser.add_argument("--courses-per-student", type=int, default=defaults.courses_per_student)
+        parser.add_argument("--exams-per-course", type=int, default=defaults.exams_per_course)
+        parser.add_argument("--los-per-course", type=int, default=defaults.los_per_course)
+        parser.add_argument("--assignments-per-course", type=int, default=defaults.assignments_per_course)
+        parser.add_argument("--criteria-per-assignment", type=int, default=defaults.criteria_per_assignment)
+        parser.add_argument("--submission-rate", type=float, default=defaults.submission_rate)
+        parser.add_argument("--announcements-per-course", type=int, default=defaults.announcements_per_course)
+        parser.add_argument("--materials-per-course", type=int, default=defaults.materials_per_course)
+        parser.add_argument("--notifications-per-student", type=int, default=defaults.notifications_per_student)
+        parser.add_argument("--batch-size", type=int, default=defaults.batch_size)
+        parser.add_argument("--purge", action="store_true",
+                            help="Önce aynı önekle üretilmiş veriyi sil")
+        parser.add_argument("--skip-derived", action="store_true",
+                            help="CourseStats, LO/PO skorları ve arama indeksini yenileme")
+
+    def handle(self, *args, **options):
+        spec = UniversitySpec(
+            seed=options["seed"],
+            prefix=options["prefix"],
+            students=options["students"],
+            instructors=options["instructors"],
+            advisors=options["advisors"],
+            courses=options["courses"],
+            courses_per_student=options["courses_per_student"],
+            exams_per_course=options["exams_per_course"],
+            los_per_course=options["los_per_course"],
+            assignments_per_course=options["assignments_per_course"],
+            criteria_per_assignment=options["criteria_per_assignment"],
+            submission_rate=options["submission_rate"],
+            announcements_per_course=options["announcements_per_course"],
+            materials_per_course=options["materials_per_course"],
+            notifications_per_student=options["notifications_per_student"],
+            batch_size=options["batch_size"],
+        )
+        if spec.instructors + spec.advisors < 1 or spec.courses < 1:
+            raise CommandError("En az bir öğretim elemanı ve bir ders gerekli.")
+
+        if options["purge"]:
+            # Türetilmiş tablolar üretimden sonra zaten yenileniyor.
+            users, courses = purge(spec.prefix, refresh=False)
+            self.stdout.write(f"🧹 {users} kullanıcı ve {courses} ders silindi.")
+
+        log = lambda message: self.stdout.write(f"  … {message}")
+        started = time.perf_counter()
+        self.stdout.write(f"🎲 Sentetik üniversite üretiliyor (seed={spec.seed})...")
+        counts, course_ids = generate_university(spec, log=log)
+        if not options["skip_derived"]:
+            refresh_derived(course_ids, log=log)
+
+        for name, count in sorted(counts.items()):
+            self.stdout.write(f"  {name}: {count}")
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"✅ Tamamlandı ({elapsed:.1f} sn)."))
@@ -0,0 +1,49 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from eys.startup import measure_cold_start, package_totals, summarize
+
+
+class Command(BaseCommand):
+    help = "Uygulamanın soğuk başlangıcını ayrı bir süreçte ölçer ve modül başına içe aktarma sürelerini raporlar"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top", type=int, default=25, help="Gösterilecek modül sayısı")
+        parser.add_argument("--sort", choices=["cumulative", "self"], default="cumulative")
+        parser.add_argument("--prefix", default=None, help="Yalnızca bu paketin modülleri (ör. eys)")
+        parser.add_argument("--no-urls", action="store_true",
+                            help="URLconf'u (view modüllerini) yükleme; yalnızca django.setup()")
+        parser.add_argument("--json", action="store_true", help="Ham sonucu JSON olarak yaz")
+
+    def handle(self, *args, **options):
+        try:
+            result = measure_cold_start(include_urls=not options["no_urls"])
+        except RuntimeError as exc:
+            raise CommandError(f"Başlangıç ölçülemedi: {exc}")
+
+        if options["json"]:
+            result.pop("modules")
+            self.stdout.write(json.dumps(result, ensure_ascii=False, indent=2))
+            return
+
+        self.stdout.write(f"django.setup(): {result['setup_ms']} ms, toplam: {result['total_ms']} ms, "
+                          f"{len(result['modules'])} modül yüklü")
+        if result["stdout"].strip():
+            lines = result["stdout"].strip().splitlines()
+            self.stdout.write(self.style.WARNING(f"Başlangıçta {len(lines)} satır çıktı yazdırıldı."))
+
+        self.stdout.write(f"\nEn pahalı modüller ({options['sort']}, ms):")
+        for row in summarize(result["imports"], sort=options["sort"], prefix=options["prefix"], top=options["top"]):
+            self.stdout.write(f"  {row['self_us'] / 1000:8.2f} {row['cumulative_us'] / 1000:8.2f}  {row['module']}")
+
+        dynamic = summarize(result["dynamic"], prefix=options["prefix"], top=options["top"])
+        if dynamic:
+            self.stdout.write("\nimport_module ile yüklenenler (settings, uygulamalar, modeller; kümülatif ms):")
+            for row in dynamic:
+                self.stdout.write(f"  {row['cumulative_us'] / 1000:8.2f}  {row['module']}")
+
+        if not options["prefix"]:
+            self.stdout.write("\nPaket başına toplam (self, ms):")
+            for package, total in package_totals(result["imports"])[:10]:
+                self.stdout.write(f"  {total / 1000:8.2f}  {package}")
@@ -0,0 +1,37 @@
+from datetime import timedelta
+import gzip
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from eys.models import Notification
+from eys.notifications import prune_notifications
+
+
+class Command(BaseCommand):
+    help = "Okunmuş eski bildirimleri partiler halinde siler; istenirse önce gzip JSONL arşivine yazar"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=90,
+                            help="Bu kadar günden eski okunmuş bildirimler temizlenir (varsayılan 90)")
+        parser.add_argument("--batch-size", type=int, default=5000, help="Parti başına silinen satır")
+        parser.add_argument("--archive", help="Silinen satırların yazılacağı .jsonl.gz dosyası (üzerine ekler)")
+        parser.add_argument("--dry-run", action="store_true", help="Silmeden yalnızca aday sayısını göster")
+
+    def handle(self, *args, **options):
+        if options["days"] < 1 or options["batch_size"] < 1:
+            raise CommandError("--days ve --batch-size pozitif olmalı.")
+        cutoff = timezone.now() - timedelta(days=options["days"])
+
+        if options["dry_run"]:
+            count = Notification.objects.filter(is_read=True, created_at__lt=cutoff).count()
+            self.stdout.write(f"{count} okunmuş bildirim {options['days']} günden eski.")
+            return
+
+        if options["archive"]:
+            with gzip.open(options["archive"], "at", encoding="utf-8") as archive:
+                count = prune_notifications(cutoff, batch_size=options["batch_size"], archive=archive)
+            self.stdout.write(f"Arşiv: {options['archive']}")
+        else:
+            count = prune_notifications(cutoff, batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"✅ {count} okunmuş bildirim temizlendi."))
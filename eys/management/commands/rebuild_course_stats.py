@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from eys.stats import ensure_course_stats, refresh_course_stats
+
+
+class Command(BaseCommand):
+    help = "CourseStats özet tablosunu yeniden hesaplar (tablo öncesi veriler için)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--missing-only", action="store_true",
+                            help="Yalnızca özeti hiç hesaplanmamış dersleri tamamla")
+
+    def handle(self, *args, **options):
+        if options["missing_only"]:
+            count = ensure_course_stats()
+        else:
+            count = refresh_course_stats()
+        self.stdout.write(self.style.SUCCESS(f"✅ {count} ders için özet yazıldı."))
@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from eys.models import Course, StudentOutcomeScore
+from eys.outcomes import compute_course_outcomes, refresh_student_outcomes
+
+
+class Command(BaseCommand):
+    help = "StudentOutcomeScore tablosunu sıfırdan oluşturur ve canlı LO/PO hesabıyla karşılaştırır"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--course", action="append", dest="courses", default=[],
+                            help="Yalnızca bu ders kodu (birden fazla verilebilir)")
+        parser.add_argument("--verify-only", action="store_true",
+                            help="Tabloyu yeniden yazmadan sadece doğrula")
+
+    def handle(self, *args, **options):
+        courses = Course.objects.order_by("code")
+        if options["courses"]:
+            courses = courses.filter(code__in=options["courses"])
+
+        total_rows = 0
+        mismatches = []
+        for course in courses:
+            if not options["verify_only"]:
+                total_rows += refresh_student_outcomes(course.id)
+            mismatches.extend(self._verify(course))
+
+        if not options["verify_only"]:
+            self.stdout.write(f"{courses.count()} ders için {total_rows} skor satırı yazıldı.")
+
+        if mismatches:
+            for line in mismatches[:50]:
+                self.stdout.write(self.style.ERROR(line))
+            raise CommandError(f"{len(mismatches)} skor canlı hesapla uyuşmuyor.")
+        self.stdout.write(self.style.SUCCESS("✅ Önceden hesaplanmış skorlar canlı hesapla birebir aynı."))
+
+    def _verify(self, course):
+        live_lo, live_po = compute_course_outcomes(course.id)
+        expected = {}
+        for student_id, scores in live_lo.items():
+            for lo_id, score in scores.items():
+                expected[(student_id, "LO", lo_id)] = score
+        for student_id, scores in live_po.items():
+            for po_id, score in scores.items():
+                expected[(student_id, "PO", po_id)] = score
+
+        stored = {}
+        rows = StudentOutcomeScore.objects.filter(course=course).values_list(
+            "student_id", "learning_outcome_id", "programming_outcome_id", "score"
+        )
+        for student_id, lo_id, po_id, score in rows:
+            key = (student_id, "LO", lo_id) if lo_id else (student_id, "PO", po_id)
+            stored[key] = score
+
+        problems = []
+        for key in sorted(set(expected) | set(stored), key=str):
+            if expected.get(key) != stored.get(key):
+                student_id, kind, target_id = key
+                problems.append(
+                    f"{course.code} öğrenci={student_id} {kind}={target_id}: "
+                    f"tablo={stored.get(key)} canlı={expected.get(key)}"
+                )
+        return problems
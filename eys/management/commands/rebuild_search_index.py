@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from eys.search import fts_available, rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Küresel arama FTS5 indeksini tüm ders, sınav, duyuru, materyal ve ödevlerden yeniden oluşturur"
+
+    def handle(self, *args, **options):
+        if not fts_available():
+            self.stdout.write("FTS5 indeksi yok; arama icontains yoluna düşüyor, yapılacak bir şey yok.")
+            return
+        count = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f"✅ {count} belge indekslendi."))
@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from eys.models import StudentRisk, User
+from eys.risk import refresh_risk_snapshot, top_at_risk
+
+
+class Command(BaseCommand):
+    help = "Tüm öğrencilerin erken uyarı risk skorlarını hesaplar ve StudentRisk tablosuna yazar"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--student", action="append", dest="students", default=[],
+                            help="Yalnızca bu kullanıcı adı (birden fazla verilebilir)")
+        parser.add_argument("--top", type=int, default=10, help="Sonunda listelenecek en riskli öğrenci sayısı")
+
+    def handle(self, *args, **options):
+        student_ids = None
+        if options["students"]:
+            student_ids = list(User.objects.filter(username__in=options["students"]).values_list("id", flat=True))
+
+        started = time.perf_counter()
+        count = refresh_risk_snapshot(student_ids)
+        elapsed = time.perf_counter() - started
+
+        levels = dict(
+            (level, StudentRisk.objects.filter(level=level).count())
+            for level, _ in StudentRisk.LEVEL_CHOICES
+        )
+        self.stdout.write(
+            f"Yüksek: {levels[StudentRisk.LEVEL_HIGH]}, Takip: {levels[StudentRisk.LEVEL_WATCH]}, "
+            f"Düşük: {levels[StudentRisk.LEVEL_LOW]}"
+        )
+        for risk in top_at_risk(limit=options["top"]):
+            self.stdout.write(f"  {risk.score:>6} {risk.get_level_display():<7} {risk.student.username}")
+        self.stdout.write(self.style.SUCCESS(f"✅ {count} öğrencinin risk skoru {elapsed:.2f} sn'de güncellendi."))
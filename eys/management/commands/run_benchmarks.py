@@ -0,0 +1,117 @@
+from pathlib import Path
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from eys.benchmarks import (
+    ISOLATED_CACHES,
+    SCENARIOS,
+    BenchmarkError,
+    build_report,
+    collect_targets,
+    compare,
+    load_baseline,
+    run_scenarios,
+    write_report,
+)
+from eys.datagen import UniversitySpec, generate_university, refresh_derived
+
+
+class Command(BaseCommand):
+    help = "Ana view'ları sentetik veriyle ölçer (p50/p95, sorgu sayısı, tepe bellek) ve JSON baseline ile karşılaştırır"
+
+    def add_arguments(self, parser):
+        defaults = UniversitySpec()
+        parser.add_argument("--baseline", default=str(Path(settings.BASE_DIR) / "benchmarks" / "baseline.json"),
+                            help="Karşılaştırılacak / yazılacak baseline JSON dosyası")
+        parser.add_argument("--update-baseline", action="store_true",
+                            help="Karşılaştırma yapmadan sonuçları baseline olarak kaydet")
+        parser.add_argument("--output", default=None, help="Bu koşunun sonuçlarını ayrıca bu dosyaya yaz")
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--warmup", type=int, default=2)
+        parser.add_argument("--tolerance", type=float, default=0.25,
+                            help="p95 gecikme ve tepe bellek için izin verilen artış oranı")
+        parser.add_argument("--query-tolerance", type=int, default=0,
+                            help="Sorgu sayısında izin verilen mutlak artış")
+        parser.add_argument("--only", default="", help="Virgülle ayrılmış senaryo adları")
+        parser.add_argument("--seed", type=int, default=defaults.seed)
+        parser.add_argument("--students", type=int, default=defaults.students)
+        parser.add_argument("--courses", type=int, default=defaults.courses)
+        parser.add_argument("--instructors", type=int, default=defaults.instructors)
+        parser.add_argument("--advisors", type=int, default=defaults.advisors)
+        parser.add_argument("--exams-per-course", type=int, default=defaults.exams_per_course)
+
+    def handle(self, *args, **options):
+        only = {name.strip() for name in options["only"].split(",") if name.strip()}
+        unknown = only - {name for name, _, _ in SCENARIOS}
+        if unknown:
+            raise CommandError(f"Bilinmeyen senaryo: {', '.join(sorted(unknown))}")
+        if options["iterations"] < 1:
+            raise CommandError("--iterations en az 1 olmalı.")
+        spec = UniversitySpec(
+            seed=options["seed"],
+            prefix="bench",
+            students=options["students"],
+            courses=options["courses"],
+            instructors=options["instructors"],
+            advisors=max(options["advisors"], 1),
+            exams_per_course=options["exams_per_course"],
+        )
+
+        # Geliştirme veritabanına ve paylaşılan önbelleğe dokunmamak için ölçüm ayrı bir test
+        # veritabanında ve süreç içi önbellekle yapılır.
+        old_name = connection.settings_dict["NAME"]
+        setup_test_environment()
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            with override_settings(CACHES=ISOLATED_CACHES):
+                report = self._run(spec, options, only)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        if options["output"]:
+            write_report(options["output"], report)
+        baseline_path = Path(options["baseline"])
+        if options["update_baseline"]:
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            write_report(baseline_path, report)
+            self.stdout.write(self.style.SUCCESS(f"✅ Baseline kaydedildi: {baseline_path}"))
+            return
+        if not baseline_path.exists():
+            self.stdout.write(self.style.WARNING(
+                f"Baseline bulunamadı ({baseline_path}); kaydetmek için --update-baseline kullanın."
+            ))
+            return
+
+        try:
+            regressions = compare(
+                load_baseline(baseline_path), report,
+                tolerance=options["tolerance"], query_tolerance=options["query_tolerance"],
+            )
+        except BenchmarkError as exc:
+            raise CommandError(str(exc))
+        if regressions:
+            for line in regressions:
+                self.stderr.write(f"❌ {line}")
+            raise CommandError(f"{len(regressions)} performans gerilemesi bulundu.")
+        self.stdout.write(self.style.SUCCESS("✅ Tüm senaryolar baseline toleransı içinde."))
+
+    def _run(self, spec, options, only):
+        log = lambda message: self.stdout.write(f"  … {message}")
+        started = time.perf_counter()
+        self.stdout.write(f"🎲 Veri üretiliyor ({spec.students} öğrenci, {spec.courses} ders)...")
+        _, course_ids = generate_university(spec)
+        refresh_derived(course_ids)
+        self.stdout.write(f"  veri hazır ({time.perf_counter() - started:.1f} sn)")
+        try:
+            targets = collect_targets(spec.prefix)
+            results = run_scenarios(
+                targets, iterations=options["iterations"], warmup=options["warmup"], only=only, log=log
+            )
+        except BenchmarkError as exc:
+            raise CommandError(str(exc))
+        return build_report(spec, results, options["iterations"])
@@ -0,0 +1,55 @@
+from datetime import timedelta
+import time
+
+from django.core.management.base import BaseCommand
+
+from eys.jobs import JOB_RETENTION, default_worker_name, prune_jobs, requeue_stale_jobs, run_pending_jobs
+
+
+class Command(BaseCommand):
+    help = "Kuyruktaki arka plan işlerini (CSV içe aktarma, ZIP, hatırlatma) çalıştırır"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true",
+                            help="Kuyruğu bir kez boşalt ve çık")
+        parser.add_argument("--sleep", type=float, default=2.0,
+                            help="Kuyruk boşken bekleme süresi (saniye)")
+        parser.add_argument("--max-jobs", type=int, default=None,
+                            help="Bu kadar işten sonra çık")
+        parser.add_argument("--maintenance-interval", type=float, default=300.0,
+                            help="Takılı işleri geri alma ve eski işleri temizleme aralığı (saniye)")
+        parser.add_argument("--retention-days", type=float, default=JOB_RETENTION.days,
+                            help="Bitmiş işler ve dosyaları bu kadar gün sonra silinir")
+
+    def handle(self, *args, **options):
+        worker_name = default_worker_name()
+        retention = timedelta(days=options["retention_days"])
+        self.stdout.write(f"Worker başladı: {worker_name}")
+
+        total = 0
+        max_jobs = options["max_jobs"]
+        last_maintenance = None
+        try:
+            while max_jobs is None or total < max_jobs:
+                if last_maintenance is None or time.monotonic() - last_maintenance >= options["maintenance_interval"]:
+                    self._maintain(retention)
+                    last_maintenance = time.monotonic()
+                limit = None if max_jobs is None else max_jobs - total
+                processed = run_pending_jobs(worker_name, limit=limit)
+                total += processed
+                if options["once"]:
+                    break
+                if not processed:
+                    time.sleep(options["sleep"])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(f"✅ {total} iş işlendi."))
+
+    def _maintain(self, retention):
+        """Çöken worker'ların işlerini geri alır ve saklama süresi dolan işleri siler."""
+        requeued = requeue_stale_jobs()
+        if requeued:
+            self.stdout.write(f"{requeued} takılı iş yeniden ele alındı.")
+        pruned = prune_jobs(retention)
+        if pruned:
+            self.stdout.write(f"{pruned} eski iş ve dosyaları silindi.")
@@ -0,0 +1,159 @@
+"""
+İsteğe bağlı performans ölçüm middleware'i.
+
+settings.EYS_PERF_TIMING açıkken her istek için toplam süre, SQL sorgu sayısı
+ve süresi, tekrarlanan sorgu parmak izleri ve şablon render süresi ölçülür.
+Sonuçlar `Server-Timing` başlığı olarak yanıta eklenir ve "eys.performance"
+logger'ına tek satır JSON olarak yazılır. Aynı parmak izine sahip sorgu
+EYS_PERF_NPLUSONE_THRESHOLD kez veya daha fazla çalışırsa N+1 şüphesi olarak
+uyarı loglanır. Kapalıyken middleware zincirinden tamamen çıkarılır.
+
+Şablon süresi için Django sınıfları yamalanmaz; TEMPLATES'teki TimedTemplates
+backend'i yalnızca ölçülen bir istek sırasında süreyi kaydeder. Streaming
+yanıtların gövdesi middleware döndükten sonra üretildiğinden sorgu ve şablon
+değerleri bu yanıtlarda "ölçülmedi" olarak raporlanır.
+"""
+from collections import Counter
+from contextlib import ExitStack
+import contextvars
+import json
+import logging
+import re
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.template.backends.django import DjangoTemplates, Template as DjangoBackendTemplate
+
+logger = logging.getLogger("eys.performance")
+
+_IN_LIST_RE = re.compile(r"\((?:%s|\?)(?:\s*,\s*(?:%s|\?))*\)")
+_NUMBER_RE = re.compile(r"\b\d+\b")
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+_current = contextvars.ContextVar("eys_perf_metrics", default=None)
+
+
+def fingerprint(sql):
+    """Parametre sayısı ve sabitlerden bağımsız sorgu kalıbı (IN listeleri tek öğeye indirgenir)."""
+    sql = _STRING_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = _IN_LIST_RE.sub("(...)", sql)
+    return _WHITESPACE_RE.sub(" ", sql).strip()
+
+
+class _Metrics:
+    def __init__(self):
+        self.queries = []
+        self.sql_time = 0.0
+        self.template_time = 0.0
+        self._template_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - start
+            try:
+                frozen = repr(params)
+            except Exception:
+                frozen = ""
+            self.queries.append((sql, frozen))
+
+
+class _TimedTemplate(DjangoBackendTemplate):
+    def render(self, context=None, request=None):
+        metrics = _current.get()
+        if metrics is None:
+            return super().render(context, request)
+        # İç içe render'lar (ör. render_to_string içinde render) iki kez sayılmasın.
+        metrics._template_depth += 1
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            metrics._template_depth -= 1
+            if metrics._template_depth == 0:
+                metrics.template_time += time.perf_counter() - start
+
+
+class TimedTemplates(DjangoTemplates):
+    """Ölçüm açık bir istekte üst seviye render süresini middleware'e bildiren DjangoTemplates."""
+
+    def from_string(self, template_code):
+        return _TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        return _TimedTemplate(super().get_template(template_name).template, self)
+
+
+class PerformanceTimingMiddleware:
+    def __init__(self, get_response):
+        if not getattr(settings, "EYS_PERF_TIMING", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.nplusone_threshold = getattr(settings, "EYS_PERF_NPLUSONE_THRESHOLD", 5)
+
+    def __call__(self, request):
+        metrics = _Metrics()
+        token = _current.set(metrics)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for conn in connections.all():
+                    stack.enter_context(conn.execute_wrapper(metrics))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        total = time.perf_counter() - start
+
+        report = self._report(request, response, metrics, total)
+        if report["streaming"]:
+            response["Server-Timing"] = f'total;dur={report["total_ms"]};desc="streaming, body not measured"'
+        else:
+            response["Server-Timing"] = ", ".join(
+                [
+                    f"total;dur={report['total_ms']}",
+                    f'sql;dur={report["sql_ms"]};desc="{report["query_count"]} queries"',
+                    f"tpl;dur={report['template_ms']}",
+                    f'dup;desc="{report["duplicate_queries"]} duplicate, {len(report["nplusone"])} n+1"',
+                ]
+            )
+        logger.info(json.dumps(report, ensure_ascii=False))
+        for item in report["nplusone"]:
+            logger.warning(
+                "N+1 şüphesi: %s %d kez çalıştı: %s", report["view"], item["count"], item["fingerprint"]
+            )
+        return response
+
+    def _report(self, request, response, metrics, total):
+        match = getattr(request, "resolver_match", None)
+        report = {
+            "view": match.view_name if match else request.path,
+            "method": request.method,
+            "status": response.status_code,
+            "streaming": response.streaming,
+            "total_ms": round(total * 1000, 2),
+        }
+        if response.streaming:
+            # Gövdedeki sorgular ölçüm bittikten sonra çalışır; eksik sayı yanıltmasın.
+            report.update(sql_ms=None, template_ms=None, query_count=None, duplicate_queries=None, nplusone=[])
+            return report
+        exact = Counter(metrics.queries)
+        patterns = Counter(fingerprint(sql) for sql, _ in metrics.queries)
+        report.update(
+            sql_ms=round(metrics.sql_time * 1000, 2),
+            template_ms=round(metrics.template_time * 1000, 2),
+            query_count=len(metrics.queries),
+            duplicate_queries=sum(count - 1 for count in exact.values() if count > 1),
+            nplusone=[
+                {"fingerprint": pattern, "count": count}
+                for pattern, count in patterns.most_common()
+                if count >= self.nplusone_threshold
+            ],
+        )
+        return report
+
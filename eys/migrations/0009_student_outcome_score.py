@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:53
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eys', '0008_seed_programming_outcomes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentOutcomeScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='outcome_scores', to='eys.course')),
+                ('learning_outcome', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='student_scores', to='eys.learningoutcome')),
+                ('programming_outcome', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='student_scores', to='eys.programmingoutcome')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='outcome_scores', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Student Outcome Score',
+                'verbose_name_plural': 'Student Outcome Scores',
+                'constraints': [models.UniqueConstraint(condition=models.Q(('learning_outcome__isnull', False)), fields=('student', 'course', 'learning_outcome'), name='uniq_student_course_lo_score'), models.UniqueConstraint(condition=models.Q(('programming_outcome__isnull', False)), fields=('student', 'course', 'programming_outcome'), name='uniq_student_course_po_score')],
+            },
+        ),
+    ]
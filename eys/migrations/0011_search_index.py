@@ -0,0 +1,78 @@
+from django.db import OperationalError, migrations
+from django.utils.html import strip_tags
+
+# Bu migration eys.search modülünü içe aktarmaz: DDL ve ilk doldurma burada
+# dondurulmuştur, böylece search.py'deki sonraki değişiklikler geçmiş şemayı
+# değiştirmez. Belge biçimi değişirse indeks `rebuild_search_index` ile yenilenir.
+FTS_TABLE = "eys_search_index"
+
+
+def _course(obj):
+    return f"{obj.code} {obj.name}", "", obj.id
+
+
+def _exam(obj):
+    return obj.name, obj.description, obj.course_id
+
+
+def _announcement(obj):
+    return obj.title, strip_tags(obj.body or ""), obj.course_id
+
+
+def _material(obj):
+    return obj.title, obj.description, obj.course_id
+
+
+def _assignment(obj):
+    return obj.title, strip_tags(obj.description or ""), obj.course_id
+
+
+DOCUMENTS = {
+    "course": ("Course", _course),
+    "exam": ("Exam", _exam),
+    "announcement": ("Announcement", _announcement),
+    "material": ("CourseMaterial", _material),
+    "assignment": ("Assignment", _assignment),
+}
+
+
+def create_search_index(apps, schema_editor):
+    # FTS5 yalnızca SQLite'ta; diğer veritabanları eys.search'teki icontains yolunu kullanır.
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        try:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+                "title, body, kind UNINDEXED, object_id UNINDEXED, course_id UNINDEXED, "
+                "tokenize = 'unicode61 remove_diacritics 2')"
+            )
+        except OperationalError:
+            return
+        for kind, (model_name, document) in DOCUMENTS.items():
+            rows = []
+            for obj in apps.get_model("eys", model_name).objects.all().iterator(chunk_size=1000):
+                title, body, course_id = document(obj)
+                rows.append((title, body or "", kind, obj.pk, course_id))
+            cursor.executemany(
+                f"INSERT INTO {FTS_TABLE} (title, body, kind, object_id, course_id) VALUES (%s, %s, %s, %s, %s)",
+                rows,
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("eys", "0010_background_job"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
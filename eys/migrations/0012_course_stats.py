@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eys', '0011_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('avg_score', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+                ('score_sum', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('result_count', models.PositiveIntegerField(default=0)),
+                ('student_count', models.PositiveIntegerField(default=0)),
+                ('exam_count', models.PositiveIntegerField(default=0)),
+                ('graded_student_count', models.PositiveIntegerField(default=0)),
+                ('stable_count', models.PositiveIntegerField(default=0)),
+                ('watch_count', models.PositiveIntegerField(default=0)),
+                ('support_count', models.PositiveIntegerField(default=0)),
+                ('passing_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('course', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='stats', to='eys.course')),
+            ],
+            options={
+                'verbose_name': 'Course Stats',
+                'verbose_name_plural': 'Course Stats',
+                'indexes': [models.Index(fields=['avg_score'], name='eys_coursestats_avg_idx')],
+            },
+        ),
+    ]
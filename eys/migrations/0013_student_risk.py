@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:27
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eys', '0012_course_stats'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='backgroundjob',
+            name='kind',
+            field=models.CharField(choices=[('exam_scores_import', 'Exam Scores CSV Import'), ('submissions_zip', 'Submissions ZIP Export'), ('assignment_reminders', 'Assignment Reminders'), ('exam_reminders', 'Exam Reminders'), ('risk_refresh', 'Risk Score Refresh')], max_length=50),
+        ),
+        migrations.CreateModel(
+            name='StudentRisk',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.DecimalField(decimal_places=2, default=0, max_digits=5)),
+                ('level', models.CharField(choices=[('low', 'Düşük'), ('watch', 'Takip'), ('high', 'Yüksek')], default='low', max_length=10)),
+                ('avg_score', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+                ('failing_course_count', models.PositiveIntegerField(default=0)),
+                ('weakest_margin', models.DecimalField(blank=True, decimal_places=2, max_digits=6, null=True)),
+                ('trend_slope', models.FloatField(blank=True, null=True)),
+                ('late_ratio', models.FloatField(default=0)),
+                ('missing_count', models.PositiveIntegerField(default=0)),
+                ('computed_at', models.DateTimeField()),
+                ('student', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='risk', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Student Risk',
+                'verbose_name_plural': 'Student Risks',
+                'indexes': [models.Index(fields=['-score'], name='eys_studentrisk_score_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eys', '0016_calendar_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='announcement',
+            index=models.Index(fields=['course', '-pinned', '-created_at'], name='eys_ann_course_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='announcement',
+            index=models.Index(condition=models.Q(('course__isnull', True)), fields=['-pinned', '-created_at'], name='eys_ann_global_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='examresult',
+            index=models.Index(fields=['student', '-updated_at'], name='eys_result_student_upd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentrisk',
+            index=models.Index(fields=['level'], name='eys_studentrisk_level_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(condition=models.Q(('score__isnull', False)), fields=['assignment', 'score'], name='eys_sub_graded_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['student', '-submitted_at'], name='eys_sub_student_time_idx'),
+        ),
+    ]
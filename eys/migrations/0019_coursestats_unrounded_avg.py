@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:46
+
+from django.db import migrations, models
+
+
+def unround_averages(apps, schema_editor):
+    # score_sum tam toplamdır; ortalama ondan yuvarlanmadan yeniden türetilir.
+    CourseStats = apps.get_model("eys", "CourseStats")
+    rows = list(CourseStats.objects.filter(result_count__gt=0).only("id", "score_sum", "result_count"))
+    for stats in rows:
+        stats.avg_score = float(stats.score_sum) / stats.result_count
+    CourseStats.objects.bulk_update(rows, ["avg_score"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eys', '0018_backgroundjob_heartbeat'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='coursestats',
+            name='avg_score',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.RunPython(unround_averages, migrations.RunPython.noop),
+    ]
@@ -1,13 +1,5 @@
-print("=" * 80)
-print("DEBUG: eys/models.py is being loaded")
-print("=" * 80)
-
 from django.db import models
-print("DEBUG: django.db.models imported successfully")
-
 from django.contrib.auth.models import AbstractUser
-print("DEBUG: AbstractUser imported successfully")
-print(f"DEBUG: AbstractUser = {AbstractUser}")
 
 
 class Role(models.Model):
@@ -16,9 +8,6 @@ class Role(models.Model):
     def __str__(self):
         return self.name
 
-print("DEBUG: Role model class defined")
-print(f"DEBUG: Role._meta = {Role._meta if hasattr(Role, '_meta') else 'Not yet initialized'}")
-
 
 class User(AbstractUser):
     role = models.ForeignKey(Role, on_delete=models.SET_NULL, null=True, blank=True)
@@ -31,6 +20,8 @@ class User(AbstractUser):
         related_name="advisees",
     )
     advisor_note = models.TextField(blank=True, default="")
+    # Oturumsuz takvim aboneliği (eys.ics) için gizli anahtar; ilk kullanımda üretilir.
+    calendar_token = models.CharField(max_length=64, unique=True, null=True, blank=True)
 
     def save(self, *args, **kwargs):
         old_advisor_id = None
@@ -51,13 +42,6 @@ class User(AbstractUser):
     def __str__(self):
         return self.username
 
-print("DEBUG: User model class defined")
-print(f"DEBUG: User.__bases__ = {User.__bases__}")
-print(f"DEBUG: User._meta = {User._meta if hasattr(User, '_meta') else 'Not yet initialized'}")
-print("=" * 80)
-print("DEBUG: eys/models.py loading complete")
-print("=" * 80)
-
 
 def _update_advisor_role_by_id(advisor_id):
     if not advisor_id:
@@ -134,11 +118,45 @@ class Exam(models.Model):
     description = models.TextField(blank=True)
     scheduled_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        # Takvimler yalnızca görünen tarih aralığını okur (eys.calendars).
+        indexes = [models.Index(fields=["course", "scheduled_at"], name="eys_exam_course_sched_idx")]
 
     def __str__(self):
         return f"{self.course.code} - {self.name}"
 
 
+class CourseStats(models.Model):
+    """
+    Bölüm sayfaları için dersin önceden hesaplanmış not özeti (eys.stats).
+    Bant sayıları öğrencinin ders ortalamasına ve CourseThreshold'a göredir.
+    """
+
+    course = models.OneToOneField(Course, on_delete=models.CASCADE, related_name="stats")
+    # Eşik filtreleri eski SQL AVG ile aynı sonucu versin diye yuvarlanmadan tutulur.
+    avg_score = models.FloatField(null=True, blank=True)
+    score_sum = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    result_count = models.PositiveIntegerField(default=0)
+    student_count = models.PositiveIntegerField(default=0)
+    exam_count = models.PositiveIntegerField(default=0)
+    graded_student_count = models.PositiveIntegerField(default=0)
+    stable_count = models.PositiveIntegerField(default=0)
+    watch_count = models.PositiveIntegerField(default=0)
+    support_count = models.PositiveIntegerField(default=0)
+    passing_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Course Stats"
+        verbose_name_plural = "Course Stats"
+        indexes = [models.Index(fields=["avg_score"], name="eys_coursestats_avg_idx")]
+
+    def __str__(self):
+        return f"{self.course.code} stats"
+
+
 class LearningOutcome(models.Model):
     course = models.ForeignKey(Course, on_delete=models.CASCADE)
     title = models.CharField(max_length=255)
@@ -203,11 +221,88 @@ class ExamResult(models.Model):
     class Meta:
         unique_together = ("exam", "student")
         ordering = ["-updated_at"]
+        # Öğrenci paneli ve danışman detayı: öğrencinin sonuçları, en yeni önce.
+        indexes = [models.Index(fields=["student", "-updated_at"], name="eys_result_student_upd_idx")]
 
     def __str__(self):
         return f"{self.student} - {self.exam} ({self.score})"
 
 
+class StudentOutcomeScore(models.Model):
+    """Öğrencinin bir dersteki LO veya PO skorunun önceden hesaplanmış hali."""
+
+    student = models.ForeignKey(User, on_delete=models.CASCADE, related_name="outcome_scores")
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name="outcome_scores")
+    learning_outcome = models.ForeignKey(
+        LearningOutcome, on_delete=models.CASCADE, null=True, blank=True, related_name="student_scores"
+    )
+    programming_outcome = models.ForeignKey(
+        ProgrammingOutcome, on_delete=models.CASCADE, null=True, blank=True, related_name="student_scores"
+    )
+    score = models.DecimalField(max_digits=5, decimal_places=2)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Student Outcome Score"
+        verbose_name_plural = "Student Outcome Scores"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["student", "course", "learning_outcome"],
+                condition=models.Q(learning_outcome__isnull=False),
+                name="uniq_student_course_lo_score",
+            ),
+            models.UniqueConstraint(
+                fields=["student", "course", "programming_outcome"],
+                condition=models.Q(programming_outcome__isnull=False),
+                name="uniq_student_course_po_score",
+            ),
+        ]
+
+    def __str__(self):
+        target = self.learning_outcome or self.programming_outcome
+        return f"{self.student} - {target} ({self.score})"
+
+
+class StudentRisk(models.Model):
+    """
+    Öğrencinin erken uyarı risk skorunun son anlık görüntüsü (eys.risk).
+    Skor 0-100 arasıdır; bileşenler ders eşiklerine göre not açığı, not
+    eğilimi, geç teslim oranı ve süresi geçmiş teslim edilmemiş ödevlerdir.
+    """
+
+    LEVEL_LOW = "low"
+    LEVEL_WATCH = "watch"
+    LEVEL_HIGH = "high"
+    LEVEL_CHOICES = [
+        (LEVEL_LOW, "Düşük"),
+        (LEVEL_WATCH, "Takip"),
+        (LEVEL_HIGH, "Yüksek"),
+    ]
+
+    student = models.OneToOneField(User, on_delete=models.CASCADE, related_name="risk")
+    score = models.DecimalField(max_digits=5, decimal_places=2, default=0)
+    level = models.CharField(max_length=10, choices=LEVEL_CHOICES, default=LEVEL_LOW)
+    avg_score = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
+    failing_course_count = models.PositiveIntegerField(default=0)
+    weakest_margin = models.DecimalField(max_digits=6, decimal_places=2, null=True, blank=True)
+    trend_slope = models.FloatField(null=True, blank=True)
+    late_ratio = models.FloatField(default=0)
+    missing_count = models.PositiveIntegerField(default=0)
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "Student Risk"
+        verbose_name_plural = "Student Risks"
+        indexes = [
+            models.Index(fields=["-score"], name="eys_studentrisk_score_idx"),
+            # Bölüm özetindeki seviye sayımı (explain_queries raporu).
+            models.Index(fields=["level"], name="eys_studentrisk_level_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.student} risk {self.score}"
+
+
 class Announcement(models.Model):
     title = models.CharField(max_length=200)
     body = models.TextField()
@@ -223,6 +318,14 @@ class Announcement(models.Model):
 
     class Meta:
         ordering = ["-pinned", "-created_at"]
+        indexes = [
+            # Ders duyuru akışı: sabitler önce, en yeni önce.
+            models.Index(fields=["course", "-pinned", "-created_at"], name="eys_ann_course_feed_idx"),
+            # Derse bağlı olmayan genel duyurular.
+            models.Index(
+                fields=["-pinned", "-created_at"], condition=models.Q(course__isnull=True), name="eys_ann_global_idx",
+            ),
+        ]
 
     def __str__(self):
         if self.course:
@@ -264,6 +367,7 @@ class Assignment(models.Model):
 
     class Meta:
         ordering = ["-published_at", "-created_at"]
+        indexes = [models.Index(fields=["course", "due_at"], name="eys_assign_course_due_idx")]
 
     def __str__(self):
         return f"{self.course.code} - {self.title}"
@@ -302,6 +406,13 @@ class Submission(models.Model):
     class Meta:
         unique_together = ("assignment", "student")
         ordering = ["-updated_at"]
+        indexes = [
+            # Ödev detayındaki not özeti yalnızca notlanmış teslimleri okur.
+            models.Index(
+                fields=["assignment", "score"], condition=models.Q(score__isnull=False), name="eys_sub_graded_idx",
+            ),
+            models.Index(fields=["student", "-submitted_at"], name="eys_sub_student_time_idx"),
+        ]
 
     def __str__(self):
         return f"{self.student} - {self.assignment}"
@@ -413,6 +524,60 @@ class Notification(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Gelen kutusu (created_at, id) anahtarıyla sayfalanır.
+            models.Index(fields=["user", "-created_at", "-id"], name="eys_notif_inbox_idx"),
+            # Okunmamış sayısı/filtresi ve okunmuş eski bildirimlerin temizliği.
+            models.Index(fields=["user", "is_read", "-created_at"], name="eys_notif_user_read_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user} - {self.kind}"
+
+
+class BackgroundJob(models.Model):
+    """run_eys_worker komutunun işlediği veritabanı tabanlı iş kuyruğu kaydı."""
+
+    KIND_CHOICES = [
+        ("exam_scores_import", "Exam Scores CSV Import"),
+        ("submissions_zip", "Submissions ZIP Export"),
+        ("assignment_reminders", "Assignment Reminders"),
+        ("exam_reminders", "Exam Reminders"),
+        ("risk_refresh", "Risk Score Refresh"),
+    ]
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, "Queued"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_DONE, "Done"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name="background_jobs")
+    kind = models.CharField(max_length=50, choices=KIND_CHOICES)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    params = models.JSONField(default=dict, blank=True)
+    input_file = models.FileField(upload_to="jobs/input/", null=True, blank=True)
+    result_file = models.FileField(upload_to="jobs/results/", null=True, blank=True)
+    result_message = models.TextField(blank=True)
+    error = models.TextField(blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    worker = models.CharField(max_length=100, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [models.Index(fields=["status", "created_at"], name="eys_job_status_created_idx")]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} #{self.pk} ({self.status})"
+
+    @property
+    def is_finished(self):
+        return self.status in (self.STATUS_DONE, self.STATUS_FAILED)
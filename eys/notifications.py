@@ -0,0 +1,149 @@
+"""
+Toplu bildirim gönderimi, gelen kutusu sayfalama ve eski bildirim temizliği.
+
+Bildirimler alıcı başına tek INSERT yerine bulk_create ile partiler halinde
+yazılır. Hatırlatma fonksiyonları hem görünümlerden hem de arka plan işlerinden
+(eys.jobs) çağrılır.
+
+Gelen kutusu OFFSET yerine (created_at, id) anahtarıyla sayfalanır; her sayfa
+eys_notif_inbox_idx üzerinde kaldığı yerden okunur, bu yüzden tablo büyüdükçe
+sayfa maliyeti artmaz.
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+import json
+
+from django.db.models import Q
+from django.urls import reverse
+from django.utils import timezone
+
+from .context_processors import invalidate_navbar, navbar_signals_suspended
+from .models import Notification
+
+
+def notify_users(recipients, kind, message, url="", payload="", batch_size=500):
+    """
+    Toplu bildirim: recipients (kullanıcı queryset'i) için bildirimleri
+    batch_size'lık bulk_create'lerle yazar ve oluşturulan sayıyı döner.
+    message sabit metin ya da kullanıcıyı alıp metin dönen bir fonksiyon olabilir.
+    """
+    per_user = callable(message)
+    if per_user:
+        recipients = recipients.iterator(chunk_size=batch_size)
+    else:
+        recipients = recipients.values_list("id", flat=True).iterator(chunk_size=batch_size)
+        message = message[:255]
+    url = url or ""
+    payload = payload or ""
+
+    count = 0
+    batch = []
+    user_ids = []
+    for recipient in recipients:
+        user_id = recipient.id if per_user else recipient
+        text = message(recipient)[:255] if per_user else message
+        batch.append(Notification(user_id=user_id, kind=kind, message=text, url=url, payload=payload))
+        user_ids.append(user_id)
+        if len(batch) >= batch_size:
+            Notification.objects.bulk_create(batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        Notification.objects.bulk_create(batch)
+        count += len(batch)
+    invalidate_navbar(user_ids)
+    return count
+
+
+def send_assignment_reminders_for(assignment):
+    """Ödevi henüz teslim etmemiş öğrencilere hatırlatma gönderir; gönderilen sayıyı döner."""
+    submitted_ids = assignment.submissions.values_list("student_id", flat=True)
+    missing_students = assignment.course.students.exclude(id__in=submitted_ids)
+    return notify_users(
+        missing_students,
+        "assignment_due",
+        f"{assignment.title} ?devini teslim etmen gerekiyor.",
+        url=reverse("student_assignment_detail", args=[assignment.id]),
+    )
+
+
+def send_exam_reminders_for(exam):
+    """Dersin tüm öğrencilerine sınav hatırlatması gönderir; gönderilen sayıyı döner."""
+    if exam.scheduled_at:
+        date_label = timezone.localtime(exam.scheduled_at).strftime("%d.%m.%Y %H:%M")
+    else:
+        date_label = "Belirtilmedi"
+    message = f"{exam.course.code} - {exam.name} sinavin yaklasiyor. Tarih: {date_label}"
+    return notify_users(
+        exam.course.students.all(),
+        "exam_reminder",
+        message,
+        url=reverse("exam_detail", args=[exam.id]),
+    )
+
+
+INBOX_PAGE_SIZE = 25
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def encode_cursor(notification):
+    """Bildirimin (created_at, id) anahtarını URL'de taşınabilir metne çevirir."""
+    return f"{(notification.created_at - _EPOCH) // _MICROSECOND}.{notification.id}"
+
+
+def decode_cursor(cursor):
+    """encode_cursor çıktısını (created_at, id) çiftine çevirir; geçersizse None."""
+    try:
+        micros, notif_id = cursor.split(".")
+        return _EPOCH + timedelta(microseconds=int(micros)), int(notif_id)
+    except (AttributeError, ValueError, OverflowError):
+        return None
+
+
+def inbox_page(user, cursor=None, limit=INBOX_PAGE_SIZE, unread_only=False):
+    """
+    Kullanıcının bildirimlerinden cursor'dan sonraki (daha eski) en fazla limit
+    tanesini, en yeni önce döner: (bildirimler, sonraki_cursor). Son sayfada
+    sonraki_cursor None'dır.
+    """
+    notifs = Notification.objects.filter(user=user)
+    if unread_only:
+        notifs = notifs.filter(is_read=False)
+    position = decode_cursor(cursor) if cursor else None
+    if position:
+        created_at, notif_id = position
+        notifs = notifs.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=notif_id))
+    page = list(notifs.order_by("-created_at", "-id")[:limit + 1])
+    if len(page) > limit:
+        page = page[:limit]
+        return page, encode_cursor(page[-1])
+    return page, None
+
+
+def prune_notifications(older_than, batch_size=5000, archive=None):
+    """
+    older_than'dan önce oluşturulmuş okunmuş bildirimleri batch_size'lık
+    partiler halinde siler; archive (metin dosyası) verilirse silinen her satır
+    önce JSON satırı olarak yazılır. Silinen sayıyı döner. Partiler birincil
+    anahtar sırasıyla ilerler, böylece her parti bir öncekinin kaldığı yerden
+    okur ve kilitler kısa tutulur.
+    """
+    candidates = Notification.objects.filter(is_read=True, created_at__lt=older_than).order_by("id")
+    fields = ["id", "user_id", "kind", "message", "url", "payload", "created_at", "read_at"]
+    deleted = 0
+    last_id = 0
+    while True:
+        rows = list(candidates.filter(id__gt=last_id).values(*fields)[:batch_size])
+        if not rows:
+            break
+        if archive is not None:
+            for row in rows:
+                archive.write(json.dumps(row, ensure_ascii=False, default=str) + "\n")
+        ids = [row["id"] for row in rows]
+        # Satır başına navbar silmek yerine parti başına tek invalidate yeterli.
+        with navbar_signals_suspended():
+            Notification.objects.filter(pk__in=ids).delete()
+        invalidate_navbar({row["user_id"] for row in rows})
+        deleted += len(ids)
+        last_id = ids[-1]
+    return deleted
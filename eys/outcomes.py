@@ -0,0 +1,303 @@
+"""
+LO/PO skor hesaplama motoru.
+
+Sınav→LO (ExamLOWeight) ve LO→PO (LOPOWeight) ağırlıkları bir kez seyrek
+matrislere dönüştürülür; öğrenci×sınav skor matrisi bu matrislerle sütun
+bazında toplu olarak çarpılır. Hesaplar Decimal ile yapılır, böylece
+yuvarlama kuralları görünümlerdeki eski döngülerle birebir aynı kalır.
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+
+from . import deferred
+from .models import (
+    Exam,
+    ExamLOWeight,
+    ExamResult,
+    LearningOutcome,
+    LOPOWeight,
+    StudentOutcomeScore,
+)
+
+HUNDRED = Decimal("100")
+ZERO = Decimal("0")
+
+
+def _weight_percent(weight):
+    try:
+        return Decimal(str(weight or 0))
+    except Exception:
+        return ZERO
+
+
+def _clamp_round(total):
+    return round(min(HUNDRED, total), 2)
+
+
+class OutcomeEngine:
+    """
+    Bir LO kümesi için ağırlık matrislerini tutar ve skorları toplu hesaplar.
+
+    exam_lo_rows: (lo_id, exam_id, weight) üçlüleri
+    lo_po_rows: (lo_id, po_id, weight) üçlüleri
+    """
+
+    def __init__(self, lo_ids, exam_lo_rows, lo_po_rows):
+        self.lo_ids = list(lo_ids)
+        self.exam_lo = defaultdict(list)
+        self.lo_weight_totals = defaultdict(lambda: ZERO)
+        for lo_id, exam_id, weight in exam_lo_rows:
+            percent = _weight_percent(weight)
+            self.exam_lo[lo_id].append((exam_id, percent / HUNDRED))
+            self.lo_weight_totals[lo_id] += percent
+
+        self.lo_po = defaultdict(list)
+        self.po_ids = []
+        seen_po = set()
+        for lo_id, po_id, weight in lo_po_rows:
+            if not po_id:
+                continue
+            percent = _weight_percent(weight)
+            self.lo_po[lo_id].append((po_id, percent, percent / HUNDRED))
+            if po_id not in seen_po:
+                seen_po.add(po_id)
+                self.po_ids.append(po_id)
+
+    @classmethod
+    def from_learning_outcomes(cls, los, include_po=True):
+        """
+        Prefetch edilmiş (examloweight_set, po_weights) LO listesinden kurar.
+        Yalnızca LO skoru gereken yerlerde include_po=False ile po_weights okunmaz.
+        """
+        los = list(los)
+        exam_lo_rows = [
+            (lo.id, w.exam_id, w.weight) for lo in los for w in lo.examloweight_set.all()
+        ]
+        lo_po_rows = []
+        if include_po:
+            lo_po_rows = [
+                (lo.id, w.programming_outcome_id, w.weight) for lo in los for w in lo.po_weights.all()
+            ]
+        return cls([lo.id for lo in los], exam_lo_rows, lo_po_rows)
+
+    @classmethod
+    def for_course(cls, course):
+        lo_ids = list(
+            LearningOutcome.objects.filter(course=course).order_by("id").values_list("id", flat=True)
+        )
+        exam_lo_rows = ExamLOWeight.objects.filter(learning_outcome_id__in=lo_ids).order_by(
+            "learning_outcome_id", "id"
+        ).values_list("learning_outcome_id", "exam_id", "weight")
+        lo_po_rows = LOPOWeight.objects.filter(learning_outcome_id__in=lo_ids).order_by(
+            "learning_outcome_id", "id"
+        ).values_list("learning_outcome_id", "programming_outcome_id", "weight")
+        return cls(lo_ids, exam_lo_rows, lo_po_rows)
+
+    def lo_scores_batch(self, score_matrix, require_positive=False):
+        """
+        score_matrix: {student_id: {exam_id: Decimal}}
+        Dönüş: {student_id: {lo_id: Decimal | None}}
+
+        require_positive=True olduğunda toplamı 0 olan LO'lar None sayılır
+        (öğrenci ekranlarının eski davranışı).
+        """
+        columns = defaultdict(dict)
+        for student_id, row in score_matrix.items():
+            for exam_id, score in row.items():
+                if score is not None:
+                    columns[exam_id][student_id] = Decimal(score)
+
+        results = {student_id: {} for student_id in score_matrix}
+        for lo_id in self.lo_ids:
+            totals = {}
+            for exam_id, fraction in self.exam_lo.get(lo_id, ()):
+                for student_id, score in columns.get(exam_id, {}).items():
+                    totals[student_id] = totals.get(student_id, ZERO) + score * fraction
+            has_weight = self.lo_weight_totals[lo_id] > 0
+            for student_id, student_scores in results.items():
+                total = totals.get(student_id)
+                if not has_weight or total is None or (require_positive and not total > 0):
+                    student_scores[lo_id] = None
+                else:
+                    student_scores[lo_id] = _clamp_round(total)
+        return results
+
+    def po_scores_batch(self, lo_score_matrix):
+        """
+        lo_score_matrix: {student_id: {lo_id: Decimal | None}}
+        Dönüş: {student_id: {po_id: (Decimal | None, kapsam_ağırlığı)}}
+        """
+        results = {}
+        for student_id, lo_scores in lo_score_matrix.items():
+            totals = {}
+            coverage = {}
+            for lo_id in self.lo_ids:
+                lo_score = lo_scores.get(lo_id)
+                if lo_score is None:
+                    continue
+                for po_id, percent, fraction in self.lo_po.get(lo_id, ()):
+                    coverage[po_id] = coverage.get(po_id, ZERO) + percent
+                    totals[po_id] = totals.get(po_id, ZERO) + lo_score * fraction
+            student_scores = {}
+            for po_id, total in totals.items():
+                weight = coverage[po_id]
+                student_scores[po_id] = (_clamp_round(total) if weight > 0 else None, weight)
+            results[student_id] = student_scores
+        return results
+
+    def po_coverage(self, lo_scores):
+        """Skoru olan LO'lar üzerinden PO başına toplam ağırlık: {po_id: Decimal}."""
+        coverage = {}
+        for lo_id in self.lo_ids:
+            if lo_scores.get(lo_id) is None:
+                continue
+            for po_id, percent, _ in self.lo_po.get(lo_id, ()):
+                coverage[po_id] = coverage.get(po_id, ZERO) + percent
+        return coverage
+
+    def lo_scores(self, exam_scores, require_positive=False):
+        """Tek öğrenci için {lo_id: Decimal | None}."""
+        return self.lo_scores_batch({None: exam_scores}, require_positive)[None]
+
+    def po_scores(self, lo_scores):
+        """Tek öğrenci için {po_id: (Decimal | None, kapsam_ağırlığı)}."""
+        return self.po_scores_batch({None: lo_scores})[None]
+
+
+def load_score_matrix(results):
+    """ExamResult queryset'inden {student_id: {exam_id: Decimal}} matrisi üretir."""
+    matrix = defaultdict(dict)
+    if hasattr(results, "values_list"):
+        results = results.values_list("student_id", "exam_id", "score")
+    for student_id, exam_id, score in results:
+        if score is None:
+            continue
+        matrix[student_id][exam_id] = Decimal(score)
+    return matrix
+
+
+
+def compute_course_outcomes(course_id, student_ids=None):
+    """
+    Dersin LO/PO skorlarını canlı hesaplar.
+    Dönüş: ({student_id: {lo_id: Decimal}}, {student_id: {po_id: Decimal}}); None skorlar atlanır.
+    """
+    engine = OutcomeEngine.for_course(course_id)
+    results = ExamResult.objects.filter(exam__course_id=course_id).order_by()
+    if student_ids is not None:
+        results = results.filter(student_id__in=student_ids)
+    lo_matrix = engine.lo_scores_batch(load_score_matrix(results))
+    po_matrix = engine.po_scores_batch(lo_matrix)
+    lo_scores = {
+        student_id: {lo_id: score for lo_id, score in scores.items() if score is not None}
+        for student_id, scores in lo_matrix.items()
+    }
+    po_scores = {
+        student_id: {po_id: score for po_id, (score, _) in scores.items() if score is not None}
+        for student_id, scores in po_matrix.items()
+    }
+    return lo_scores, po_scores
+
+
+def refresh_student_outcomes(course_id, student_ids=None):
+    """
+    StudentOutcomeScore tablosunda (ders, öğrenciler) dilimini yeniden yazar.
+    student_ids verilmezse dersin tamamı yenilenir.
+    """
+    if student_ids is not None:
+        student_ids = list(student_ids)
+        if not student_ids:
+            return 0
+    lo_scores, po_scores = compute_course_outcomes(course_id, student_ids)
+    rows = []
+    for student_id, scores in lo_scores.items():
+        for lo_id, score in scores.items():
+            rows.append(
+                StudentOutcomeScore(
+                    student_id=student_id, course_id=course_id, learning_outcome_id=lo_id, score=score
+                )
+            )
+    for student_id, scores in po_scores.items():
+        for po_id, score in scores.items():
+            rows.append(
+                StudentOutcomeScore(
+                    student_id=student_id, course_id=course_id, programming_outcome_id=po_id, score=score
+                )
+            )
+    stale = StudentOutcomeScore.objects.filter(course_id=course_id)
+    if student_ids is not None:
+        stale = stale.filter(student_id__in=student_ids)
+    with transaction.atomic():
+        stale.delete()
+        StudentOutcomeScore.objects.bulk_create(rows, batch_size=500)
+    return len(rows)
+
+
+def stored_course_outcomes(course_id, student_ids=None):
+    """
+    Önceden hesaplanmış skorları okur; compute_course_outcomes ile aynı biçimde döner.
+    student_ids verilirse yalnızca o öğrencilerin satırları okunur. Yalnızca
+    okur; tablo sinyallerle güncel tutulur, tablodan önceki veriler için
+    `python manage.py rebuild_outcome_scores` çalıştırılır.
+    """
+    rows = StudentOutcomeScore.objects.filter(course_id=course_id)
+    if student_ids is not None:
+        rows = rows.filter(student_id__in=student_ids)
+    rows = rows.values_list("student_id", "learning_outcome_id", "programming_outcome_id", "score")
+    lo_scores = defaultdict(dict)
+    po_scores = defaultdict(dict)
+    for student_id, lo_id, po_id, score in rows:
+        if lo_id:
+            lo_scores[student_id][lo_id] = score
+        elif po_id:
+            po_scores[student_id][po_id] = score
+    return lo_scores, po_scores
+
+
+def _merge_slice(slices, course_id, student_ids):
+    if not course_id:
+        return
+    if student_ids is None:
+        slices[course_id] = None
+    elif slices.get(course_id, ()) is not None:
+        slices.setdefault(course_id, set()).update(student_ids)
+
+
+def schedule_outcome_refresh(course_id=None, exam_id=None, lo_id=None, student_ids=None):
+    """
+    Skor dilimini commit sonrasında yenilenmek üzere sıraya koyar.
+
+    Aynı transaction içindeki istekler birleştirilir; sınav/LO kimlikleri ders
+    kimliğine flush anında tek sorguyla çevrilir. Böylece toplu silmede satır
+    başına sorgu ya da yeniden hesap yapılmaz.
+    """
+
+    def update(pending):
+        if course_id:
+            _merge_slice(pending["course"], course_id, student_ids)
+        elif exam_id:
+            _merge_slice(pending["exam"], exam_id, student_ids)
+        elif lo_id:
+            _merge_slice(pending["lo"], lo_id, student_ids)
+
+    deferred.schedule(
+        "outcome_scores", lambda: {"course": {}, "exam": {}, "lo": {}}, update, flush_outcome_refreshes
+    )
+
+
+def flush_outcome_refreshes(pending):
+    slices = {}
+    for course_id, student_ids in pending["course"].items():
+        _merge_slice(slices, course_id, student_ids)
+    exam_courses = dict(Exam.objects.filter(id__in=list(pending["exam"])).values_list("id", "course_id"))
+    for exam_id, student_ids in pending["exam"].items():
+        _merge_slice(slices, exam_courses.get(exam_id), student_ids)
+    lo_courses = dict(
+        LearningOutcome.objects.filter(id__in=list(pending["lo"])).values_list("id", "course_id")
+    )
+    for lo_id, student_ids in pending["lo"].items():
+        _merge_slice(slices, lo_courses.get(lo_id), student_ids)
+    for course_id, student_ids in slices.items():
+        refresh_student_outcomes(course_id, student_ids)
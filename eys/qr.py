@@ -0,0 +1,40 @@
+"""
+Mobil not girişi bağlantıları için QR kodu (PNG) üretimi.
+
+Aynı bağlantının QR'ı her zaman aynıdır; PNG süreç içinde LRU önbellekte
+tutulur ve ETag yalnızca bağlantıdan hesaplanır, böylece koşullu istekler
+(If-None-Match) görüntü hiç üretilmeden 304 ile yanıtlanır. qrcode paketi
+isteğe bağlıdır; kurulu değilse qr_png() None döner.
+"""
+from functools import lru_cache
+import hashlib
+import importlib.util
+import io
+
+QR_CACHE_SIZE = 256
+# Görüntü üretimi değişirse tarayıcı önbelleklerinin geçersizlenmesi için artırılır.
+QR_VERSION = 1
+
+
+@lru_cache(maxsize=None)
+def qr_available():
+    return importlib.util.find_spec("qrcode") is not None
+
+
+def qr_etag(data):
+    digest = hashlib.sha1(f"{QR_VERSION}:{data}".encode("utf-8")).hexdigest()
+    return f'"qr-{digest[:24]}"'
+
+
+@lru_cache(maxsize=QR_CACHE_SIZE)
+def qr_png(data):
+    if not qr_available():
+        return None
+    try:
+        import qrcode
+
+        buffer = io.BytesIO()
+        qrcode.make(data).save(buffer, format="PNG")
+        return buffer.getvalue()
+    except Exception:
+        return None
@@ -0,0 +1,118 @@
+"""
+Sorgu planı denetimi (indeks danışmanı).
+
+Ana view'lar (eys.benchmarks.SCENARIOS) önbellek boşken birer kez çağrılır,
+ürettikleri SELECT sorguları yakalanır ve her biri için EXPLAIN QUERY PLAN
+çalıştırılır. İndeks kullanmadan tabloyu baştan sona okuyan adımlar ("SCAN
+tablo") tam tarama olarak raporlanır; SEARCH adımları, "SCAN tablo USING
+INDEX" gibi indeks sırasıyla okumalar, FTS sanal tablosu ve alt sorgu
+sonuçları sorun sayılmaz. min_rows satırdan küçük tabloların taranması
+indeks aramasından ucuz olduğu için atlanır. Komut arayüzü:
+`manage.py explain_queries`.
+"""
+import re
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from .benchmarks import SCENARIOS, BenchmarkError
+
+DEFAULT_MIN_ROWS = 1000
+# Django'nun alt sorgu ve join takma adları: "eys_course" U0, "auth_user" T3
+_ALIAS_RE = re.compile(r'"(\w+)"\s+([A-Z]\d+)\b')
+
+
+class QueryPlanError(Exception):
+    pass
+
+
+def explain(sql):
+    """SQLite plan adımlarının açıklamaları, plan sırasıyla."""
+    if connection.vendor != "sqlite":
+        raise QueryPlanError(f"EXPLAIN QUERY PLAN yalnızca SQLite'ta destekleniyor ({connection.vendor}).")
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        return [row[3] for row in cursor.fetchall()]
+
+
+def table_scans(sql, plan):
+    """Plandaki indekssiz tablo taramaları: [(tablo, adım)]; takma adlar tablo adına çevrilir."""
+    aliases = {alias: table for table, alias in _ALIAS_RE.findall(sql)}
+    scans = []
+    for detail in plan:
+        if not detail.startswith("SCAN ") or " USING " in detail or " VIRTUAL TABLE " in detail:
+            continue
+        name = detail.split()[1]
+        if name.startswith("(") or name == "CONSTANT":
+            continue
+        scans.append((aliases.get(name, name), detail))
+    return scans
+
+
+def capture_selects(client, url):
+    """url'nin soğuk önbellekle ürettiği benzersiz SELECT sorguları, ilk görülme sırasıyla."""
+    cache.clear()
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+        if response.status_code != 200:
+            raise BenchmarkError(f"{url} {response.status_code} döndü.")
+        for _ in response.streaming_content if response.streaming else [response.content]:
+            pass
+        response.close()
+    selects = {}
+    for query in ctx.captured_queries:
+        if query["sql"].lstrip().upper().startswith("SELECT"):
+            selects.setdefault(query["sql"], None)
+    return list(selects)
+
+
+class _RowCounts(dict):
+    """Tablo adı -> satır sayısı; veritabanında olmayan adlar (CTE vb.) için None."""
+
+    def __init__(self):
+        super().__init__()
+        self.tables = set(connection.introspection.table_names())
+
+    def __missing__(self, table):
+        count = None
+        if table in self.tables:
+            with connection.cursor() as cursor:
+                cursor.execute(f"SELECT COUNT(*) FROM {connection.ops.quote_name(table)}")
+                count = cursor.fetchone()[0]
+        self[table] = count
+        return count
+
+
+def audit(targets, only=None, ignore_tables=(), min_rows=DEFAULT_MIN_ROWS, log=None):
+    """
+    {senaryo: [{"sql", "plan", "scans"}]} döner; scans raporlanacak
+    [(tablo, adım)] listesidir. Planlar tüm senaryolar çalıştıktan sonra
+    alınır ki hepsi aynı veriye karşı olsun.
+    """
+    log = log or (lambda message: None)
+    clients = {}
+    captured = {}
+    for name, user_key, url_for in SCENARIOS:
+        if only and name not in only:
+            continue
+        if user_key not in clients:
+            clients[user_key] = Client()
+            clients[user_key].force_login(targets["users"][user_key])
+        captured[name] = capture_selects(clients[user_key], url_for(targets))
+
+    row_counts = _RowCounts()
+    report = {}
+    for name, queries in captured.items():
+        entries = []
+        for sql in queries:
+            plan = explain(sql)
+            scans = [
+                (table, detail) for table, detail in table_scans(sql, plan)
+                if table not in ignore_tables and row_counts[table] is not None and row_counts[table] >= min_rows
+            ]
+            entries.append({"sql": sql, "plan": plan, "scans": scans})
+        report[name] = entries
+        log(f"{name}: {len(entries)} sorgu, {sum(1 for entry in entries if entry['scans'])} tam tarama")
+    return report
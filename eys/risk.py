@@ -0,0 +1,271 @@
+"""
+Erken uyarı risk skorlaması.
+
+Tüm öğrenciler için risk özellikleri birkaç toplu geçişte hesaplanır ve
+StudentRisk tablosuna yazılır; danışman ve bölüm sayfaları yalnızca bu
+anlık görüntüyü okur. Hesap `manage.py refresh_risk_scores` veya
+"risk_refresh" arka plan işiyle çalıştırılır.
+
+Geçişler (öğrenci sayısından bağımsız sabit sayıda sorgu):
+1. Teslimler öğrenci başına GROUP BY ile sayılır (toplam / geç).
+2. Süresi geçmiş yayımlanmış ödevler ders başına, ders kayıtları ve
+   öğrencinin bu ödevlere teslimleri ile birleştirilerek eksik ödev sayısı
+   bulunur.
+3. ExamResult (öğrenci, sınav tarihi) sırasıyla akıtılır; ders ortalamaları
+   ve sınav sırasına göre not eğilimi (en küçük kareler eğimi) biriken
+   toplamlarla tek geçişte çıkarılır ve satırlar partiler halinde yazılır.
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from .models import Assignment, Course, CourseThreshold, ExamResult, StudentRisk, Submission, User
+from .stats import DEFAULT_THRESHOLDS
+
+# Skor bileşenlerinin üst sınırları (toplam 100).
+ACADEMIC_WEIGHT = 50
+WATCH_WEIGHT = 20  # ACADEMIC_WEIGHT'in, ortalama takip bandındayken (pass_min..watch_min) ulaşabileceği kısmı
+TREND_WEIGHT = 20
+LATE_WEIGHT = 15
+MISSING_WEIGHT = 15
+# Geçme eşiğinin bu kadar altı akademik bileşeni doldurur.
+FAIL_SPAN = 20
+# Sınav başına bu kadar puanlık düşüş eğilim bileşenini doldurur.
+TREND_SPAN = 5
+MISSING_SPAN = 3
+# Eğilim için gereken en az sınav sayısı.
+TREND_MIN_EXAMS = 3
+
+HIGH_RISK_MIN = 50
+WATCH_RISK_MIN = 25
+BATCH_SIZE = 2000
+UPDATE_FIELDS = [
+    "score",
+    "level",
+    "avg_score",
+    "failing_course_count",
+    "weakest_margin",
+    "trend_slope",
+    "late_ratio",
+    "missing_count",
+    "computed_at",
+]
+
+
+def course_thresholds(course_ids=None):
+    """{course_id: (pass_min, watch_min)}; CourseThreshold satırı olmayan dersler varsayılanı alır."""
+    thresholds = defaultdict(lambda: (DEFAULT_THRESHOLDS["pass_min"], DEFAULT_THRESHOLDS["watch_min"]))
+    rows = CourseThreshold.objects.all()
+    if course_ids is not None:
+        rows = rows.filter(course_id__in=list(course_ids))
+    for course_id, pass_min, watch_min in rows.values_list("course_id", "pass_min", "watch_min"):
+        thresholds[course_id] = (pass_min, watch_min)
+    return thresholds
+
+
+def _clamp(value):
+    return max(0.0, min(1.0, value))
+
+
+def _academic_risk(average, pass_min, watch_min):
+    average, pass_min, watch_min = float(average), float(pass_min), float(watch_min)
+    if average >= watch_min:
+        return 0.0
+    if average >= pass_min:
+        band = watch_min - pass_min
+        return WATCH_WEIGHT * (watch_min - average) / band if band > 0 else 0.0
+    return WATCH_WEIGHT + (ACADEMIC_WEIGHT - WATCH_WEIGHT) * _clamp((pass_min - average) / FAIL_SPAN)
+
+
+def risk_level(score):
+    if score >= HIGH_RISK_MIN:
+        return StudentRisk.LEVEL_HIGH
+    if score >= WATCH_RISK_MIN:
+        return StudentRisk.LEVEL_WATCH
+    return StudentRisk.LEVEL_LOW
+
+
+class _Accumulator:
+    """Bir öğrencinin sınav sonuçları üzerinde biriken toplamlar."""
+
+    __slots__ = ("course_sums", "n", "sum_x", "sum_y", "sum_xy", "sum_xx")
+
+    def __init__(self):
+        self.course_sums = {}
+        self.n = 0
+        self.sum_x = self.sum_y = self.sum_xy = self.sum_xx = 0.0
+
+    def add(self, course_id, score):
+        total, count = self.course_sums.get(course_id, (Decimal("0"), 0))
+        self.course_sums[course_id] = (total + score, count + 1)
+        x, y = float(self.n), float(score)
+        self.n += 1
+        self.sum_x += x
+        self.sum_y += y
+        self.sum_xy += x * y
+        self.sum_xx += x * x
+
+    def slope(self):
+        if self.n < TREND_MIN_EXAMS:
+            return None
+        denominator = self.n * self.sum_xx - self.sum_x ** 2
+        if not denominator:
+            return None
+        return (self.n * self.sum_xy - self.sum_x * self.sum_y) / denominator
+
+
+def _build(student_id, acc, submissions, missing, thresholds, now):
+    total_submissions, late_submissions = submissions.get(student_id, (0, 0))
+    late_ratio = late_submissions / total_submissions if total_submissions else 0.0
+    missing_count = missing.get(student_id, 0)
+
+    avg_score = weakest_margin = slope = None
+    failing = 0
+    academic = 0.0
+    if acc is not None and acc.n:
+        grand_total = Decimal("0")
+        for course_id, (total, count) in acc.course_sums.items():
+            grand_total += total
+            average = total / count
+            pass_min, watch_min = thresholds[course_id]
+            margin = average - pass_min
+            weakest_margin = margin if weakest_margin is None else min(weakest_margin, margin)
+            if average < pass_min:
+                failing += 1
+            academic = max(academic, _academic_risk(average, pass_min, watch_min))
+        avg_score = round(grand_total / acc.n, 2)
+        weakest_margin = round(weakest_margin, 2)
+        slope = acc.slope()
+
+    score = (
+        academic
+        + (TREND_WEIGHT * _clamp(-slope / TREND_SPAN) if slope is not None else 0.0)
+        + LATE_WEIGHT * late_ratio
+        + MISSING_WEIGHT * _clamp(missing_count / MISSING_SPAN)
+    )
+    score = Decimal(str(round(min(score, 100.0), 2)))
+    return StudentRisk(
+        student_id=student_id,
+        score=score,
+        level=risk_level(score),
+        avg_score=avg_score,
+        failing_course_count=failing,
+        weakest_margin=weakest_margin,
+        trend_slope=round(slope, 4) if slope is not None else None,
+        late_ratio=round(late_ratio, 4),
+        missing_count=missing_count,
+        computed_at=now,
+    )
+
+
+def _submission_counts(student_ids):
+    rows = Submission.objects.order_by()
+    if student_ids is not None:
+        rows = rows.filter(student_id__in=student_ids)
+    late = Q(assignment__due_at__isnull=False, submitted_at__gt=F("assignment__due_at"))
+    return {
+        student_id: (total, late_count)
+        for student_id, total, late_count in rows.values("student_id")
+        .annotate(total=Count("id"), late=Count("id", filter=late))
+        .values_list("student_id", "total", "late")
+    }
+
+
+def _missing_counts(student_ids, now):
+    overdue = Assignment.objects.filter(due_at__lt=now, published_at__isnull=False).order_by()
+    per_course = dict(overdue.values("course_id").annotate(count=Count("id")).values_list("course_id", "count"))
+    if not per_course:
+        return {}
+    expected = defaultdict(int)
+    enrollments = Course.students.through.objects.filter(course_id__in=list(per_course))
+    if student_ids is not None:
+        enrollments = enrollments.filter(user_id__in=student_ids)
+    for student_id, course_id in enrollments.values_list("user_id", "course_id").iterator(chunk_size=BATCH_SIZE):
+        expected[student_id] += per_course[course_id]
+
+    submitted = Submission.objects.filter(assignment__in=overdue).order_by()
+    if student_ids is not None:
+        submitted = submitted.filter(student_id__in=student_ids)
+    for student_id, count in (
+        submitted.values("student_id").annotate(count=Count("assignment_id", distinct=True))
+        .values_list("student_id", "count")
+    ):
+        if student_id in expected:
+            expected[student_id] = max(expected[student_id] - count, 0)
+    return expected
+
+
+def refresh_risk_snapshot(student_ids=None, now=None, progress=None):
+    """
+    Verilen öğrencilerin (None ise tüm öğrencilerin) risk satırlarını yeniden
+    yazar; yazılan satır sayısını döner. Tam yenilemede artık öğrenci olmayan
+    kullanıcıların eski satırları silinir. progress verilirse her toplu
+    yazımdan sonra çağrılır (iş kuyruğu heartbeat'i için).
+    """
+    now = now or timezone.now()
+    students = User.objects.filter(role__name="Student")
+    if student_ids is not None:
+        student_ids = list(student_ids)
+        students = students.filter(id__in=student_ids)
+    remaining = set(students.values_list("id", flat=True))
+    submissions = _submission_counts(student_ids)
+    missing = _missing_counts(student_ids, now)
+    thresholds = course_thresholds()
+
+    batch = []
+    written = 0
+
+    def flush():
+        nonlocal written
+        if batch:
+            StudentRisk.objects.bulk_create(
+                batch, update_conflicts=True, unique_fields=["student"], update_fields=UPDATE_FIELDS,
+            )
+            written += len(batch)
+            batch.clear()
+            if progress is not None:
+                progress()
+
+    results = ExamResult.objects.filter(student_id__in=students.values("id"), score__isnull=False).order_by(
+        "student_id", "exam__scheduled_at", "exam_id"
+    )
+    current_id, acc = None, None
+    for student_id, course_id, score in results.values_list("student_id", "exam__course_id", "score").iterator(
+        chunk_size=BATCH_SIZE
+    ):
+        if student_id != current_id:
+            if current_id is not None:
+                batch.append(_build(current_id, acc, submissions, missing, thresholds, now))
+                remaining.discard(current_id)
+                if len(batch) >= BATCH_SIZE:
+                    flush()
+            current_id, acc = student_id, _Accumulator()
+        acc.add(course_id, score)
+    if current_id is not None:
+        batch.append(_build(current_id, acc, submissions, missing, thresholds, now))
+        remaining.discard(current_id)
+
+    for student_id in sorted(remaining):
+        batch.append(_build(student_id, None, submissions, missing, thresholds, now))
+        if len(batch) >= BATCH_SIZE:
+            flush()
+    flush()
+
+    if student_ids is None:
+        StudentRisk.objects.filter(computed_at__lt=now).delete()
+    return written
+
+
+def top_at_risk(limit=10, advisor=None, min_level=StudentRisk.LEVEL_WATCH):
+    """En yüksek riskli öğrenciler (anlık görüntüden, skor indeksiyle)."""
+    levels = [StudentRisk.LEVEL_HIGH]
+    if min_level != StudentRisk.LEVEL_HIGH:
+        levels.append(StudentRisk.LEVEL_WATCH)
+    if min_level == StudentRisk.LEVEL_LOW:
+        levels.append(StudentRisk.LEVEL_LOW)
+    risks = StudentRisk.objects.filter(level__in=levels).select_related("student")
+    if advisor is not None:
+        risks = risks.filter(student__advisor=advisor)
+    return list(risks.order_by("-score", "student_id")[:limit])
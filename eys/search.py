@@ -0,0 +1,231 @@
+"""
+Küresel arama alt sistemi.
+
+SQLite'ta ders, sınav, duyuru, materyal ve ödevler tek bir FTS5 sanal
+tablosunda (eys_search_index) tutulur; sorgular bm25 ile sıralanır ve indeks
+model sinyalleriyle güncel kalır. FTS5 olmayan veritabanlarında aynı arayüz
+icontains filtreleriyle çalışır (sıralama: başlıkta eşleşenler önce).
+
+Rol kapsamı iki aşamada uygulanır: FTS sorgusu yalnızca izin verilen ders
+kimliklerine bakar, ardından nesneler her türün kendi görünürlük filtresiyle
+ORM üzerinden yüklenir.
+"""
+import re
+
+from django.db import OperationalError, connection
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.utils.html import strip_tags
+
+from .context_processors import TEACHER_ROLES
+from .models import Announcement, Assignment, Course, CourseMaterial, Exam
+
+FTS_TABLE = "eys_search_index"
+KINDS = ("course", "exam", "announcement", "material", "assignment")
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_fts_ready = {}
+
+
+def _document(kind, obj):
+    """(title, body, course_id) üçlüsü."""
+    if kind == "course":
+        return f"{obj.code} {obj.name}", "", obj.id
+    if kind == "exam":
+        return obj.name, obj.description, obj.course_id
+    if kind == "announcement":
+        return obj.title, strip_tags(obj.body or ""), obj.course_id
+    if kind == "material":
+        return obj.title, obj.description, obj.course_id
+    return obj.title, strip_tags(obj.description or ""), obj.course_id
+
+
+MODEL_KINDS = {
+    Course: "course",
+    Exam: "exam",
+    Announcement: "announcement",
+    CourseMaterial: "material",
+    Assignment: "assignment",
+}
+
+
+def fts_available():
+    if connection.vendor != "sqlite":
+        return False
+    # Yalnızca olumlu sonuç önbelleğe alınır; tablo sonradan (migrate ile) oluşursa fark edilir.
+    name = connection.settings_dict["NAME"]
+    if name not in _fts_ready:
+        with connection.cursor() as cursor:
+            if FTS_TABLE not in connection.introspection.table_names(cursor):
+                return False
+        _fts_ready[name] = True
+    return True
+
+
+def create_index_table(cursor):
+    cursor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+        "title, body, kind UNINDEXED, object_id UNINDEXED, course_id UNINDEXED, "
+        "tokenize = 'unicode61 remove_diacritics 2')"
+    )
+
+
+def index_object(obj):
+    kind = MODEL_KINDS[type(obj)]
+    if not fts_available():
+        return
+    title, body, course_id = _document(kind, obj)
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE kind = %s AND object_id = %s", [kind, obj.pk])
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (title, body, kind, object_id, course_id) VALUES (%s, %s, %s, %s, %s)",
+            [title, body or "", kind, obj.pk, course_id],
+        )
+
+
+def remove_object(obj):
+    if not fts_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {FTS_TABLE} WHERE kind = %s AND object_id = %s", [MODEL_KINDS[type(obj)], obj.pk]
+        )
+
+
+def fill_index(cursor, models_by_kind):
+    """
+    models_by_kind: {kind: model}
+    İndeksi boşaltıp yeniden doldurur; yazılan belge sayısını döner.
+    """
+    cursor.execute(f"DELETE FROM {FTS_TABLE}")
+    count = 0
+    for kind, model in models_by_kind.items():
+        rows = []
+        for obj in model.objects.all().iterator(chunk_size=1000):
+            title, body, course_id = _document(kind, obj)
+            rows.append((title, body or "", kind, obj.pk, course_id))
+        cursor.executemany(
+            f"INSERT INTO {FTS_TABLE} (title, body, kind, object_id, course_id) VALUES (%s, %s, %s, %s, %s)",
+            rows,
+        )
+        count += len(rows)
+    return count
+
+
+def rebuild_index():
+    if not fts_available():
+        return 0
+    with connection.cursor() as cursor:
+        return fill_index(cursor, {kind: model for model, kind in MODEL_KINDS.items()})
+
+
+def _match_expression(query):
+    # Kullanıcı girdisi FTS sözdizimi olarak yorumlanmasın: her kelime tırnaklı önek araması olur.
+    tokens = _TOKEN_RE.findall(query)
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def _ranked_ids(query, course_ids, limit):
+    """{kind: [object_id, ...]} — bm25'e göre (başlık 10x ağırlıklı) sıralı."""
+    match = _match_expression(query)
+    if not match:
+        return {kind: [] for kind in KINDS}
+    params = [match]
+    scope_sql = ""
+    if course_ids is not None:
+        placeholders = ", ".join(["%s"] * len(course_ids)) or "NULL"
+        scope_sql = f" AND (course_id IN ({placeholders}) OR (kind = 'announcement' AND course_id IS NULL))"
+        params += list(course_ids)
+    sql = (
+        f"SELECT kind, object_id FROM ("
+        f"  SELECT kind, object_id, ROW_NUMBER() OVER (PARTITION BY kind ORDER BY bm25({FTS_TABLE}, 10.0, 1.0)) AS pos"
+        f"  FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s{scope_sql}"
+        f") WHERE pos <= %s ORDER BY kind, pos"
+    )
+    params.append(limit)
+    ranked = {kind: [] for kind in KINDS}
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        for kind, object_id in cursor.fetchall():
+            ranked[kind].append(int(object_id))
+    return ranked
+
+
+def _fallback_ids(query, scoped, limit):
+    title_fields = {
+        "course": ("name", "code"),
+        "exam": ("name",),
+        "announcement": ("title",),
+        "material": ("title",),
+        "assignment": ("title",),
+    }
+    body_fields = {"course": (), "exam": ("description",), "announcement": ("body",),
+                   "material": ("description",), "assignment": ("description",)}
+    ranked = {}
+    for kind, qs in scoped.items():
+        title_q = Q()
+        for field in title_fields[kind]:
+            title_q |= Q(**{f"{field}__icontains": query})
+        body_q = Q()
+        for field in body_fields[kind]:
+            body_q |= Q(**{f"{field}__icontains": query})
+        qs = qs.filter(title_q | body_q).annotate(
+            _title_hit=Case(When(title_q, then=Value(1)), default=Value(0), output_field=IntegerField())
+        )
+        ranked[kind] = list(qs.order_by("-_title_hit", "-pk").values_list("pk", flat=True)[:limit])
+    return ranked
+
+
+def scoped_querysets(user, role_name):
+    """Her tür için kullanıcının görebileceği nesneler ve FTS için ders kimlikleri."""
+    if role_name == "Student":
+        courses = user.courses_taken.all()
+    elif role_name in TEACHER_ROLES:
+        courses = user.courses_given.all()
+    else:
+        courses = None
+
+    scoped = {
+        "course": Course.objects.all(),
+        "exam": Exam.objects.all(),
+        "announcement": Announcement.objects.all(),
+        "material": CourseMaterial.objects.all(),
+        "assignment": Assignment.objects.all(),
+    }
+    course_ids = None
+    if courses is not None:
+        course_ids = list(courses.values_list("id", flat=True))
+        scoped["course"] = scoped["course"].filter(id__in=course_ids)
+        scoped["exam"] = scoped["exam"].filter(course_id__in=course_ids)
+        scoped["announcement"] = scoped["announcement"].filter(Q(course_id__in=course_ids) | Q(course__isnull=True))
+        scoped["material"] = scoped["material"].filter(course_id__in=course_ids)
+        scoped["assignment"] = scoped["assignment"].filter(course_id__in=course_ids)
+    if role_name == "Student":
+        scoped["assignment"] = scoped["assignment"].filter(published_at__isnull=False)
+    return scoped, course_ids
+
+
+def search(query, scoped, course_ids, limit=8):
+    """
+    {kind: [nesne, ...]} döner; her tür en fazla limit sonuç, en alakalı önce.
+    scoped/course_ids scoped_querysets() çıktısıdır.
+    """
+    query = (query or "").strip()
+    if not query:
+        return {kind: [] for kind in KINDS}
+    ranked = None
+    if fts_available():
+        try:
+            # Kapsam ORM'de tekrar uygulanır (ör. yayımlanmamış ödevler); az kalmaması için fazladan aday alınır.
+            ranked = _ranked_ids(query, course_ids, limit * 3)
+        except OperationalError:
+            ranked = None
+    if ranked is None:
+        ranked = _fallback_ids(query, scoped, limit)
+
+    related = {"course": ("instructor",), "exam": ("course",), "announcement": ("course", "author"),
+               "material": ("course",), "assignment": ("course",)}
+    results = {}
+    for kind in KINDS:
+        ids = ranked.get(kind, [])
+        objects = scoped[kind].filter(pk__in=ids).select_related(*related[kind]).in_bulk()
+        results[kind] = [objects[pk] for pk in ids if pk in objects][:limit]
+    return results
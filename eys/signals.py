@@ -0,0 +1,175 @@
+"""
+Model değişikliklerinde türetilmiş verileri güncel tutan sinyaller.
+
+StudentOutcomeScore tablosu not ve ağırlık değişikliklerinde güncellenir.
+
+Not değişikliği yalnızca ilgili (öğrenci, ders) dilimini, ağırlık değişikliği
+ise dersin tamamını yeniden hesaplar. Hesap transaction commit edildikten
+sonra ve transaction başına bir kez yapılır (bkz. eys.deferred); böylece cascade silmelerde yarım
+kalmış veri okunmaz. bulk_create/bulk_update sinyal göndermediği için toplu
+yazan kod schedule_outcome_refresh'i kendisi çağırır.
+
+Navbar önbelleği bildirim, sınav, ders kaydı ve kullanıcı rolü değişikliklerinde
+silinir; toplu bildirim yazan kod invalidate_navbar'ı kendisi çağırır.
+
+Arama indeksi (eys.search) aranabilir modeller kaydedildikçe/silindikçe
+güncellenir.
+
+CourseStats (eys.stats) not, sınav, ders kaydı ve eşik değişikliklerinde
+yalnızca ilgili ders için commit sonrasında yenilenir.
+"""
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .context_processors import invalidate_navbar, navbar_signals_active
+from .models import (
+    Course,
+    CourseThreshold,
+    Exam,
+    ExamLOWeight,
+    ExamResult,
+    LearningOutcome,
+    LOPOWeight,
+    Notification,
+    User,
+)
+from .outcomes import schedule_outcome_refresh
+from .search import MODEL_KINDS, index_object, remove_object
+from .stats import schedule_course_stats_refresh
+
+
+@receiver(post_save, sender=ExamResult, dispatch_uid="eys_outcomes_result_saved")
+@receiver(post_delete, sender=ExamResult, dispatch_uid="eys_outcomes_result_deleted")
+def exam_result_changed(sender, instance, **kwargs):
+    schedule_outcome_refresh(exam_id=instance.exam_id, student_ids=[instance.student_id])
+    schedule_course_stats_refresh(exam_id=instance.exam_id)
+
+
+@receiver(post_save, sender=ExamLOWeight, dispatch_uid="eys_outcomes_exam_lo_saved")
+@receiver(post_delete, sender=ExamLOWeight, dispatch_uid="eys_outcomes_exam_lo_deleted")
+def exam_lo_weight_changed(sender, instance, **kwargs):
+    schedule_outcome_refresh(lo_id=instance.learning_outcome_id)
+
+
+@receiver(post_save, sender=LOPOWeight, dispatch_uid="eys_outcomes_lo_po_saved")
+@receiver(post_delete, sender=LOPOWeight, dispatch_uid="eys_outcomes_lo_po_deleted")
+def lo_po_weight_changed(sender, instance, **kwargs):
+    schedule_outcome_refresh(lo_id=instance.learning_outcome_id)
+
+
+@receiver(post_delete, sender=LearningOutcome, dispatch_uid="eys_outcomes_lo_deleted")
+def learning_outcome_deleted(sender, instance, **kwargs):
+    # Cascade ile silinen ağırlıkların lo_id'si commit anında artık bulunamaz;
+    # ders doğrudan sıraya konur ki PO skorlarından silinen LO'nun katkısı düşsün.
+    schedule_outcome_refresh(course_id=instance.course_id)
+
+
+@receiver(post_save, sender=Notification, dispatch_uid="eys_navbar_notification_saved")
+@receiver(post_delete, sender=Notification, dispatch_uid="eys_navbar_notification_deleted")
+def notification_changed(sender, instance, **kwargs):
+    if navbar_signals_active():
+        invalidate_navbar([instance.user_id])
+
+
+def _course_member_ids(course_ids):
+    enrollments = Course.students.through.objects.filter(course_id__in=course_ids)
+    user_ids = list(enrollments.values_list("user_id", flat=True))
+    user_ids += Course.objects.filter(id__in=course_ids).values_list("instructor_id", flat=True)
+    return user_ids
+
+
+@receiver(pre_save, sender=User, dispatch_uid="eys_navbar_user_presave")
+def user_role_snapshot(sender, instance, raw=False, update_fields=None, **kwargs):
+    # Rol değişince öğrenci/öğretmen sayaçları farklı sorgudan gelir.
+    instance._previous_role_id = instance.role_id
+    if instance.pk and not raw and (update_fields is None or "role" in update_fields):
+        instance._previous_role_id = User.objects.filter(pk=instance.pk).values_list("role_id", flat=True).first()
+
+
+@receiver(post_save, sender=User, dispatch_uid="eys_navbar_user_saved")
+def user_role_changed(sender, instance, created=False, **kwargs):
+    if not created and getattr(instance, "_previous_role_id", instance.role_id) != instance.role_id:
+        invalidate_navbar([instance.pk])
+
+
+@receiver(post_delete, sender=User, dispatch_uid="eys_navbar_user_deleted")
+def user_deleted(sender, instance, **kwargs):
+    # SQLite silinen kullanıcının kimliğini yeniden verebilir.
+    invalidate_navbar([instance.pk])
+
+
+@receiver(post_save, sender=Exam, dispatch_uid="eys_navbar_exam_saved")
+@receiver(post_delete, sender=Exam, dispatch_uid="eys_navbar_exam_deleted")
+def exam_changed(sender, instance, **kwargs):
+    invalidate_navbar(_course_member_ids([instance.course_id]))
+    schedule_course_stats_refresh(course_id=instance.course_id)
+
+
+@receiver(post_delete, sender=Exam, dispatch_uid="eys_outcomes_exam_deleted")
+def exam_deleted(sender, instance, **kwargs):
+    # Silinen sınavın sonuçları exam_id ile sıraya girer ama sınav artık bulunamaz.
+    schedule_outcome_refresh(course_id=instance.course_id)
+
+
+@receiver(pre_save, sender=Course, dispatch_uid="eys_navbar_course_presave")
+def course_instructor_snapshot(sender, instance, raw=False, **kwargs):
+    # Ders başka hocaya verildiğinde eski hocanın sayıları da silinmeli.
+    instance._previous_instructor_id = None
+    if instance.pk and not raw:
+        instance._previous_instructor_id = (
+            Course.objects.filter(pk=instance.pk).values_list("instructor_id", flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Course, dispatch_uid="eys_navbar_course_saved")
+def course_changed(sender, instance, created=False, **kwargs):
+    invalidate_navbar([instance.instructor_id, getattr(instance, "_previous_instructor_id", None)])
+    if created:
+        schedule_course_stats_refresh(course_id=instance.pk)
+
+
+@receiver(post_save, sender=CourseThreshold, dispatch_uid="eys_stats_threshold_saved")
+@receiver(post_delete, sender=CourseThreshold, dispatch_uid="eys_stats_threshold_deleted")
+def course_threshold_changed(sender, instance, **kwargs):
+    schedule_course_stats_refresh(course_id=instance.course_id)
+
+
+@receiver(m2m_changed, sender=Course.students.through, dispatch_uid="eys_navbar_enrollment_changed")
+def enrollment_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if reverse:
+        # user.courses_taken.add(...) — instance öğrencidir.
+        invalidate_navbar([instance.pk])
+    elif action == "pre_clear":
+        invalidate_navbar(instance.students.values_list("id", flat=True))
+    else:
+        invalidate_navbar(pk_set or ())
+
+
+@receiver(m2m_changed, sender=Course.students.through, dispatch_uid="eys_stats_enrollment_changed")
+def enrollment_stats_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if not reverse:
+        course_ids = [instance.pk]
+    elif action == "pre_clear":
+        course_ids = list(instance.courses_taken.values_list("id", flat=True))
+    else:
+        course_ids = pk_set or ()
+    for course_id in course_ids:
+        schedule_course_stats_refresh(course_id=course_id)
+
+
+def searchable_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index_object(instance)
+
+
+def searchable_deleted(sender, instance, **kwargs):
+    remove_object(instance)
+
+
+for _model in MODEL_KINDS:
+    post_save.connect(searchable_saved, sender=_model, dispatch_uid=f"eys_search_{_model.__name__}_saved")
+    post_delete.connect(searchable_deleted, sender=_model, dispatch_uid=f"eys_search_{_model.__name__}_deleted")
@@ -0,0 +1,118 @@
+"""
+Soğuk başlangıç (cold start) ölçümü.
+
+Ölçüm temiz bir alt süreçte `python -X importtime` ile yapılır: settings
+yüklenir, django.setup() çağrılır ve istenirse URLconf (dolayısıyla view
+modülleri) içe aktarılır. Çıktıdan modül başına kendi (self) ve kümülatif
+içe aktarma süreleri ile toplam duvar saati süresi çıkarılır. Komut arayüzü:
+`manage.py profile_startup`.
+"""
+import json
+import os
+import re
+import subprocess
+import sys
+
+from django.conf import settings
+
+_MARKER = "@@eys-startup@@"
+_IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+# -X importtime, importlib.import_module ile yapılan içe aktarmaları (settings,
+# INSTALLED_APPS, models, admin) raporlamaz; probe bunları ayrıca ölçer.
+_PROBE = """
+import importlib, json, sys, time
+_import_module = importlib.import_module
+dynamic = []
+
+def import_module(name, package=None):
+    resolved = importlib.util.resolve_name(name, package) if name.startswith(".") else name
+    fresh = resolved not in sys.modules
+    began = time.perf_counter()
+    try:
+        return _import_module(name, package)
+    finally:
+        if fresh and resolved in sys.modules:
+            dynamic.append({{"module": resolved, "cumulative_us": round((time.perf_counter() - began) * 1e6)}})
+
+importlib.import_module = import_module
+start = time.perf_counter()
+import django
+django.setup()
+setup_done = time.perf_counter()
+if {include_urls!r}:
+    from django.conf import settings
+    from django.urls import get_resolver
+    get_resolver(settings.ROOT_URLCONF).url_patterns
+for name in {modules!r}:
+    importlib.import_module(name)
+end = time.perf_counter()
+sys.stdout.write({marker!r} + json.dumps({{
+    "setup_ms": round((setup_done - start) * 1000, 2),
+    "total_ms": round((end - start) * 1000, 2),
+    "modules": sorted(sys.modules),
+    "dynamic": dynamic,
+}}))
+"""
+
+
+def parse_importtime(text):
+    """`-X importtime` çıktısını [{module, self_us, cumulative_us, depth}] listesine çevirir."""
+    rows = []
+    for line in text.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        rows.append({
+            "module": module,
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+            "depth": len(indent) // 2,
+        })
+    return rows
+
+
+def measure_cold_start(include_urls=True, importtime=True, modules=()):
+    """
+    Yeni bir Python sürecinde uygulamayı ayağa kaldırır; modules verilirse
+    bunlar da sonradan içe aktarılır.
+    {"setup_ms", "total_ms", "stdout", "modules", "imports", "dynamic"} döner;
+    stdout başlangıçta yazdırılan her şeydir (sessiz bir açılışta boş olmalıdır),
+    dynamic import_module ile yüklenen modüllerin kümülatif süreleridir.
+    """
+    env = dict(os.environ)
+    env.setdefault("DJANGO_SETTINGS_MODULE", "future.settings")
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += ["-c", _PROBE.format(include_urls=include_urls, modules=list(modules), marker=_MARKER)]
+    completed = subprocess.run(
+        command, cwd=str(settings.BASE_DIR), env=env, capture_output=True, text=True, check=False,
+    )
+    stdout, marker, payload = completed.stdout.rpartition(_MARKER)
+    if completed.returncode != 0 or not marker:
+        errors = completed.stderr.strip().splitlines()
+        raise RuntimeError(errors[-1] if errors else "Uygulama başlatılamadı.")
+    # İşaretten önceki her şey içe aktarma sırasında yazdırılmıştır.
+    result = json.loads(payload)
+    result["stdout"] = stdout
+    result["imports"] = parse_importtime(completed.stderr) if importtime else []
+    return result
+
+
+def summarize(imports, sort="cumulative", prefix=None, top=25):
+    """Modül satırlarını self/cumulative süreye göre sıralar; prefix verilirse yalnızca o paket."""
+    key = "self_us" if sort == "self" else "cumulative_us"
+    rows = [row for row in imports if not prefix or row["module"] == prefix or row["module"].startswith(prefix + ".")]
+    return sorted(rows, key=lambda row: row[key], reverse=True)[:top]
+
+
+def package_totals(imports):
+    """Üst seviye paket başına toplam self süresi (µs), büyükten küçüğe."""
+    totals = {}
+    for row in imports:
+        package = row["module"].split(".")[0]
+        totals[package] = totals.get(package, 0) + row["self_us"]
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
@@ -0,0 +1,147 @@
+"""
+Ders bazlı not özeti (CourseStats).
+
+Bölüm sayfaları her istekte sınav×sonuç×öğrenci birleşimini gruplamak yerine
+bu tabloyu okur. Özet; not, sınav, ders kaydı ve eşik değişikliklerinde
+yalnızca etkilenen dersler için yeniden hesaplanır. Hesap commit sonrasında
+ve transaction başına bir kez yapılır (bkz. eys.deferred).
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db.models import Avg, Count, F, Sum
+
+from . import deferred
+from .models import Course, CourseStats, CourseThreshold, Exam, ExamResult
+
+# CourseThreshold satırı olmayan dersler için get_course_threshold varsayılanları.
+DEFAULT_THRESHOLDS = {"stable_min": Decimal("80"), "watch_min": Decimal("65"), "pass_min": Decimal("60")}
+STAT_FIELDS = [
+    "avg_score",
+    "score_sum",
+    "result_count",
+    "student_count",
+    "exam_count",
+    "graded_student_count",
+    "stable_count",
+    "watch_count",
+    "support_count",
+    "passing_count",
+]
+
+
+def refresh_course_stats(course_ids=None):
+    """Verilen derslerin (None ise tümünün) özet satırını yeniden yazar; yazılan satır sayısını döner."""
+    courses = Course.objects.all()
+    if course_ids is not None:
+        courses = courses.filter(id__in=list(course_ids))
+    course_ids = list(courses.values_list("id", flat=True))
+    if not course_ids:
+        return 0
+
+    rows = {course_id: CourseStats(course_id=course_id) for course_id in course_ids}
+    results = ExamResult.objects.filter(exam__course_id__in=course_ids).order_by()
+    for course_id, total, count in results.values("exam__course_id").annotate(
+        total=Sum("score"), count=Count("id")
+    ).values_list("exam__course_id", "total", "count"):
+        stats = rows[course_id]
+        stats.score_sum = total or 0
+        stats.result_count = count
+        # Yuvarlanmadan saklanır: 49.996 ortalamalı ders "< 50" filtresinde kritik kalmalı.
+        stats.avg_score = float(total) / count if count else None
+
+    for course_id, count in (
+        Exam.objects.filter(course_id__in=course_ids).order_by().values("course_id")
+        .annotate(count=Count("id")).values_list("course_id", "count")
+    ):
+        rows[course_id].exam_count = count
+
+    enrollments = Course.students.through.objects.filter(course_id__in=course_ids).order_by()
+    for course_id, count in enrollments.values("course_id").annotate(count=Count("id")).values_list(
+        "course_id", "count"
+    ):
+        rows[course_id].student_count = count
+
+    thresholds = defaultdict(lambda: DEFAULT_THRESHOLDS)
+    for threshold in CourseThreshold.objects.filter(course_id__in=course_ids):
+        thresholds[threshold.course_id] = {
+            "stable_min": threshold.stable_min,
+            "watch_min": threshold.watch_min,
+            "pass_min": threshold.pass_min,
+        }
+    student_averages = results.values("exam__course_id", "student_id").annotate(avg=Avg("score"))
+    for course_id, _, average in student_averages.values_list("exam__course_id", "student_id", "avg"):
+        stats = rows[course_id]
+        limits = thresholds[course_id]
+        average = Decimal(str(average))
+        stats.graded_student_count += 1
+        if average >= limits["stable_min"]:
+            stats.stable_count += 1
+        elif average >= limits["watch_min"]:
+            stats.watch_count += 1
+        else:
+            stats.support_count += 1
+        if average >= limits["pass_min"]:
+            stats.passing_count += 1
+
+    CourseStats.objects.bulk_create(
+        rows.values(),
+        update_conflicts=True,
+        unique_fields=["course"],
+        update_fields=STAT_FIELDS + ["updated_at"],
+        batch_size=500,
+    )
+    return len(rows)
+
+
+def ensure_course_stats():
+    """
+    Özeti hiç hesaplanmamış dersleri (tablo öncesi veri) tamamlar; tamamlanan
+    ders sayısını döner. Sayfalar özeti yalnızca okur; bu iş
+    `manage.py rebuild_course_stats --missing-only` ile yapılır.
+    """
+    missing = list(Course.objects.filter(stats__isnull=True).values_list("id", flat=True))
+    if missing:
+        refresh_course_stats(missing)
+    return len(missing)
+
+
+def with_stats(courses):
+    """
+    Course queryset'ine şablonların beklediği avg_score / exam_count /
+    student_count alanlarını CourseStats'tan ekler (GROUP BY'sız tek LEFT JOIN).
+    """
+    return courses.annotate(
+        avg_score=F("stats__avg_score"),
+        exam_count=F("stats__exam_count"),
+        student_count=F("stats__student_count"),
+    )
+
+
+def overall_average():
+    totals = CourseStats.objects.aggregate(total=Sum("score_sum"), count=Sum("result_count"))
+    if not totals["count"]:
+        return 0
+    return round(totals["total"] / totals["count"], 1)
+
+
+def schedule_course_stats_refresh(course_id=None, exam_id=None):
+    """Dersin özetini commit sonrasında yenilenmek üzere sıraya koyar; aynı transaction'dakiler birleşir."""
+
+    def update(pending):
+        if course_id:
+            pending["course"].add(course_id)
+        elif exam_id:
+            pending["exam"].add(exam_id)
+
+    deferred.schedule(
+        "course_stats", lambda: {"course": set(), "exam": set()}, update, flush_course_stats_refreshes
+    )
+
+
+def flush_course_stats_refreshes(pending):
+    course_ids = set(pending["course"])
+    if pending["exam"]:
+        course_ids.update(Exam.objects.filter(id__in=pending["exam"]).values_list("course_id", flat=True))
+    if course_ids:
+        refresh_course_stats(course_ids)
@@ -0,0 +1,23 @@
+"""
+Proje test çalıştırıcısı (settings.TEST_RUNNER).
+
+Testler paylaşılan dosya tabanlı önbelleğe dokunmaz: aksi halde testlerdeki
+cache.clear() aynı checkout'ta çalışan geliştirme sunucusu ve worker'ların
+önbelleğini siler, test kullanıcılarının navbar kayıtları da gerçek
+kullanıcılarınkiyle aynı anahtarlara düşer.
+"""
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class EYSTestRunner(DiscoverRunner):
+    def setup_test_environment(self, **kwargs):
+        from .benchmarks import ISOLATED_CACHES
+
+        super().setup_test_environment(**kwargs)
+        self._isolated_caches = override_settings(CACHES=ISOLATED_CACHES)
+        self._isolated_caches.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._isolated_caches.disable()
+        super().teardown_test_environment(**kwargs)
@@ -1,14 +1,29 @@
 from datetime import timedelta
+from decimal import Decimal
+import gzip
+import importlib
 import json
 import io
+import os
+import shutil
+import tempfile
+import time
+from types import SimpleNamespace
 import zipfile
+from unittest import mock
+from django.apps import apps as django_apps
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
-from django.db import connection
-from django.test import TestCase
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection, transaction
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
 from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
+from django.utils.http import http_date
 
 from .models import (
     Role,
@@ -27,7 +42,34 @@ from .models import (
     ExamResult,
     Submission,
     SubmissionAttachment,
+    StudentOutcomeScore,
+    BackgroundJob,
+    CourseStats,
+    CourseThreshold,
+    StudentRisk,
 )
+from .analytics import StudentAnalytics
+from .context_processors import navbar
+from .dashboard import DASHBOARD_QUERY_BUDGET, StudentDashboardData
+from .datagen import UniversitySpec, generate_university, purge, refresh_derived
+from .jobs import (
+    claim_next_job,
+    enqueue_job,
+    heartbeat,
+    prune_jobs,
+    requeue_stale_jobs,
+    run_job,
+    run_pending_jobs,
+)
+from .middleware import PerformanceTimingMiddleware, fingerprint
+from .notifications import decode_cursor, inbox_page, notify_users, prune_notifications
+from .outcomes import OutcomeEngine, load_score_matrix
+from .qr import qr_png
+from .risk import refresh_risk_snapshot, top_at_risk
+from .startup import measure_cold_start, parse_importtime, summarize
+from .stats import refresh_course_stats, schedule_course_stats_refresh
+from .views.common import ExamSerializer, course_color, exam_type_label
+from . import benchmarks, calendars, ics, queryplan, search
 
 User = get_user_model()
 
@@ -371,7 +413,7 @@ class ProjectExtendedTests(TestCase):
         resp = self.client.get(reverse("export_exam_scores_csv", args=[self.exam.id]))
         self.assertEqual(resp.status_code, 200)
         self.assertIn("text/csv", resp["Content-Type"])
-        content = resp.content.decode("utf-8", errors="ignore")
+        content = b"".join(resp.streaming_content).decode("utf-8", errors="ignore")
         self.assertIn("student_id,username,full_name,email,score,feedback", content)
 
     def test_manage_exam_scores_mobile(self):
@@ -727,16 +769,30 @@ class ProjectAdvancedTests(TestCase):
         self.client.force_login(self.teacher)
         submission = Submission.objects.create(assignment=self.assignment, student=self.student, text="Answer")
         upload = SimpleUploadedFile("report.txt", b"hello", content_type="text/plain")
-        SubmissionAttachment.objects.create(submission=submission, file=upload, version=1)
+        report = SubmissionAttachment.objects.create(submission=submission, file=upload, version=1)
+        uploaded_at = timezone.make_aware(timezone.datetime(2024, 3, 5, 14, 30, 8))
+        SubmissionAttachment.objects.filter(id=report.id).update(created_at=uploaded_at)
+        SubmissionAttachment.objects.create(
+            submission=submission,
+            file=SimpleUploadedFile("scan.pdf", b"%PDF" * 1000, content_type="application/pdf"),
+            version=2,
+        )
         resp = self.client.get(reverse("export_submissions_zip", args=[self.assignment.id]))
         self.assertEqual(resp.status_code, 200)
-        zf = zipfile.ZipFile(io.BytesIO(resp.content))
-        names = zf.namelist()
-        self.assertTrue(len(names) >= 1)
+        self.assertTrue(resp.streaming)
+        zf = zipfile.ZipFile(io.BytesIO(b"".join(resp.streaming_content)))
+        infos = {info.filename.rsplit(".", 1)[-1]: info for info in zf.infolist()}
+        self.assertEqual(zf.read(infos["txt"]), b"hello")
+        self.assertEqual(infos["txt"].compress_type, zipfile.ZIP_DEFLATED)
+        self.assertEqual(infos["pdf"].compress_type, zipfile.ZIP_STORED)
+        self.assertEqual(zf.read(infos["pdf"]), b"%PDF" * 1000)
+        self.assertEqual(infos["txt"].date_time, (2024, 3, 5, 14, 30, 8))
+        self.assertGreater(infos["pdf"].date_time, (1980, 1, 1, 0, 0, 0))
 
     def test_course_detail_lo_po_scores(self):
-        LOPOWeight.objects.create(learning_outcome=self.lo, programming_outcome=self.po, weight=50)
-        ExamResult.objects.create(exam=self.exam, student=self.student, score=80)
+        with self.captureOnCommitCallbacks(execute=True):
+            LOPOWeight.objects.create(learning_outcome=self.lo, programming_outcome=self.po, weight=50)
+            ExamResult.objects.create(exam=self.exam, student=self.student, score=80)
         self.client.force_login(self.teacher)
         resp = self.client.get(reverse("course_detail", args=[self.course.id]))
         self.assertEqual(resp.status_code, 200)
@@ -916,7 +972,7 @@ class ProjectEdgeCaseTests(TestCase):
         self.client.force_login(self.teacher)
         resp = self.client.get(reverse("export_submissions_zip", args=[self.assignment.id]))
         self.assertEqual(resp.status_code, 200)
-        zf = zipfile.ZipFile(io.BytesIO(resp.content))
+        zf = zipfile.ZipFile(io.BytesIO(b"".join(resp.streaming_content)))
         self.assertEqual(len(zf.namelist()), 0)
 
     def test_global_search_requires_login(self):
@@ -1232,6 +1288,1426 @@ class ProjectTemplateTests(TestCase):
 
 
 
+class OutcomeEngineTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.role_student = Role.objects.create(name="Student")
+        cls.role_regular = Role.objects.create(name="Regular Instructor")
+        cls.teacher = User.objects.create_user(username="teacher_oe", password="pass", role=cls.role_regular)
+        cls.student = User.objects.create_user(username="student_oe", password="pass", role=cls.role_student)
+        cls.student_zero = User.objects.create_user(username="student_oe0", password="pass", role=cls.role_student)
+        cls.course = Course.objects.create(name="Outcomes", code="CSE990", instructor=cls.teacher)
+        cls.course.students.add(cls.student, cls.student_zero)
+
+        cls.lo1 = LearningOutcome.objects.create(course=cls.course, title="LO E1")
+        cls.lo2 = LearningOutcome.objects.create(course=cls.course, title="LO E2")
+        cls.po1 = ProgrammingOutcome.objects.create(code="POE1", title="POE1")
+        cls.po2 = ProgrammingOutcome.objects.create(code="POE2", title="POE2")
+        cls.midterm = Exam.objects.create(course=cls.course, name="Midterm")
+        cls.final = Exam.objects.create(course=cls.course, name="Final")
+        with cls.captureOnCommitCallbacks(execute=True):
+            ExamLOWeight.objects.create(exam=cls.midterm, learning_outcome=cls.lo1, weight=40)
+            ExamLOWeight.objects.create(exam=cls.final, learning_outcome=cls.lo1, weight=60)
+            ExamLOWeight.objects.create(exam=cls.final, learning_outcome=cls.lo2, weight=33.3)
+            LOPOWeight.objects.create(learning_outcome=cls.lo1, programming_outcome=cls.po1, weight=50)
+            LOPOWeight.objects.create(learning_outcome=cls.lo2, programming_outcome=cls.po1, weight=25)
+            LOPOWeight.objects.create(learning_outcome=cls.lo2, programming_outcome=cls.po2, weight=100)
+
+            ExamResult.objects.create(exam=cls.midterm, student=cls.student, score=70)
+            ExamResult.objects.create(exam=cls.final, student=cls.student, score=85.5)
+            ExamResult.objects.create(exam=cls.midterm, student=cls.student_zero, score=0)
+
+    def _engine(self):
+        los = LearningOutcome.objects.filter(course=self.course).order_by("id").prefetch_related(
+            "examloweight_set", "po_weights"
+        )
+        return OutcomeEngine.from_learning_outcomes(los)
+
+    def test_batch_scores_match_reference_rounding(self):
+        engine = self._engine()
+        matrix = load_score_matrix(ExamResult.objects.filter(exam__course=self.course))
+        lo_matrix = engine.lo_scores_batch(matrix)
+        po_matrix = engine.po_scores_batch(lo_matrix)
+
+        # 70*0.4 + 85.5*0.6 = 79.3 ; 85.5*0.333 = 28.4715 -> 28.47
+        self.assertEqual(lo_matrix[self.student.id][self.lo1.id], Decimal("79.30"))
+        self.assertEqual(lo_matrix[self.student.id][self.lo2.id], Decimal("28.47"))
+        # 79.30*0.5 + 28.47*0.25 = 46.7675 -> 46.77
+        self.assertEqual(po_matrix[self.student.id][self.po1.id], (Decimal("46.77"), Decimal("75")))
+        self.assertEqual(po_matrix[self.student.id][self.po2.id], (Decimal("28.47"), Decimal("100")))
+
+        self.assertEqual(lo_matrix[self.student_zero.id][self.lo1.id], Decimal("0.00"))
+        self.assertIsNone(lo_matrix[self.student_zero.id][self.lo2.id])
+
+    def test_require_positive_drops_zero_totals(self):
+        engine = self._engine()
+        scores = engine.lo_scores({self.midterm.id: Decimal("0")}, require_positive=True)
+        self.assertIsNone(scores[self.lo1.id])
+        self.assertEqual(engine.po_scores(scores), {})
+
+    def test_views_use_engine_scores(self):
+        self.client.force_login(self.student)
+        resp = self.client.get(reverse("student_course_detail", args=[self.course.id]))
+        self.assertEqual(resp.status_code, 200)
+        po_cards = {card["code"]: card for card in resp.context["po_cards"]}
+        self.assertEqual(po_cards["POE1"]["score"], Decimal("46.77"))
+        resp = self.client.get(reverse("student_dashboard"))
+        labels = {item["label"]: item["percent"] for item in resp.context["lo_success_data"]}
+        self.assertEqual(labels["LO E1"], Decimal("79.30"))
+
+        self.client.force_login(self.teacher)
+        resp = self.client.get(reverse("course_detail", args=[self.course.id]))
+        card = next(c for c in resp.context["student_cards"] if c["id"] == self.student_zero.id)
+        lo_scores = {x["id"]: x["score"] for x in json.loads(card["lo_scores_json"])}
+        self.assertEqual(lo_scores[self.lo1.id], 0.0)
+        self.assertIsNone(lo_scores[self.lo2.id])
+
+
+class StudentOutcomeScoreTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.role_student = Role.objects.create(name="Student")
+        cls.role_regular = Role.objects.create(name="Regular Instructor")
+        cls.teacher = User.objects.create_user(username="teacher_sos", password="pass", role=cls.role_regular)
+        cls.student = User.objects.create_user(username="student_sos", password="pass", role=cls.role_student)
+        cls.other = User.objects.create_user(username="student_sos2", password="pass", role=cls.role_student)
+        cls.course = Course.objects.create(name="Rollup", code="CSE991", instructor=cls.teacher)
+        cls.course.students.add(cls.student, cls.other)
+        cls.lo = LearningOutcome.objects.create(course=cls.course, title="LO R1")
+        cls.po = ProgrammingOutcome.objects.create(code="POR1", title="POR1")
+        cls.exam = Exam.objects.create(course=cls.course, name="Midterm")
+
+    def _stored(self, student, **target):
+        row = StudentOutcomeScore.objects.filter(student=student, course=self.course, **target).first()
+        return row.score if row else None
+
+    def test_grade_and_weight_changes_refresh_rollup(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            ExamLOWeight.objects.create(exam=self.exam, learning_outcome=self.lo, weight=100)
+            LOPOWeight.objects.create(learning_outcome=self.lo, programming_outcome=self.po, weight=50)
+        with self.captureOnCommitCallbacks(execute=True):
+            result = ExamResult.objects.create(exam=self.exam, student=self.student, score=80)
+            ExamResult.objects.create(exam=self.exam, student=self.other, score=60)
+        self.assertEqual(self._stored(self.student, learning_outcome=self.lo), Decimal("80.00"))
+        self.assertEqual(self._stored(self.student, programming_outcome=self.po), Decimal("40.00"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            result.score = 90
+            result.save()
+        self.assertEqual(self._stored(self.student, programming_outcome=self.po), Decimal("45.00"))
+        self.assertEqual(self._stored(self.other, programming_outcome=self.po), Decimal("30.00"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            LOPOWeight.objects.filter(learning_outcome=self.lo).delete()
+        self.assertIsNone(self._stored(self.student, programming_outcome=self.po))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            result.delete()
+        self.assertIsNone(self._stored(self.student, learning_outcome=self.lo))
+        self.assertEqual(self._stored(self.other, learning_outcome=self.lo), Decimal("60.00"))
+
+    def test_student_course_detail_reads_stored_rollup(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            ExamLOWeight.objects.create(exam=self.exam, learning_outcome=self.lo, weight=100)
+            LOPOWeight.objects.create(learning_outcome=self.lo, programming_outcome=self.po, weight=50)
+            ExamResult.objects.create(exam=self.exam, student=self.student, score=80)
+        StudentOutcomeScore.objects.filter(student=self.student, learning_outcome=self.lo).update(score=77)
+        StudentOutcomeScore.objects.filter(student=self.student, programming_outcome=self.po).update(score=33)
+
+        self.client.force_login(self.student)
+        url = reverse("student_course_detail", args=[self.course.id])
+        resp = self.client.get(url)
+        self.assertEqual(resp.context["los"][0].student_score, Decimal("77.00"))
+        self.assertEqual(resp.context["los"][0].score_coverage, Decimal("100"))
+        card = resp.context["po_cards"][0]
+        self.assertEqual((card["score"], card["coverage"]), (Decimal("33.00"), Decimal("50")))
+
+        # Okuma yolu tabloya yazmaz; eksik satırlar rebuild_outcome_scores ile doldurulur.
+        StudentOutcomeScore.objects.filter(student=self.student).delete()
+        resp = self.client.get(url)
+        self.assertIsNone(resp.context["los"][0].student_score)
+        self.assertFalse(StudentOutcomeScore.objects.exists())
+
+    def test_deleting_learning_outcome_refreshes_po_scores(self):
+        lo2 = LearningOutcome.objects.create(course=self.course, title="LO R2")
+        with self.captureOnCommitCallbacks(execute=True):
+            ExamLOWeight.objects.create(exam=self.exam, learning_outcome=self.lo, weight=50)
+            ExamLOWeight.objects.create(exam=self.exam, learning_outcome=lo2, weight=50)
+            LOPOWeight.objects.create(learning_outcome=self.lo, programming_outcome=self.po, weight=100)
+            LOPOWeight.objects.create(learning_outcome=lo2, programming_outcome=self.po, weight=100)
+            ExamResult.objects.create(exam=self.exam, student=self.student, score=80)
+        self.assertEqual(self._stored(self.student, programming_outcome=self.po), Decimal("80.00"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            lo2.delete()
+        self.assertEqual(self._stored(self.student, programming_outcome=self.po), Decimal("40.00"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.exam.delete()
+        self.assertFalse(StudentOutcomeScore.objects.filter(student=self.student).exists())
+
+    def test_rebuild_command_rebuilds_and_verifies(self):
+        ExamLOWeight.objects.create(exam=self.exam, learning_outcome=self.lo, weight=100)
+        ExamResult.objects.create(exam=self.exam, student=self.student, score=75)
+        StudentOutcomeScore.objects.create(
+            student=self.other, course=self.course, learning_outcome=self.lo, score=1
+        )
+        with self.assertRaises(CommandError):
+            call_command("rebuild_outcome_scores", "--verify-only", stdout=io.StringIO())
+        out = io.StringIO()
+        call_command("rebuild_outcome_scores", stdout=out)
+        self.assertIn("birebir", out.getvalue())
+        self.assertIsNone(self._stored(self.other, learning_outcome=self.lo))
+        self.assertEqual(self._stored(self.student, learning_outcome=self.lo), Decimal("75.00"))
+
+
+class BulkGradeImportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.role_student = Role.objects.create(name="Student")
+        cls.role_regular = Role.objects.create(name="Regular Instructor")
+        cls.teacher = User.objects.create_user(username="teacher_bulk", password="pass", role=cls.role_regular)
+        cls.course = Course.objects.create(name="Bulk", code="CSE992", instructor=cls.teacher)
+        cls.students = User.objects.bulk_create(
+            [User(username=f"bulk{i}", role=cls.role_student) for i in range(30)]
+        )
+        cls.course.students.add(*cls.students)
+        cls.exam = Exam.objects.create(course=cls.course, name="Midterm")
+        ExamResult.objects.create(exam=cls.exam, student=cls.students[0], score=10)
+        ExamResult.objects.create(exam=cls.exam, student=cls.students[1], score=20)
+
+    def _post_csv(self, content):
+        csv_file = SimpleUploadedFile("scores.csv", content.encode("utf-8"), content_type="text/csv")
+        return self.client.post(
+            reverse("manage_exam_scores", args=[self.exam.id]), {"csv_file": csv_file}, follow=True
+        )
+
+    def test_grading_page_links_cached_qr_image(self):
+        self.client.force_login(self.teacher)
+        resp = self.client.get(reverse("manage_exam_scores", args=[self.exam.id]))
+        qr_url = reverse("exam_scores_qr", args=[self.exam.id])
+        self.assertContains(resp, f'src="{qr_url}"')
+        self.assertNotContains(resp, "data:image/png;base64")
+
+        qr_png.cache_clear()
+        with mock.patch("qrcode.make", wraps=__import__("qrcode").make) as make:
+            first = self.client.get(qr_url)
+            second = self.client.get(qr_url)
+        self.assertEqual(make.call_count, 1)
+        self.assertEqual(first["Content-Type"], "image/png")
+        self.assertTrue(first.content.startswith(b"\x89PNG"))
+        self.assertEqual(first.content, second.content)
+        self.assertIn("max-age=2592000", first["Cache-Control"])
+        self.assertIn("private", first["Cache-Control"])
+
+        not_modified = self.client.get(qr_url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified["ETag"], first["ETag"])
+        # Host değişirse bağlantı, dolayısıyla ETag de değişir.
+        with self.settings(ALLOWED_HOSTS=["m.example.edu"]):
+            other_host = self.client.get(qr_url, HTTP_HOST="m.example.edu", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(other_host.status_code, 200)
+        self.assertNotEqual(other_host["ETag"], first["ETag"])
+
+    def test_qr_image_is_limited_to_course_instructor(self):
+        other = User.objects.create_user(username="teacher_other_qr", password="pass", role=self.role_regular)
+        self.client.force_login(other)
+        self.assertEqual(self.client.get(reverse("exam_scores_qr", args=[self.exam.id])).status_code, 404)
+
+    def test_csv_import_uses_constant_queries_and_reports_counts(self):
+        lines = ["student_id,username,score,feedback", f",{self.students[0].username},55,ok", f"{self.students[1].id},,,"]
+        lines += [f"{s.id},,{60 + i % 40},fb" for i, s in enumerate(self.students[2:])]
+        self.client.force_login(self.teacher)
+        with CaptureQueriesContext(connection) as ctx:
+            csv_file = SimpleUploadedFile("scores.csv", "\n".join(lines).encode("utf-8"), content_type="text/csv")
+            resp = self.client.post(reverse("manage_exam_scores", args=[self.exam.id]), {"csv_file": csv_file})
+        self.assertEqual(resp.status_code, 302)
+        self.assertLess(len(ctx.captured_queries), 25)
+
+        resp = self.client.get(resp.url)
+        texts = [str(m) for m in resp.context["messages"]]
+        self.assertIn("Toplam: 30, Yeni: 28, Güncellenen: 1, Silinen: 1.", texts[0])
+        self.assertEqual(ExamResult.objects.filter(exam=self.exam).count(), 29)
+        self.assertEqual(ExamResult.objects.get(exam=self.exam, student=self.students[0]).score, Decimal("55.00"))
+
+    def test_csv_with_any_error_writes_nothing(self):
+        self.client.force_login(self.teacher)
+        content = "student_id,username,score,feedback\n{a},,70,\n9999,ghost,80,\n".format(a=self.students[2].id)
+        resp = self._post_csv(content)
+        self.assertEqual(resp.status_code, 200)
+        self.assertFalse(ExamResult.objects.filter(exam=self.exam, student=self.students[2]).exists())
+        self.assertEqual(ExamResult.objects.filter(exam=self.exam).count(), 2)
+
+    def test_grid_save_writes_only_changed_rows_in_bulk(self):
+        data = {f"score_{s.id}": str(50 + i) for i, s in enumerate(self.students)}
+        data[f"score_{self.students[0].id}"] = "10"
+        data[f"score_{self.students[1].id}"] = ""
+        self.client.force_login(self.teacher)
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.post(reverse("manage_exam_scores", args=[self.exam.id]), data)
+        self.assertEqual(resp.status_code, 302)
+        self.assertLess(len(ctx.captured_queries), 25)
+        self.assertFalse(any(q["sql"].startswith("UPDATE") for q in ctx.captured_queries if '"eys_examresult"' in q["sql"]))
+        self.assertEqual(ExamResult.objects.filter(exam=self.exam).count(), 29)
+        self.assertEqual(ExamResult.objects.get(exam=self.exam, student=self.students[5]).score, Decimal("55.00"))
+
+    def test_mobile_grid_keeps_valid_rows_and_reports_invalid(self):
+        data = {f"score_{self.students[0].id}": "abc", f"score_{self.students[2].id}": "75,5"}
+        data[f"score_{self.students[1].id}"] = "20"
+        self.client.force_login(self.teacher)
+        resp = self.client.post(reverse("manage_exam_scores_mobile", args=[self.exam.id]), data)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(ExamResult.objects.get(exam=self.exam, student=self.students[0]).score, Decimal("10.00"))
+        self.assertEqual(ExamResult.objects.get(exam=self.exam, student=self.students[2]).score, Decimal("75.50"))
+        self.assertEqual(ExamResult.objects.filter(exam=self.exam).count(), 3)
+
+    def test_scores_csv_export_streams_all_students(self):
+        other_exam = Exam.objects.create(course=self.course, name="Final")
+        ExamResult.objects.create(exam=other_exam, student=self.students[2], score=99)
+        self.client.force_login(self.teacher)
+        resp = self.client.get(reverse("export_exam_scores_csv", args=[self.exam.id]))
+        self.assertTrue(resp.streaming)
+        with CaptureQueriesContext(connection) as ctx:
+            lines = b"".join(resp.streaming_content).decode("utf-8").splitlines()
+        self.assertLessEqual(len(ctx.captured_queries), 1)
+        self.assertEqual(len(lines), 31)
+        rows = {line.split(",")[1]: line.split(",") for line in lines[1:]}
+        self.assertEqual(rows["bulk0"][4], "10.00")
+        self.assertEqual(rows["bulk2"][4], "")
+
+
+class NotificationFanoutTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.role_student = Role.objects.create(name="Student")
+        cls.role_regular = Role.objects.create(name="Regular Instructor")
+        cls.teacher = User.objects.create_user(username="teacher_fan", password="pass", role=cls.role_regular)
+        cls.course = Course.objects.create(name="Fanout", code="CSE994", instructor=cls.teacher)
+        cls.students = User.objects.bulk_create(
+            [User(username=f"fan{i}", role=cls.role_student) for i in range(40)]
+        )
+        cls.course.students.add(*cls.students)
+        cls.exam = Exam.objects.create(course=cls.course, name="Final")
+
+    def test_notify_users_batches_inserts(self):
+        with CaptureQueriesContext(connection) as ctx:
+            count = notify_users(User.objects.filter(username__startswith="fan"), "exam_reminder", "x" * 300, batch_size=15)
+        self.assertEqual(count, 40)
+        inserts = [q for q in ctx.captured_queries if q["sql"].startswith("INSERT")]
+        self.assertEqual(len(inserts), 3)
+        self.assertEqual(len(Notification.objects.filter(kind="exam_reminder").first().message), 255)
+
+    def test_notify_users_accepts_per_user_message(self):
+        notify_users(User.objects.filter(username="fan1"), "new_assignment", lambda user: f"Merhaba {user.username}")
+        self.assertEqual(Notification.objects.get(user=self.students[1]).message, "Merhaba fan1")
+
+    def test_exam_reminders_use_constant_queries(self):
+        self.client.force_login(self.teacher)
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(reverse("send_exam_reminders", args=[self.exam.id]))
+        self.assertEqual(resp.status_code, 302)
+        self.assertLess(len(ctx.captured_queries), 15)
+        self.assertEqual(Notification.objects.filter(kind="exam_reminder").count(), 40)
+
+
+class NotificationInboxTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.role_student = Role.objects.create(name="Student")
+        cls.student = User.objects.create_user(username="student_inbox", password="pass", role=cls.role_student)
+        cls.other = User.objects.create_user(username="other_inbox", password="pass", role=cls.role_student)
+        notify_users(User.objects.filter(id=cls.student.id), "exam_reminder", "eski")
+        notify_users(User.objects.filter(id=cls.other.id), "exam_reminder", "başkası")
+        now = timezone.now()
+        # Aynı created_at'e sahip satırlar sayfa sınırında kaybolmamalı.
+        Notification.objects.filter(user=cls.student).update(created_at=now - timedelta(days=200), is_read=True)
+        Notification.objects.bulk_create(
+            [Notification(user=cls.student, kind="new_assignment", message=f"n{i}") for i in range(30)]
+        )
+        Notification.objects.filter(user=cls.student, kind="new_assignment").update(created_at=now - timedelta(hours=1))
+        Notification.objects.filter(user=cls.other).update(created_at=now - timedelta(days=200), is_read=True)
+
+    def test_keyset_pages_cover_inbox_once(self):
+        seen = []
+        cursor = None
+        while True:
+            with CaptureQueriesContext(connection) as ctx:
+                page, cursor = inbox_page(self.student, cursor=cursor, limit=7)
+            self.assertEqual(len(ctx.captured_queries), 1)
+            seen.extend(page)
+            if cursor is None:
+                break
+        self.assertEqual(len(seen), 31)
+        self.assertEqual(len({notif.id for notif in seen}), 31)
+        self.assertEqual(seen[-1].message, "eski")
+        self.assertIsNone(decode_cursor("bozuk"))
+        self.assertEqual(len(inbox_page(self.student, cursor="bozuk", limit=5)[0]), 5)
+        self.assertEqual(len(inbox_page(self.student, unread_only=True, limit=50)[0]), 30)
+
+    def test_inbox_view_paginates(self):
+        self.client.force_login(self.student)
+        resp = self.client.get(reverse("notifications"))
+        self.assertEqual(len(resp.context["notifications"]), 25)
+        self.assertContains(resp, "Daha eski")
+        resp = self.client.get(reverse("notifications"), {"cursor": resp.context["next_cursor"]})
+        self.assertEqual([notif.message for notif in resp.context["notifications"]][-1], "eski")
+        self.assertIsNone(resp.context["next_cursor"])
+        self.assertNotContains(resp, "başkası")
+
+    def test_prune_archives_and_deletes_old_read_notifications(self):
+        Notification.objects.create(user=self.student, kind="exam_reminder", message="okunmamış eski")
+        Notification.objects.filter(message="okunmamış eski").update(created_at=timezone.now() - timedelta(days=300))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "notifications.jsonl.gz")
+            out = io.StringIO()
+            with CaptureQueriesContext(connection) as ctx:
+                call_command("prune_notifications", "--days", "90", "--batch-size", "1", "--archive", path, stdout=out)
+            self.assertIn("✅ 2 okunmuş bildirim temizlendi.", out.getvalue())
+            deletes = [q for q in ctx.captured_queries if q["sql"].startswith("DELETE")]
+            self.assertEqual(len(deletes), 2)
+            with gzip.open(path, "rt", encoding="utf-8") as archive:
+                rows = [json.loads(line) for line in archive]
+        self.assertEqual(sorted(row["message"] for row in rows), ["başkası", "eski"])
+        self.assertTrue(Notification.objects.filter(message="okunmamış eski").exists())
+        self.assertEqual(Notification.objects.filter(user=self.student).count(), 31)
+
+    def test_prune_batches_skip_per_row_signals(self):
+        with mock.patch("eys.notifications.invalidate_navbar") as invalidate, \
+                mock.patch("eys.signals.invalidate_navbar") as per_row, \
+                CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(prune_notifications(timezone.now() - timedelta(days=90), batch_size=10), 2)
+        # Satır başına sinyal alıcısı susturulur; parti başına tek invalidate.
+        per_row.assert_not_called()
+        invalidate.assert_called_once_with({self.student.id, self.other.id})
+        deletes = [q for q in ctx.captured_queries if q["sql"].startswith("DELETE")]
+        self.assertEqual(len(deletes), 1)
+
+
+class CalendarFeedTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.role_student = Role.objects.create(name="Student")
+        cls.role_regular = Role.objects.create(name="Regular Instructor")
+        cls.teacher = User.objects.create_user(username="teacher_feed", password="pass", role=cls.role_regular)
+        cls.student = User.objects.create_user(username="student_feed", password="pass", role=cls.role_student)
+        cls.course = Course.objects.create(name="Takvim", code="CSE777", instructor=cls.teacher)
+        cls.course.students.add(cls.student)
+        now = timezone.now()
+        cls.exam = Exam.objects.create(course=cls.course, name="Vize; bölüm 1", scheduled_at=now + timedelta(days=5))
+        Assignment.objects.create(course=cls.course, title="Yayında", due_at=now + timedelta(days=2), published_at=now)
+        Assignment.objects.create(course=cls.course, title="Taslak", due_at=now + timedelta(days=3))
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse("calendar_feed", args=[ics.ensure_calendar_token(self.student)])
+
+    def test_student_feed_and_conditional_get(self):
+        resp = self.client.get(self.url)
+        self.assertEqual(resp.status_code, 200)
+        body = resp.content.decode()
+        self.assertIn("SUMMARY:CSE777 - Vize\\; bölüm 1", body)
+        self.assertIn("Yayında", body)
+        self.assertNotIn("Taslak", body)
+        self.assertIn("private", resp["Cache-Control"])
+
+        etag = resp["ETag"]
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertNotIn("Last-Modified", resp)
+        # Gövde olay zaman damgalarından üretildiği için tekrar istekte aynıdır.
+        with CaptureQueriesContext(connection) as ctx:
+            again = self.client.get(self.url)
+        self.assertEqual(again.content.decode(), body)
+        self.assertFalse([q for q in ctx.captured_queries if '"eys_exam"."name"' in q["sql"]])
+
+        self.exam.scheduled_at += timedelta(days=1)
+        self.exam.save()
+        resp = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotEqual(resp["ETag"], etag)
+
+    def test_removed_events_and_course_renames_invalidate_feed(self):
+        first = self.client.get(self.url)
+        extra = Exam.objects.create(course=self.course, name="Silinecek", scheduled_at=timezone.now() + timedelta(days=9))
+        resp = self.client.get(self.url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertIn("Silinecek", resp.content.decode())
+
+        extra.delete()
+        since = http_date(time.time() + 3600)
+        resp = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotIn("Silinecek", resp.content.decode())
+        etag = resp["ETag"]
+
+        Course.objects.filter(pk=self.course.pk).update(code="CSE778")
+        resp = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag, HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn("SUMMARY:CSE778 - ", resp.content.decode())
+
+        self.course.students.remove(self.student)
+        resp = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotIn("VEVENT", resp.content.decode())
+
+    def test_large_feed_is_streamed(self):
+        body = self.client.get(self.url).content
+        with mock.patch.object(ics, "CACHE_MAX_EVENTS", 1), mock.patch.object(ics, "STREAM_CHUNK_SIZE", 1):
+            resp = self.client.get(self.url)
+        self.assertTrue(resp.streaming)
+        self.assertEqual(b"".join(resp.streaming_content), body)
+
+    def test_token_reset_and_teacher_ics(self):
+        self.client.force_login(self.student)
+        resp = self.client.get(reverse("student_calendar"))
+        self.assertContains(resp, self.url)
+        self.client.post(reverse("reset_calendar_feed"))
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+        self.client.logout()
+        self.assertEqual(self.client.get(reverse("teacher_calendar_ics")).status_code, 302)
+        self.client.force_login(self.teacher)
+        resp = self.client.get(reverse("teacher_calendar_ics") + "?include_assignments=1")
+        self.assertIn("Taslak", resp.content.decode())
+        self.assertEqual(
+            self.client.get(reverse("teacher_calendar_ics"), HTTP_IF_NONE_MATCH=resp["ETag"]).status_code, 200
+        )
+
+
+class BackgroundJobTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Yüklenen CSV'ler ve üretilen ZIP'ler gerçek media/jobs/ altına düşmesin.
+        media_root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        cls.enterClassContext(override_settings(MEDIA_ROOT=media_root))
+        super().setUpClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.role_student = Role.objects.create(name="Student")
+        cls.role_regular = Role.objects.create(name="Regular Instructor")
+        cls.teacher = User.objects.create_user(username="teacher_job", password="pass", role=cls.role_regular)
+        cls.student = User.objects.create_user(username="student_job", password="pass", role=cls.role_student)
+        cls.course = Course.objects.create(name="Jobs", code="CSE995", instructor=cls.teacher)
+        cls.course.students.add(cls.student)
+        cls.exam = Exam.objects.create(course=cls.course, name="Midterm")
+        cls.assignment = Assignment.objects.create(
+            course=cls.course, title="HW", description="d", created_by=cls.teacher,
+            due_at=timezone.now() + timedelta(days=3),
+        )
+
+    def setUp(self):
+        self.client.force_login(self.teacher)
+
+    def test_csv_import_job_runs_in_worker(self):
+        csv_file = SimpleUploadedFile("s.csv", f"student_id,username,score,feedback\n{self.student.id},,88,iyi\n".encode())
+        resp = self.client.post(
+            reverse("manage_exam_scores", args=[self.exam.id]), {"csv_file": csv_file, "background": "1"}
+        )
+        job = BackgroundJob.objects.get()
+        self.assertRedirects(resp, reverse("job_detail", args=[job.id]))
+        self.assertFalse(ExamResult.objects.filter(exam=self.exam).exists())
+
+        out = io.StringIO()
+        call_command("run_eys_worker", "--once", stdout=out)
+        self.assertIn("1 iş işlendi", out.getvalue())
+        job.refresh_from_db()
+        self.assertEqual(job.status, BackgroundJob.STATUS_DONE)
+        self.assertIn("Yeni: 1", job.result_message)
+        self.assertEqual(ExamResult.objects.get(exam=self.exam, student=self.student).score, Decimal("88.00"))
+
+        data = self.client.get(reverse("job_detail", args=[job.id]) + "?format=json").json()
+        self.assertEqual(data["status"], "done")
+
+    def test_invalid_csv_marks_job_failed(self):
+        csv_file = SimpleUploadedFile("s.csv", b"student_id,username,score,feedback\n9999,ghost,88,\n")
+        job = enqueue_job(self.teacher, "exam_scores_import", {"exam_id": self.exam.id}, input_file=csv_file)
+        run_pending_jobs()
+        job.refresh_from_db()
+        self.assertEqual(job.status, BackgroundJob.STATUS_FAILED)
+        self.assertIn("Öğrenci bulunamadı", job.error)
+
+    def test_zip_job_produces_downloadable_artifact(self):
+        submission = Submission.objects.create(assignment=self.assignment, student=self.student, text="x")
+        SubmissionAttachment.objects.create(
+            submission=submission, file=SimpleUploadedFile("a.txt", b"hello"), version=1
+        )
+        url = reverse("export_submissions_zip", args=[self.assignment.id])
+        # GET hiçbir zaman iş kuyruğa almaz (önceden getirme / tarayıcılar).
+        self.client.get(url + "?background=1")
+        self.assertFalse(BackgroundJob.objects.exists())
+        resp = self.client.post(url, {"background": "1"})
+        job = BackgroundJob.objects.get()
+        self.assertRedirects(resp, reverse("job_detail", args=[job.id]))
+        run_pending_jobs()
+        resp = self.client.get(reverse("job_download", args=[job.id]))
+        self.assertEqual(resp.status_code, 200)
+        zf = zipfile.ZipFile(io.BytesIO(b"".join(resp.streaming_content)))
+        self.assertEqual(len(zf.namelist()), 1)
+        job.refresh_from_db()
+        job.result_file.delete(save=False)
+
+        self.client.force_login(self.student)
+        self.assertEqual(self.client.get(reverse("job_detail", args=[job.id])).status_code, 404)
+
+    def test_reminder_jobs_require_post(self):
+        url = reverse("send_exam_reminders", args=[self.exam.id])
+        self.client.get(url + "?background=1")
+        self.assertFalse(BackgroundJob.objects.exists())
+        resp = self.client.post(url, {"background": "1"})
+        self.assertRedirects(resp, reverse("job_detail", args=[BackgroundJob.objects.get(kind="exam_reminders").id]))
+
+    def test_worker_maintenance_prunes_old_jobs_and_requeues_stale(self):
+        now = timezone.now()
+        old = enqueue_job(self.teacher, "exam_scores_import", {"exam_id": self.exam.id},
+                          input_file=SimpleUploadedFile("old.csv", b"student_id,username,score,feedback\n"))
+        path = old.input_file.path
+        BackgroundJob.objects.filter(id=old.id).update(status=BackgroundJob.STATUS_DONE, finished_at=now - timedelta(days=8))
+        recent = enqueue_job(self.teacher, "exam_reminders", {"exam_id": self.exam.id})
+        BackgroundJob.objects.filter(id=recent.id).update(status=BackgroundJob.STATUS_DONE, finished_at=now)
+        stale = enqueue_job(self.teacher, "exam_reminders", {"exam_id": self.exam.id})
+        BackgroundJob.objects.filter(id=stale.id).update(
+            status=BackgroundJob.STATUS_RUNNING, started_at=now - timedelta(hours=1), attempts=1
+        )
+
+        out = io.StringIO()
+        call_command("run_eys_worker", "--once", stdout=out)
+        self.assertIn("1 takılı iş", out.getvalue())
+        self.assertIn("1 eski iş", out.getvalue())
+        self.assertFalse(BackgroundJob.objects.filter(id=old.id).exists())
+        self.assertFalse(os.path.exists(path))
+        self.assertTrue(BackgroundJob.objects.filter(id=recent.id).exists())
+        stale.refresh_from_db()
+        self.assertEqual(stale.status, BackgroundJob.STATUS_DONE)
+        self.assertEqual(prune_jobs(timedelta(0), now=timezone.now() + timedelta(seconds=1)), 2)
+
+    def test_running_job_with_fresh_heartbeat_is_not_requeued(self):
+        now = timezone.now()
+        enqueue_job(self.teacher, "risk_refresh", {})
+        job = claim_next_job("w1")
+        BackgroundJob.objects.filter(id=job.id).update(
+            started_at=now - timedelta(hours=2), heartbeat_at=now - timedelta(hours=2)
+        )
+        job.refresh_from_db()
+        heartbeat(job, now=now - timedelta(minutes=1))
+        self.assertEqual(requeue_stale_jobs(now=now), 0)
+        self.assertIsNone(claim_next_job("w2"))
+
+        # Aralıktan sık çağrılar yazılmaz; sinyal kesilince iş yeniden kuyruğa döner.
+        heartbeat(job, now=now - timedelta(minutes=1) + timedelta(seconds=5))
+        job.refresh_from_db()
+        self.assertEqual(job.heartbeat_at, now - timedelta(minutes=1))
+        self.assertEqual(requeue_stale_jobs(now=now + timedelta(minutes=15)), 1)
+        self.assertEqual(claim_next_job("w2").id, job.id)
+
+    def test_claimed_job_is_not_claimed_twice(self):
+        enqueue_job(self.teacher, "exam_reminders", {"exam_id": self.exam.id})
+        job = claim_next_job("w1")
+        self.assertEqual(job.attempts, 1)
+        self.assertIsNone(claim_next_job("w2"))
+        run_job(job)
+        self.assertEqual(job.status, BackgroundJob.STATUS_DONE)
+        self.assertEqual(Notification.objects.filter(user=self.student, kind="exam_reminder").count(), 1)
+
+
+class GlobalSearchIndexTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.role_student = Role.objects.create(name="Student")
+        cls.role_regular = Role.objects.create(name="Regular Instructor")
+        cls.teacher = User.objects.create_user(username="teacher_fts", password="pass", role=cls.role_regular)
+        cls.student = User.objects.create_user(username="student_fts", password="pass", role=cls.role_student)
+        cls.course = Course.objects.create(name="Veri Yapıları", code="CSE996", instructor=cls.teacher)
+        cls.other_course = Course.objects.create(name="Ağ Programlama", code="CSE997")
+        cls.course.students.add(cls.student)
+        cls.body_hit = Exam.objects.create(course=cls.course, name="Vize", description="Graf algoritmaları")
+        cls.title_hit = Exam.objects.create(course=cls.course, name="Graf Quiz", description="")
+        cls.hidden_exam = Exam.objects.create(course=cls.other_course, name="Graf Final")
+        cls.draft = Assignment.objects.create(course=cls.course, title="Graf ödevi taslak", created_by=cls.teacher)
+
+    def _search(self, user, query):
+        self.client.force_login(user)
+        return self.client.get(reverse("global_search") + "?q=" + query).context
+
+    def test_results_are_ranked_and_scoped(self):
+        self.assertTrue(search.fts_available())
+        context = self._search(self.student, "graf")
+        self.assertEqual(context["results_exams"], [self.title_hit, self.body_hit])
+        self.assertEqual(context["results_assignments"], [])
+        context = self._search(self.teacher, "GRAF")
+        self.assertEqual(context["results_assignments"], [self.draft])
+
+    def test_index_follows_saves_and_deletes(self):
+        Announcement.objects.create(title="Laboratuvar saatleri", body="<p>Perşembe</p>", course=None)
+        material = CourseMaterial.objects.create(course=self.course, title="Hafta notları", description="yığın")
+        context = self._search(self.student, "persembe")
+        self.assertEqual(len(context["results_announcements"]), 1)
+        self.assertEqual(context["results_materials"], [])
+
+        material.description = "perşembe tekrarı"
+        material.save()
+        self.assertEqual(self._search(self.student, "perşembe")["results_materials"], [material])
+        material.delete()
+        self.assertEqual(self._search(self.student, "perşembe")["results_materials"], [])
+
+    def test_fallback_without_fts(self):
+        with mock.patch.object(search, "fts_available", return_value=False):
+            context = self._search(self.student, "Graf")
+        self.assertEqual(context["results_exams"], [self.title_hit, self.body_hit])
+        self.assertEqual(context["results_courses"], [])
+
+    def test_migration_builds_index_without_live_search_module(self):
+        migration = importlib.import_module("eys.migrations.0011_search_index")
+        self.assertFalse(hasattr(migration, "search"))
+        editor = SimpleNamespace(connection=connection)
+        migration.drop_search_index(django_apps, editor)
+        migration.create_search_index(django_apps, editor)
+        self.assertEqual(self._search(self.student, "graf")["results_exams"], [self.title_hit, self.body_hit])
+
+
+class DeferredRefreshTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.role_student = Role.objects.create(name="Student")
+        cls.students = User.objects.bulk_create(
+            [User(username=f"deferred{i}", role=cls.role_student) for i in range(3)]
+        )
+        cls.course = Course.objects.create(name="Deferred", code="CSE981")
+        cls.other_course = Course.objects.create(name="Deferred 2", code="CSE982")
+        cls.exam = Exam.objects.create(course=cls.course, name="Vize")
+
+    def test_one_callback_per_transaction(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            for student in self.students:
+                ExamResult.objects.create(exam=self.exam, student=student, score=50)
+        self.assertEqual(len([cb for cb in callbacks if cb.__module__ == "eys.deferred"]), 2)
+
+    def test_rolled_back_savepoint_does_not_leak_into_enclosing_commit(self):
+        with mock.patch("eys.stats.refresh_course_stats") as refresh:
+            try:
+                with transaction.atomic():
+                    schedule_course_stats_refresh(course_id=self.other_course.id)
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+            with self.captureOnCommitCallbacks(execute=True):
+                schedule_course_stats_refresh(course_id=self.course.id)
+                schedule_course_stats_refresh(exam_id=self.exam.id)
+        refresh.assert_called_once_with({self.course.id})
+
+
+class DeferredRollbackTests(TransactionTestCase):
+    def test_rolled_back_transaction_does_not_leak_into_next_commit(self):
+        with mock.patch("eys.stats.refresh_course_stats") as refresh:
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                schedule_course_stats_refresh(course_id=1)
+                raise RuntimeError
+            with transaction.atomic():
+                schedule_course_stats_refresh(course_id=2)
+                schedule_course_stats_refresh(course_id=3)
+        refresh.assert_called_once_with({2, 3})
+
+
+class CourseStatsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.role_student = Role.objects.create(name="Student")
+        cls.role_head = Role.objects.create(name="Head of Department")
+        cls.head = User.objects.create_user(username="head_stats", password="pass", role=cls.role_head)
+        cls.students = User.objects.bulk_create(
+            [User(username=f"stat{i}", role=cls.role_student) for i in range(4)]
+        )
+        cls.course = Course.objects.create(name="Stats", code="CSE998", instructor=cls.head)
+
+    def _stats(self):
+        return CourseStats.objects.get(course=self.course)
+
+    def test_rollup_follows_grades_enrollment_and_thresholds(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.course.students.add(*self.students)
+            exam = Exam.objects.create(course=self.course, name="Vize")
+            final = Exam.objects.create(course=self.course, name="Final")
+            for student, score in zip(self.students, [90, 70, 40]):
+                ExamResult.objects.create(exam=exam, student=student, score=score)
+            ExamResult.objects.create(exam=final, student=self.students[0], score=60)
+        stats = self._stats()
+        self.assertEqual(
+            (stats.student_count, stats.exam_count, stats.result_count, stats.graded_student_count),
+            (4, 2, 4, 3),
+        )
+        self.assertEqual(stats.avg_score, 65.0)
+        self.assertEqual((stats.stable_count, stats.watch_count, stats.support_count), (0, 2, 1))
+        self.assertEqual(stats.passing_count, 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            CourseThreshold.objects.create(course=self.course, stable_min=70, watch_min=50, pass_min=50)
+            self.students[3].courses_taken.remove(self.course)
+        stats = self._stats()
+        self.assertEqual((stats.stable_count, stats.watch_count, stats.support_count), (2, 0, 1))
+        self.assertEqual(stats.student_count, 3)
+
+    def test_department_pages_read_rollup(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            exam = Exam.objects.create(course=self.course, name="Vize")
+            ExamResult.objects.create(exam=exam, student=self.students[0], score=30)
+        self.client.force_login(self.head)
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(reverse("department_courses"))
+        self.assertEqual(resp.context["critical_count"], 1)
+        self.assertFalse(any("GROUP BY" in q["sql"] for q in ctx.captured_queries))
+        self.assertFalse([q for q in ctx.captured_queries if q["sql"].startswith(("INSERT", "UPDATE"))])
+        self.assertEqual(float(list(resp.context["courses"])[0].avg_score), 30.0)
+
+    def test_average_is_not_rounded_before_thresholds(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            exam = Exam.objects.create(course=self.course, name="Vize")
+            for student, score in zip(self.students, ["49.99", "49.99", "50.01"]):
+                ExamResult.objects.create(exam=exam, student=student, score=Decimal(score))
+        # (49.99 + 49.99 + 50.01) / 3 = 49.9966…; iki basamağa yuvarlansa 50.00 olurdu.
+        self.assertEqual(CourseStats.objects.filter(avg_score__lt=50).count(), 1)
+
+    def test_rebuild_command_fills_missing_rollups(self):
+        CourseStats.objects.all().delete()
+        out = io.StringIO()
+        call_command("rebuild_course_stats", "--missing-only", stdout=out)
+        self.assertIn("✅ 1 ders", out.getvalue())
+        self.assertEqual(self._stats().student_count, 0)
+
+
+class PerformanceTimingMiddlewareTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.role_student = Role.objects.create(name="Student")
+        cls.student = User.objects.create_user(username="student_perf", password="pass", role=cls.role_student)
+
+    def test_disabled_by_default(self):
+        self.client.force_login(self.student)
+        resp = self.client.get(reverse("notifications"))
+        self.assertNotIn("Server-Timing", resp)
+
+    @override_settings(EYS_PERF_TIMING=True)
+    def test_server_timing_header_and_log_line(self):
+        self.client.force_login(self.student)
+        with self.assertLogs("eys.performance", level="INFO") as logs:
+            resp = self.client.get(reverse("notifications"))
+        self.assertRegex(resp["Server-Timing"], r'total;dur=[\d.]+, sql;dur=[\d.]+;desc="\d+ queries", tpl;dur=[\d.]+')
+        report = json.loads(logs.records[0].getMessage())
+        self.assertEqual(report["view"], "notifications")
+        self.assertGreater(report["query_count"], 0)
+        self.assertGreater(report["template_ms"], 0)
+
+    @override_settings(EYS_PERF_TIMING=True, EYS_PERF_NPLUSONE_THRESHOLD=3)
+    def test_repeated_query_pattern_is_flagged(self):
+        def view(request):
+            for user_id in range(4):
+                list(User.objects.filter(id=user_id))
+            return HttpResponse("ok")
+
+        middleware = PerformanceTimingMiddleware(view)
+        with self.assertLogs("eys.performance", level="INFO") as logs:
+            resp = middleware(RequestFactory().get("/x/"))
+        self.assertIn('dup;desc="0 duplicate, 1 n+1"', resp["Server-Timing"])
+        self.assertTrue(any("N+1" in record.getMessage() for record in logs.records))
+
+    @override_settings(EYS_PERF_TIMING=True)
+    def test_template_backend_is_not_patched(self):
+        from django.template.backends.django import Template as DjangoBackendTemplate
+
+        original = DjangoBackendTemplate.render
+        PerformanceTimingMiddleware(lambda request: HttpResponse("ok"))
+        self.assertIs(DjangoBackendTemplate.render, original)
+
+    @override_settings(EYS_PERF_TIMING=True)
+    def test_streaming_response_is_reported_unmeasured(self):
+        def view(request):
+            return StreamingHttpResponse(str(user.pk) for user in User.objects.all())
+
+        middleware = PerformanceTimingMiddleware(view)
+        with self.assertLogs("eys.performance", level="INFO") as logs:
+            resp = middleware(RequestFactory().get("/x/"))
+        b"".join(resp.streaming_content)
+        self.assertIn('desc="streaming, body not measured"', resp["Server-Timing"])
+        self.assertNotIn("sql;", resp["Server-Timing"])
+        report = json.loads(logs.records[0].getMessage())
+        self.assertTrue(report["streaming"])
+        self.assertIsNone(report["query_count"])
+
+    def test_fingerprint_collapses_in_lists(self):
+        self.assertEqual(
+            fingerprint('SELECT * FROM "t" WHERE "id" IN (%s, %s, %s) LIMIT 21'),
+            fingerprint('SELECT * FROM "t" WHERE "id" IN (%s) LIMIT 21'),
+        )
+
+
+class NavbarCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.role_student = Role.objects.create(name="Student")
+        cls.role_regular = Role.objects.create(name="Regular Instructor")
+        cls.teacher = User.objects.create_user(username="teacher_nav", password="pass", role=cls.role_regular)
+        cls.student = User.objects.create_user(username="student_nav", password="pass", role=cls.role_student)
+        cls.course = Course.objects.create(name="Navbar", code="CSE993", instructor=cls.teacher)
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+
+    def _navbar(self, user):
+        request = self.factory.get("/")
+        request.user = user
+        return navbar(request)
+
+    def test_cached_navbar_costs_no_queries(self):
+        self._navbar(self.student)
+        with CaptureQueriesContext(connection) as ctx:
+            data = self._navbar(self.student)
+        self.assertEqual(len(ctx.captured_queries), 0)
+        self.assertEqual(data["nav_notification_count"], 0)
+
+    def test_notification_exam_and_enrollment_changes_invalidate(self):
+        self._navbar(self.student)
+        Notification.objects.create(user=self.student, kind="exam_reminder", message="Sınav yarın")
+        self.assertEqual(self._navbar(self.student)["nav_notification_count"], 1)
+
+        self.course.students.add(self.student)
+        Exam.objects.create(course=self.course, name="Quiz", scheduled_at=timezone.now() + timedelta(days=2))
+        self.assertEqual(self._navbar(self.student)["nav_upcoming_count"], 1)
+        self.assertEqual(self._navbar(self.teacher)["nav_upcoming_count"], 1)
+
+        self.student.courses_taken.remove(self.course)
+        self.assertEqual(self._navbar(self.student)["nav_upcoming_count"], 0)
+
+        self.client.force_login(self.student)
+        self.client.get(reverse("mark_all_notifications_read"))
+        self.assertEqual(self._navbar(self.student)["nav_notification_count"], 0)
+
+    def test_instructor_reassignment_invalidates_both_instructors(self):
+        other = User.objects.create_user(username="teacher_nav2", password="pass", role=self.role_regular)
+        Exam.objects.create(course=self.course, name="Quiz", scheduled_at=timezone.now() + timedelta(days=2))
+        self.assertEqual(self._navbar(self.teacher)["nav_upcoming_count"], 1)
+        self.assertEqual(self._navbar(other)["nav_upcoming_count"], 0)
+        self.course.instructor = other
+        self.course.save()
+        self.assertEqual(self._navbar(self.teacher)["nav_upcoming_count"], 0)
+        self.assertEqual(self._navbar(other)["nav_upcoming_count"], 1)
+
+    def test_role_change_invalidates_navbar(self):
+        self.course.students.add(self.student)
+        Exam.objects.create(course=self.course, name="Quiz", scheduled_at=timezone.now() + timedelta(days=2))
+        self.assertEqual(self._navbar(self.student)["nav_upcoming_count"], 1)
+        self.student.role = self.role_regular
+        self.student.save()
+        self.assertEqual(self._navbar(self.student)["nav_upcoming_count"], 0)
+
+        # Rol alanına dokunmayan kayıtlar (ör. last_login) rolü yeniden okumaz.
+        with CaptureQueriesContext(connection) as ctx:
+            self.student.save(update_fields=["last_login"])
+        self.assertFalse([q for q in ctx.captured_queries if '"role_id"' in q["sql"]])
+
+
+class UniversityGeneratorTests(TestCase):
+    SMALL = dict(students=30, instructors=3, advisors=2, courses=4, courses_per_student=2, exams_per_course=3,
+                 los_per_course=2, assignments_per_course=1, announcements_per_course=1, materials_per_course=1,
+                 notifications_per_student=1, batch_size=50)
+
+    def _snapshot(self):
+        return (
+            list(User.objects.filter(username__startswith="tst_").order_by("username")
+                 .values_list("username", "first_name", "advisor__username")),
+            list(ExamResult.objects.filter(exam__course__code__startswith="TST-")
+                 .order_by("exam__course__code", "exam__name", "student__username")
+                 .values_list("exam__course__code", "student__username", "score")),
+        )
+
+    def test_same_seed_generates_same_content(self):
+        spec = UniversitySpec(seed=7, prefix="tst", **self.SMALL)
+        counts, course_ids = generate_university(spec)
+        self.assertEqual(counts["User"], 1 + 2 + 3 + 30)
+        self.assertEqual(counts["Course_students"], 30 * 2)
+        self.assertEqual(Course.objects.filter(code__startswith="TST-").count(), 4)
+        first = self._snapshot()
+
+        purge("tst")
+        self.assertFalse(User.objects.filter(username__startswith="tst_").exists())
+        generate_university(spec)
+        self.assertEqual(self._snapshot(), first)
+
+    def test_purge_bulk_deletes_children_and_refreshes_derived_once(self):
+        _, course_ids = generate_university(UniversitySpec(seed=7, prefix="tst", **self.SMALL))
+        refresh_derived(course_ids)
+        teacher = User.objects.create_user(username="purge_teacher", password="pass")
+        other = Course.objects.create(name="Kalıcı", code="KEEP101", instructor=teacher)
+        student = User.objects.filter(username__startswith="tst_").exclude(courses_taken=None).first()
+        other.students.add(student)
+        exam = Exam.objects.create(course=other, name="Vize")
+        ExamResult.objects.create(exam=exam, student=student, score=Decimal("70"))
+        refresh_course_stats([other.id])
+        self.assertEqual(CourseStats.objects.get(course=other).result_count, 1)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            users, courses = purge("tst", batch_size=50)
+        self.assertEqual((users, courses), (36, 4))
+        # Satır başına sinyaller yenileme biriktirmez; türetilmiş veriler sonda bir kez yenilenir.
+        self.assertFalse([cb for cb in callbacks if cb.__module__ == "eys.deferred"])
+        self.assertFalse(ExamResult.objects.filter(student__username__startswith="tst_").exists())
+        self.assertFalse(Notification.objects.filter(user__username__startswith="tst_").exists())
+        self.assertFalse(Submission.objects.exists())
+        self.assertFalse(StudentOutcomeScore.objects.filter(course__code__startswith="TST-").exists())
+        self.assertTrue(Exam.objects.filter(id=exam.id).exists())
+        self.assertEqual(CourseStats.objects.get(course=other).result_count, 0)
+
+    def test_command_refreshes_derived_tables(self):
+        out = io.StringIO()
+        call_command("generate_university", "--seed", "3", "--prefix", "tst", "--students", "20",
+                     "--courses", "3", "--instructors", "2", "--advisors", "1", "--batch-size", "25", stdout=out)
+        self.assertIn("✅", out.getvalue())
+        courses = Course.objects.filter(code__startswith="TST-")
+        self.assertEqual(CourseStats.objects.filter(course__in=courses).count(), 3)
+        self.assertEqual(
+            sum(CourseStats.objects.filter(course__in=courses).values_list("result_count", flat=True)),
+            ExamResult.objects.filter(exam__course__in=courses).count(),
+        )
+        self.assertTrue(StudentOutcomeScore.objects.filter(course__in=courses).exists())
+
+
+class BenchmarkHarnessTests(TestCase):
+    def test_scenarios_run_against_generated_data(self):
+        generate_university(UniversitySpec(seed=5, prefix="bench", students=12, instructors=2, advisors=1,
+                                           courses=2, courses_per_student=2, exams_per_course=2,
+                                           notifications_per_student=1, batch_size=50))
+        targets = benchmarks.collect_targets("bench")
+        only = {"student_dashboard", "manage_exam_scores", "export_exam_scores_csv", "department_courses"}
+        results = benchmarks.run_scenarios(targets, iterations=2, warmup=0, only=only)
+        self.assertEqual(set(results), only)
+        for result in results.values():
+            self.assertGreater(result["queries"], 0)
+            self.assertLessEqual(result["p50_ms"], result["p95_ms"])
+
+    def test_compare_flags_regressions_beyond_tolerance(self):
+        spec = UniversitySpec(students=10)
+        baseline = benchmarks.build_report(
+            spec, {"course_detail": {"p50_ms": 10.0, "p95_ms": 20.0, "queries": 8, "peak_kib": 500.0}}, 20
+        )
+        within = benchmarks.build_report(
+            spec, {"course_detail": {"p50_ms": 11.0, "p95_ms": 24.0, "queries": 8, "peak_kib": 600.0}}, 20
+        )
+        self.assertEqual(benchmarks.compare(baseline, within, tolerance=0.25), [])
+
+        worse = benchmarks.build_report(
+            spec, {"course_detail": {"p50_ms": 30.0, "p95_ms": 40.0, "queries": 9, "peak_kib": 2000.0}}, 20
+        )
+        self.assertEqual(len(benchmarks.compare(baseline, worse, tolerance=0.25)), 3)
+        self.assertEqual(len(benchmarks.compare(baseline, worse, tolerance=5, query_tolerance=1)), 0)
+
+        with self.assertRaises(benchmarks.BenchmarkError):
+            benchmarks.compare(baseline, benchmarks.build_report(UniversitySpec(students=20), {}, 20))
+
+
+class QueryPlanTests(TestCase):
+    def test_table_scans_resolves_aliases_and_skips_index_steps(self):
+        sql = 'SELECT 1 FROM "eys_exam" WHERE "eys_exam"."course_id" IN (SELECT U0."id" FROM "eys_course" U0)'
+        plan = [
+            "SEARCH eys_exam USING INDEX eys_exam_course_sched_idx (course_id=?)",
+            "LIST SUBQUERY 1",
+            "SCAN U0",
+            "SCAN eys_studentrisk USING INDEX eys_studentrisk_score_idx",
+            "SCAN eys_search_index VIRTUAL TABLE INDEX 0:M5",
+            "SCAN (subquery-1)",
+            "SCAN CONSTANT ROW",
+        ]
+        self.assertEqual(queryplan.table_scans(sql, plan), [("eys_course", "SCAN U0")])
+
+    def test_main_views_avoid_full_scans(self):
+        generate_university(UniversitySpec(seed=5, prefix="bench", students=12, instructors=2, advisors=1,
+                                           courses=2, courses_per_student=2, exams_per_course=2,
+                                           notifications_per_student=1, batch_size=50))
+        targets = benchmarks.collect_targets("bench")
+        # Ders başına tek satırlık özet ve küçük ders kataloğu bilerek taranır.
+        report = queryplan.audit(targets, ignore_tables={"eys_coursestats", "eys_course"}, min_rows=0)
+        self.assertEqual(set(report), {name for name, _, _ in benchmarks.SCENARIOS})
+        scans = {name: entry["scans"] for name, entries in report.items() for entry in entries if entry["scans"]}
+        self.assertEqual(scans, {})
+
+        report = queryplan.audit(targets, only={"department_overview"}, min_rows=0)
+        tables = {table for entry in report["department_overview"] for table, _ in entry["scans"]}
+        self.assertIn("eys_coursestats", tables)
+        self.assertNotIn("eys_studentrisk", tables)
+        # Varsayılan eşikte küçük tabloların taranması raporlanmaz.
+        report = queryplan.audit(targets, only={"department_overview"})
+        self.assertFalse(any(entry["scans"] for entry in report["department_overview"]))
+
+
+class StartupProfileTests(SimpleTestCase):
+    def test_cold_start_is_quiet_and_skips_urlconf(self):
+        result = measure_cold_start(include_urls=False, importtime=False)
+        self.assertEqual(result["stdout"].strip(), "")
+        self.assertNotIn("eys.views", result["modules"])
+        self.assertNotIn("requests", result["modules"])
+        # Cömert bir sınır: yalnızca import zamanında ağır iş yapılmasını yakalamak için.
+        self.assertLess(result["setup_ms"], 5000)
+
+    def test_url_loading_is_quiet_and_profiled(self):
+        result = measure_cold_start(include_urls=True)
+        self.assertEqual(result["stdout"].strip(), "")
+        self.assertIn("eys.urls", result["modules"])
+        self.assertNotIn("requests", result["modules"])
+        # View modülleri ve CSV/ZIP/QR kodu ilk istekte yüklenir.
+        for module in ("eys.views.student", "eys.views.exports", "eys.views.grading", "eys.exports", "qrcode"):
+            self.assertNotIn(module, result["modules"])
+        self.assertIn("eys.models", {row["module"] for row in result["dynamic"]})
+        self.assertTrue(summarize(result["imports"], prefix="eys"))
+
+    def test_job_queue_defers_handler_dependencies(self):
+        # İş kuyruğa alan view'lar CSV/ZIP/bildirim/risk kodunu yüklememeli.
+        result = measure_cold_start(include_urls=False, importtime=False, modules=["eys.jobs"])
+        self.assertIn("eys.jobs", result["modules"])
+        for module in ("eys.exports", "eys.grades", "eys.notifications", "eys.risk"):
+            self.assertNotIn(module, result["modules"])
+
+    def test_parse_importtime(self):
+        rows = parse_importtime(
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |     eys.stats\n"
+            "import time:       300 |        420 |   eys.signals\n"
+        )
+        self.assertEqual(rows[1], {"module": "eys.signals", "self_us": 300, "cumulative_us": 420, "depth": 1})
+        self.assertEqual(summarize(rows, sort="self")[0]["module"], "eys.signals")
+
+
+class ExamSerializerTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.role_student = Role.objects.create(name="Student")
+        cls.role_regular = Role.objects.create(name="Regular Instructor")
+        cls.teacher = User.objects.create_user(username="teacher_ser", password="pass", role=cls.role_regular)
+        cls.student = User.objects.create_user(username="student_ser", password="pass", role=cls.role_student)
+        cls.course = Course.objects.create(name="Serileştirme", code="CSE555", instructor=cls.teacher)
+        cls.course.students.add(cls.student)
+        now = timezone.now()
+        cls.past = Exam.objects.create(course=cls.course, name="Ara Sınav (Midterm)", scheduled_at=now - timedelta(days=3))
+        cls.soon = Exam.objects.create(course=cls.course, name="KISA SINAV", scheduled_at=now + timedelta(days=1))
+        ExamResult.objects.create(exam=cls.past, student=cls.student, score=Decimal("77"))
+
+    def test_serializer_memoizes_and_keeps_scores_per_call(self):
+        serialize = ExamSerializer()
+        exam = Exam.objects.select_related("course").get(id=self.past.id)
+        first = serialize(exam)
+        self.assertIs(serialize(exam), first)
+        scored = serialize(exam, score=Decimal("77"))
+        self.assertEqual(scored["score"], Decimal("77"))
+        self.assertIsNone(first["score"])
+        self.assertEqual((first["status"], first["type_label"]), ("past", "Vize"))
+        self.assertEqual(first["course_color"], course_color("CSE555"))
+        self.assertEqual(exam_type_label("Final Sınavı"), "Final")
+        self.assertEqual(exam_type_label("kısa sınav"), "Quiz")
+        self.assertIsNone(exam_type_label("Proje"))
+
+    def test_dashboards_serialize_each_exam_once(self):
+        self.client.force_login(self.student)
+        with mock.patch.object(ExamSerializer, "_serialize", autospec=True, side_effect=ExamSerializer._serialize) as spy:
+            resp = self.client.get(reverse("student_dashboard"))
+        self.assertEqual(spy.call_count, 2)
+        results = {card["id"]: card for card in resp.context["exam_results"]}
+        self.assertEqual(results[self.past.id]["score"], Decimal("77"))
+        self.assertEqual([card["id"] for card in resp.context["upcoming_exams"]], [self.soon.id])
+        self.assertEqual(resp.context["upcoming_exams"][0]["status"], "soon")
+
+        self.client.force_login(self.teacher)
+        with mock.patch.object(ExamSerializer, "_serialize", autospec=True, side_effect=ExamSerializer._serialize) as spy:
+            resp = self.client.get(reverse("teacher_dashboard"))
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(spy.call_count, 2)
+
+
+class StudentDashboardLoaderTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.role_student = Role.objects.create(name="Student")
+        cls.role_regular = Role.objects.create(name="Regular Instructor")
+        cls.teacher = User.objects.create_user(username="teacher_dash", password="pass", role=cls.role_regular)
+        cls.student = User.objects.create_user(username="student_dash", password="pass", role=cls.role_student)
+        cls.now = timezone.now()
+        cls._add_course(0)
+        Announcement.objects.create(title="Genel", body="b", author=cls.teacher)
+
+    @classmethod
+    def _add_course(cls, index):
+        course = Course.objects.create(name=f"Panel {index}", code=f"DSH{index:03d}", instructor=cls.teacher)
+        course.students.add(cls.student)
+        lo = LearningOutcome.objects.create(course=course, title=f"LO {index}")
+        for offset in (-10, 4):
+            exam = Exam.objects.create(
+                course=course, name=f"Sınav {offset}", scheduled_at=cls.now + timedelta(days=offset + index)
+            )
+            ExamLOWeight.objects.create(exam=exam, learning_outcome=lo, weight=50)
+            if offset < 0:
+                ExamResult.objects.create(exam=exam, student=cls.student, score=Decimal("90"))
+        Exam.objects.create(course=course, name="Tarihsiz")
+        Announcement.objects.create(title=f"Duyuru {index}", body="b", course=course, author=cls.teacher)
+        return course
+
+    def test_loader_query_budget_does_not_grow_with_courses(self):
+        with self.assertNumQueries(DASHBOARD_QUERY_BUDGET):
+            data = StudentDashboardData.load(self.student)
+        self.assertEqual(data.lo_success(), [("LO 0", Decimal("45.00"))])
+        self.assertEqual([exam.name for exam in data.latest_exams()], ["Sınav 4", "Sınav -10", "Tarihsiz"])
+        self.assertEqual([exam.name for exam in data.upcoming_exams(self.now)], ["Sınav 4"])
+
+        for index in range(1, 6):
+            self._add_course(index)
+        with self.assertNumQueries(DASHBOARD_QUERY_BUDGET):
+            data = StudentDashboardData.load(self.student)
+        self.assertEqual(len(data.exams), 18)
+        self.assertEqual(len(data.lo_success()), 4)
+        self.assertNotIn("Tarihsiz", [exam.name for exam in data.latest_exams()])
+
+    def test_dashboard_view_query_count_is_constant(self):
+        self.client.force_login(self.student)
+        self.client.get(reverse("student_dashboard"))
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(reverse("student_dashboard"))
+        for index in range(1, 6):
+            self._add_course(index)
+        cache.clear()
+        self.client.get(reverse("student_dashboard"))
+        with CaptureQueriesContext(connection) as large:
+            resp = self.client.get(reverse("student_dashboard"))
+        self.assertEqual(len(large.captured_queries), len(small.captured_queries))
+        results = [q for q in large.captured_queries if 'FROM "eys_examresult"' in q["sql"]]
+        self.assertEqual(len(results), 1)
+        self.assertEqual(resp.context["exam_total"], 18)
+        self.assertEqual(len(resp.context["calendar_days"]), 4)
+        self.assertEqual(len(resp.context["announcement_cards"]), 3)
+
+
+class CalendarEngineTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.role_student = Role.objects.create(name="Student")
+        cls.role_regular = Role.objects.create(name="Regular Instructor")
+        cls.teacher = User.objects.create_user(username="teacher_cal", password="pass", role=cls.role_regular)
+        cls.student = User.objects.create_user(username="student_cal", password="pass", role=cls.role_student)
+        cls.course = Course.objects.create(name="Takvim", code="CAL101", instructor=cls.teacher)
+        cls.course.students.add(cls.student)
+        aware = lambda *args: timezone.make_aware(timezone.datetime(*args))
+        Exam.objects.create(course=cls.course, name="Eski", scheduled_at=aware(2024, 1, 10, 10))
+        Exam.objects.create(course=cls.course, name="Mart", scheduled_at=aware(2025, 3, 15, 10))
+        Exam.objects.create(course=cls.course, name="Nisan", scheduled_at=aware(2025, 4, 1, 0))
+        now = timezone.now()
+        for offset in range(1, 9):
+            Exam.objects.create(course=cls.course, name=f"Gelecek {offset}", scheduled_at=now + timedelta(days=offset))
+
+    def _names(self, rows):
+        return [item["name"] for row in rows for cell in row if cell for item in cell["items"]]
+
+    def test_month_grid_shape(self):
+        rows = calendars.month_grid(2025, 3, {}, timezone.localdate())
+        self.assertEqual(len(rows), 6)
+        self.assertTrue(all(len(row) == 7 for row in rows))
+        self.assertEqual(rows[0][5]["day"], 1)
+        self.assertIsNone(rows[0][4])
+        self.assertEqual(rows[5][0]["day"], 31)
+        self.assertEqual(calendars.shift_month(2025, 1, -1), (2024, 12))
+
+    def test_student_month_reads_only_visible_window(self):
+        self.client.force_login(self.student)
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(reverse("student_calendar") + "?month=3&year=2025")
+        self.assertEqual(self._names(resp.context["calendar_rows"]), ["Mart"])
+        self.assertEqual(len(resp.context["upcoming_list"]), calendars.UPCOMING_LIMIT)
+        self.assertEqual(resp.context["upcoming_list"][0]["name"], "Gelecek 1")
+        exam_queries = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith('SELECT "eys_exam"."id"')]
+        self.assertEqual(len(exam_queries), 2)
+        self.assertTrue(all('"eys_exam"."scheduled_at" >=' in sql for sql in exam_queries))
+        self.assertTrue(any("LIMIT 6" in sql for sql in exam_queries))
+
+    def test_teacher_week_and_month_views(self):
+        self.client.force_login(self.teacher)
+        resp = self.client.get(reverse("teacher_calendar") + "?view=week&date=2025-03-12")
+        days = resp.context["week_days"]
+        self.assertEqual(days[0]["date"].isoformat(), "2025-03-10")
+        self.assertEqual([item["name"] for item in days[5]["items"]], ["Mart"])
+        self.assertEqual(sum(len(day["items"]) for day in days), 1)
+
+        resp = self.client.get(reverse("teacher_calendar") + "?view=month&month=4&year=2025")
+        self.assertEqual(self._names(resp.context["calendar_rows"]), ["Nisan"])
+        self.assertTrue(resp.context["has_events"])
+        resp = self.client.get(reverse("teacher_calendar") + "?view=month&month=5&year=2025&course_id=999")
+        self.assertFalse(resp.context["has_events"])
+        self.assertEqual(resp.context["upcoming_list"], [])
+
+
+class StudentAnalyticsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.role_student = Role.objects.create(name="Student")
+        cls.role_regular = Role.objects.create(name="Regular Instructor")
+        cls.role_advisor = Role.objects.create(name="Advisor Instructor")
+        cls.teacher = User.objects.create_user(username="teacher_an", password="pass", role=cls.role_regular)
+        cls.advisor = User.objects.create_user(username="advisor_an", password="pass", role=cls.role_advisor)
+        cls.student = User.objects.create_user(
+            username="student_an", password="pass", role=cls.role_student, advisor=cls.advisor
+        )
+        cls.algo = Course.objects.create(name="Algoritmalar", code="CSE201", instructor=cls.teacher)
+        cls.db = Course.objects.create(name="Veritabanı", code="CSE301", instructor=cls.teacher)
+        for course in (cls.algo, cls.db):
+            course.students.add(cls.student)
+        now = timezone.now()
+        for course, scores in ((cls.algo, ["49.50", "90"]), (cls.db, ["60", "70"])):
+            for i, score in enumerate(scores):
+                exam = Exam.objects.create(course=course, name=f"Sınav {i}", scheduled_at=now - timedelta(days=10 - i))
+                ExamResult.objects.create(exam=exam, student=cls.student, score=Decimal(score))
+        cls.missed = Assignment.objects.create(course=cls.algo, title="Kaçan", due_at=now - timedelta(days=2))
+        cls.late = Assignment.objects.create(course=cls.db, title="Geç", due_at=now - timedelta(days=1))
+        cls.on_time = Assignment.objects.create(course=cls.db, title="Zamanında", due_at=now + timedelta(days=3))
+        Submission.objects.create(assignment=cls.late, student=cls.student, text="geç")
+        Submission.objects.create(assignment=cls.on_time, student=cls.student, text="ok", score=Decimal("88"))
+
+    def test_snapshot_derives_page_sections(self):
+        analytics = StudentAnalytics.load(self.student)
+        averages = {row["code"]: row["avg_score"] for row in analytics.course_averages()}
+        self.assertEqual(list(averages), ["CSE201", "CSE301"])
+        self.assertEqual(averages["CSE201"], Decimal("69.75"))
+        self.assertEqual(analytics.overall_average(), Decimal("67.375"))
+        # 49.50 eskiden hiçbir kovaya düşmüyordu.
+        counts = {bucket["label"]: bucket["count"] for bucket in analytics.histogram()}
+        self.assertEqual(counts, {"0-49": 1, "50-59": 0, "60-69": 1, "70-84": 1, "85-100": 1})
+        self.assertEqual([sub.assignment for sub in analytics.late_submissions()], [self.late])
+        self.assertEqual(analytics.overdue_assignments(), [self.missed])
+        self.assertEqual(analytics.submission_counts(), {"total": 2, "graded": 1})
+        self.assertEqual(len(analytics.recent_exam_results(limit=3)), 3)
+
+    def test_advisor_pages_use_few_queries(self):
+        self.client.force_login(self.advisor)
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(reverse("advisor_student_detail", args=[self.student.id]))
+        self.assertEqual(resp.status_code, 200)
+        tables = [q["sql"] for q in ctx.captured_queries if '"eys_examresult"' in q["sql"].split("WHERE")[0]]
+        self.assertEqual(len(tables), 1)
+        self.assertLessEqual(len(ctx.captured_queries), 10)
+        self.assertEqual(len(resp.context["late_submissions"]), 1)
+        self.assertContains(resp, "CSE201 - Algoritmalar")
+
+        others = User.objects.bulk_create(
+            [User(username=f"advisee{i}", role=self.role_student, advisor=self.advisor) for i in range(10)]
+        )
+        self.algo.students.add(*others)
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(reverse("advisor_students"))
+        self.assertEqual(resp.status_code, 200)
+        self.assertLessEqual(len(ctx.captured_queries), 10)
+        card = next(card for card in resp.context["student_cards"] if card["student"] == self.student)
+        self.assertEqual(card["overall_avg"], Decimal("67.375"))
+        self.assertEqual((card["submission_graded"], card["submission_total"]), (1, 2))
+
+
+class StudentRiskTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.role_student = Role.objects.create(name="Student")
+        cls.role_advisor = Role.objects.create(name="Advisor Instructor")
+        cls.role_head = Role.objects.create(name="Head of Department")
+        cls.advisor = User.objects.create_user(username="advisor_risk", password="pass", role=cls.role_advisor)
+        cls.head = User.objects.create_user(username="head_risk", password="pass", role=cls.role_head)
+        cls.weak = User.objects.create_user(
+            username="weak_risk", password="pass", role=cls.role_student, advisor=cls.advisor
+        )
+        cls.strong = User.objects.create_user(
+            username="strong_risk", password="pass", role=cls.role_student, advisor=cls.advisor
+        )
+        cls.course = Course.objects.create(name="Ağlar", code="CSE401", instructor=cls.advisor)
+        cls.course.students.add(cls.weak, cls.strong)
+        CourseThreshold.objects.create(course=cls.course, pass_min=70, watch_min=80, stable_min=90)
+        now = timezone.now()
+        for i, (weak_score, strong_score) in enumerate((("80", "90"), ("65", "92"), ("50", "95"))):
+            exam = Exam.objects.create(course=cls.course, name=f"Quiz {i}", scheduled_at=now - timedelta(days=30 - i))
+            ExamResult.objects.create(exam=exam, student=cls.weak, score=Decimal(weak_score))
+            ExamResult.objects.create(exam=exam, student=cls.strong, score=Decimal(strong_score))
+        due = now - timedelta(days=2)
+        cls.missed = Assignment.objects.create(course=cls.course, title="Ödev 1", due_at=due, published_at=due - timedelta(days=7))
+        cls.late = Assignment.objects.create(course=cls.course, title="Ödev 2", due_at=due, published_at=due - timedelta(days=7))
+        Assignment.objects.create(course=cls.course, title="Taslak", due_at=due)
+        Submission.objects.create(assignment=cls.late, student=cls.weak, text="geç")
+        for assignment in (cls.missed, cls.late):
+            Submission.objects.create(assignment=assignment, student=cls.strong, text="ok")
+        Submission.objects.filter(student=cls.strong).update(submitted_at=due - timedelta(days=1))
+
+    def test_features_and_score(self):
+        self.assertEqual(refresh_risk_snapshot(), 2)
+        weak = StudentRisk.objects.get(student=self.weak)
+        self.assertEqual(weak.avg_score, Decimal("65.00"))
+        self.assertEqual(weak.failing_course_count, 1)
+        self.assertEqual(weak.weakest_margin, Decimal("-5.00"))
+        self.assertAlmostEqual(weak.trend_slope, -15.0)
+        self.assertEqual(weak.late_ratio, 1.0)
+        self.assertEqual(weak.missing_count, 1)
+        # 27.5 akademik + 20 eğilim + 15 geç + 5 eksik
+        self.assertEqual(weak.score, Decimal("67.50"))
+        self.assertEqual(weak.level, StudentRisk.LEVEL_HIGH)
+
+        strong = StudentRisk.objects.get(student=self.strong)
+        self.assertEqual((strong.score, strong.level, strong.missing_count), (Decimal("0.00"), "low", 0))
+        self.assertEqual([risk.student for risk in top_at_risk(advisor=self.advisor)], [self.weak])
+
+    def test_refresh_query_count_is_independent_of_student_count(self):
+        with CaptureQueriesContext(connection) as small:
+            refresh_risk_snapshot()
+        others = User.objects.bulk_create(
+            [User(username=f"risk{i}", role=self.role_student) for i in range(30)]
+        )
+        self.course.students.add(*others)
+        with CaptureQueriesContext(connection) as large:
+            self.assertEqual(refresh_risk_snapshot(), 32)
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+        self.assertEqual(StudentRisk.objects.get(student=others[0]).missing_count, 2)
+
+    def test_full_refresh_drops_stale_rows(self):
+        refresh_risk_snapshot()
+        self.strong.role = self.role_advisor
+        self.strong.save(update_fields=["role"])
+        refresh_risk_snapshot()
+        self.assertFalse(StudentRisk.objects.filter(student=self.strong).exists())
+        self.assertTrue(StudentRisk.objects.filter(student=self.weak).exists())
+
+    def test_command_and_background_job(self):
+        out = io.StringIO()
+        call_command("refresh_risk_scores", stdout=out)
+        self.assertIn("✅ 2 öğrencinin risk skoru", out.getvalue())
+        self.assertIn("weak_risk", out.getvalue())
+
+        StudentRisk.objects.all().delete()
+        self.client.force_login(self.head)
+        self.client.get(reverse("department_overview") + "?refresh_risk=1")
+        self.assertEqual(self.client.get(reverse("department_refresh_risk")).status_code, 405)
+        self.assertFalse(BackgroundJob.objects.exists())
+        resp = self.client.post(reverse("department_refresh_risk"))
+        job = BackgroundJob.objects.get(kind="risk_refresh")
+        self.assertRedirects(resp, reverse("job_detail", args=[job.id]))
+        # Bekleyen iş varken ikinci bir bölüm geneli hesaplama kuyruğa alınmaz.
+        resp = self.client.post(reverse("department_refresh_risk"))
+        self.assertRedirects(resp, reverse("job_detail", args=[job.id]))
+        self.assertEqual(BackgroundJob.objects.filter(kind="risk_refresh").count(), 1)
+        run_pending_jobs()
+        job.refresh_from_db()
+        self.assertEqual(job.status, BackgroundJob.STATUS_DONE)
+        resp = self.client.get(reverse("department_overview"))
+        self.assertEqual(resp.context["high_risk_count"], 1)
+        self.assertEqual([risk.student for risk in resp.context["at_risk"]], [self.weak])
+
+    def test_advisor_pages_show_snapshot_and_course_threshold(self):
+        refresh_risk_snapshot()
+        self.client.force_login(self.advisor)
+        resp = self.client.get(reverse("advisor_student_detail", args=[self.strong.id]))
+        self.assertFalse(resp.context["course_avgs"][0]["at_risk"])
+        resp = self.client.get(reverse("advisor_student_detail", args=[self.weak.id]))
+        # 65 varsayılan eşiği (60) geçer ama dersin kendi eşiği 70'tir.
+        self.assertTrue(resp.context["course_avgs"][0]["at_risk"])
+        self.assertEqual(resp.context["risk"].level, StudentRisk.LEVEL_HIGH)
+        self.assertContains(resp, "Erken Uyari")
+        resp = self.client.get(reverse("advisor_students"))
+        self.assertContains(resp, "Risk: Yüksek")
+        self.assertEqual([risk.student for risk in resp.context["at_risk"]], [self.weak])
+
+
 def _make_access_test(user_attr, url_func, expected_status):
     def _test(self):
         self.client.force_login(getattr(self, user_attr))
@@ -1280,6 +2756,7 @@ ACCESS_MATRIX = [
     ("export_exam_scores_csv", "teacher", lambda self: reverse("export_exam_scores_csv", args=[self.exam.id]), 200),
     ("manage_exam_scores", "teacher", lambda self: reverse("manage_exam_scores", args=[self.exam.id]), 200),
     ("manage_exam_scores_mobile", "teacher", lambda self: reverse("manage_exam_scores_mobile", args=[self.exam.id]), 200),
+    ("exam_scores_qr", "teacher", lambda self: reverse("exam_scores_qr", args=[self.exam.id]), 200),
     ("exam_detail", "teacher", lambda self: reverse("exam_detail", args=[self.exam.id]), 200),
     ("add_exam", "teacher", lambda self: reverse("add_exam", args=[self.course.id]), 200),
     ("add_lo", "teacher", lambda self: reverse("add_lo", args=[self.course.id]), 200),
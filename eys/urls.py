@@ -1,70 +1,77 @@
 from django.urls import path
-from . import views
+from .views import lazy
 
 urlpatterns = [
-    path('', views.home, name='home'),
-    path('login/', views.user_login, name='login'),
-    path('logout/', views.user_logout, name='logout'),
-    path('change-password/', views.change_password, name='change_password'),
-    path('upload-profile-picture/', views.upload_profile_picture, name='upload_profile_picture'),
+    path('', lazy('accounts.home'), name='home'),
+    path('login/', lazy('accounts.user_login'), name='login'),
+    path('logout/', lazy('accounts.user_logout'), name='logout'),
+    path('change-password/', lazy('accounts.change_password'), name='change_password'),
+    path('upload-profile-picture/', lazy('accounts.upload_profile_picture'), name='upload_profile_picture'),
 
-    path('student/dashboard/', views.student_dashboard, name='student_dashboard'),
-    path('student/courses/', views.student_courses, name='student_courses'),
-    path('student/course/<int:course_id>/', views.student_course_detail, name='student_course_detail'),
-    path('student/calendar/', views.student_calendar, name='student_calendar'),
-    path('student/announcements/', views.student_announcements, name='student_announcements'),
-    path('student/profile/', views.student_profile, name='student_profile'),
-    path('student/assignments/', views.student_assignments, name='student_assignments'),
-    path('student/assignment/<int:assignment_id>/', views.student_assignment_detail, name='student_assignment_detail'),
-    path('student/materials/', views.student_materials, name='student_materials'),
+    path('student/dashboard/', lazy('student.student_dashboard'), name='student_dashboard'),
+    path('student/courses/', lazy('student.student_courses'), name='student_courses'),
+    path('student/course/<int:course_id>/', lazy('student.student_course_detail'), name='student_course_detail'),
+    path('student/calendar/', lazy('student.student_calendar'), name='student_calendar'),
+    path('student/announcements/', lazy('student.student_announcements'), name='student_announcements'),
+    path('student/profile/', lazy('student.student_profile'), name='student_profile'),
+    path('student/assignments/', lazy('student.student_assignments'), name='student_assignments'),
+    path('student/assignment/<int:assignment_id>/', lazy('student.student_assignment_detail'), name='student_assignment_detail'),
+    path('student/materials/', lazy('student.student_materials'), name='student_materials'),
 
-    path('teacher/dashboard/', views.teacher_dashboard, name='teacher_dashboard'),
-    path('teacher/announcements/', views.teacher_announcements, name='teacher_announcements'),
-    path('teacher/announcements/new/', views.teacher_create_announcement, name='teacher_create_announcement'),
-    path('teacher/announcement/<int:ann_id>/edit/', views.edit_announcement, name='edit_announcement'),
-    path('teacher/announcement/<int:ann_id>/delete/', views.delete_announcement, name='delete_announcement'),
-    path('teacher/calendar/', views.teacher_calendar, name='teacher_calendar'),
-    path('teacher/calendar/ics/', views.teacher_calendar_ics, name='teacher_calendar_ics'),
-    path('teacher/assignments/', views.teacher_assignments, name='teacher_assignments'),
-    path('teacher/assignments/new/', views.teacher_assignment_create, name='teacher_assignment_create'),
-    path('teacher/assignment/<int:assignment_id>/', views.teacher_assignment_detail, name='teacher_assignment_detail'),
-    path('teacher/assignment/<int:assignment_id>/criteria/', views.manage_assignment_criteria, name='manage_assignment_criteria'),
-    path('teacher/assignment/<int:assignment_id>/groups/', views.manage_assignment_groups, name='manage_assignment_groups'),
-    path('teacher/assignment/<int:assignment_id>/remind/', views.send_assignment_reminders, name='send_assignment_reminders'),
-    path('teacher/assignment/<int:assignment_id>/export-csv/', views.export_submissions_csv, name='export_submissions_csv'),
-    path('teacher/assignment/<int:assignment_id>/export-zip/', views.export_submissions_zip, name='export_submissions_zip'),
-    path('teacher/exam/<int:exam_id>/remind/', views.send_exam_reminders, name='send_exam_reminders'),
-    path('teacher/exam/<int:exam_id>/export-scores/', views.export_exam_scores_csv, name='export_exam_scores_csv'),
-    path('teacher/materials/', views.teacher_materials, name='teacher_materials'),
-    path('teacher/materials/new/', views.create_material, name='create_material'),
-    path('advisor/students/', views.advisor_students, name='advisor_students'),
-    path('advisor/students/<int:student_id>/', views.advisor_student_detail, name='advisor_student_detail'),
+    path('teacher/dashboard/', lazy('teacher.teacher_dashboard'), name='teacher_dashboard'),
+    path('teacher/announcements/', lazy('announcements.teacher_announcements'), name='teacher_announcements'),
+    path('teacher/announcements/new/', lazy('announcements.teacher_create_announcement'), name='teacher_create_announcement'),
+    path('teacher/announcement/<int:ann_id>/edit/', lazy('announcements.edit_announcement'), name='edit_announcement'),
+    path('teacher/announcement/<int:ann_id>/delete/', lazy('announcements.delete_announcement'), name='delete_announcement'),
+    path('teacher/calendar/', lazy('teacher.teacher_calendar'), name='teacher_calendar'),
+    path('teacher/calendar/ics/', lazy('feeds.teacher_calendar_ics'), name='teacher_calendar_ics'),
+    path('calendar/feed/<str:token>.ics', lazy('feeds.calendar_feed'), name='calendar_feed'),
+    path('calendar/feed/reset/', lazy('feeds.reset_calendar_feed'), name='reset_calendar_feed'),
+    path('teacher/assignments/', lazy('teacher.teacher_assignments'), name='teacher_assignments'),
+    path('teacher/assignments/new/', lazy('teacher.teacher_assignment_create'), name='teacher_assignment_create'),
+    path('teacher/assignment/<int:assignment_id>/', lazy('teacher.teacher_assignment_detail'), name='teacher_assignment_detail'),
+    path('teacher/assignment/<int:assignment_id>/criteria/', lazy('teacher.manage_assignment_criteria'), name='manage_assignment_criteria'),
+    path('teacher/assignment/<int:assignment_id>/groups/', lazy('teacher.manage_assignment_groups'), name='manage_assignment_groups'),
+    path('teacher/assignment/<int:assignment_id>/remind/', lazy('notifications.send_assignment_reminders'), name='send_assignment_reminders'),
+    path('teacher/assignment/<int:assignment_id>/export-csv/', lazy('exports.export_submissions_csv'), name='export_submissions_csv'),
+    path('teacher/assignment/<int:assignment_id>/export-zip/', lazy('exports.export_submissions_zip'), name='export_submissions_zip'),
+    path('teacher/exam/<int:exam_id>/remind/', lazy('notifications.send_exam_reminders'), name='send_exam_reminders'),
+    path('teacher/exam/<int:exam_id>/export-scores/', lazy('exports.export_exam_scores_csv'), name='export_exam_scores_csv'),
+    path('teacher/materials/', lazy('teacher.teacher_materials'), name='teacher_materials'),
+    path('teacher/materials/new/', lazy('teacher.create_material'), name='create_material'),
+    path('advisor/students/', lazy('advisor.advisor_students'), name='advisor_students'),
+    path('advisor/students/<int:student_id>/', lazy('advisor.advisor_student_detail'), name='advisor_student_detail'),
 
-    path('announcement/<int:ann_id>/', views.announcement_detail, name='announcement_detail'),
-    path('notifications/', views.notifications, name='notifications'),
-    path('notifications/<int:notif_id>/read/', views.mark_notification_read, name='mark_notification_read'),
-    path('notifications/read-all/', views.mark_all_notifications_read, name='mark_all_notifications_read'),
+    path('announcement/<int:ann_id>/', lazy('announcements.announcement_detail'), name='announcement_detail'),
+    path('notifications/', lazy('notifications.notifications'), name='notifications'),
+    path('notifications/<int:notif_id>/read/', lazy('notifications.mark_notification_read'), name='mark_notification_read'),
+    path('notifications/read-all/', lazy('notifications.mark_all_notifications_read'), name='mark_all_notifications_read'),
 
-    path('search/', views.global_search, name='global_search'),
-    path('affairs/dashboard/', views.affairs_dashboard, name='affairs_dashboard'),
+    path('jobs/<int:job_id>/', lazy('exports.job_detail'), name='job_detail'),
+    path('jobs/<int:job_id>/download/', lazy('exports.job_download'), name='job_download'),
 
-    path('department/overview/', views.department_overview, name='department_overview'),
-    path('department/instructors/', views.department_instructors, name='department_instructors'),
-    path('department/courses/', views.department_courses, name='department_courses'),
-    path('department/course/<int:course_id>/', views.department_course_detail, name='department_course_detail'),
-    path('department/instructor/<int:instructor_id>/', views.department_instructor_detail, name='department_instructor_detail'),
+    path('search/', lazy('search.global_search'), name='global_search'),
+    path('affairs/dashboard/', lazy('department.affairs_dashboard'), name='affairs_dashboard'),
 
-    path('teacher/courses/', views.teacher_courses, name='teacher_courses'),
-    path('teacher/course/<int:course_id>/', views.course_detail, name='course_detail'),
-    path('teacher/course/<int:course_id>/thresholds/', views.edit_course_threshold, name='edit_course_threshold'),
+    path('department/overview/', lazy('department.department_overview'), name='department_overview'),
+    path('department/overview/refresh-risk/', lazy('department.department_refresh_risk'), name='department_refresh_risk'),
+    path('department/instructors/', lazy('department.department_instructors'), name='department_instructors'),
+    path('department/courses/', lazy('department.department_courses'), name='department_courses'),
+    path('department/course/<int:course_id>/', lazy('department.department_course_detail'), name='department_course_detail'),
+    path('department/instructor/<int:instructor_id>/', lazy('department.department_instructor_detail'), name='department_instructor_detail'),
 
-    path('teacher/course/<int:course_id>/add-lo/', views.add_lo, name='add_lo'),
-    path('teacher/course/<int:course_id>/add-exam/', views.add_exam, name='add_exam'),
-    path('teacher/exam/<int:exam_id>/', views.exam_detail, name='exam_detail'),
-    path('teacher/exam/<int:exam_id>/add-lo-weight/', views.add_exam_lo_weight, name='add_exam_lo_weight'),
-    path('teacher/lo/<int:lo_id>/add-po-weight/', views.add_lo_po_weight, name='add_lo_po_weight'),
-    path('teacher/lo/<int:lo_id>/auto-po-weight/', views.auto_distribute_lo_po, name='auto_distribute_lo_po'),
-    path('teacher/exam/<int:exam_id>/grades/', views.manage_exam_scores, name='manage_exam_scores'),
-    path('teacher/exam/<int:exam_id>/grades/mobile/', views.manage_exam_scores_mobile, name='manage_exam_scores_mobile'),
-    path('submission/<int:submission_id>/grade/', views.grade_submission, name='grade_submission'),
+    path('teacher/courses/', lazy('teacher.teacher_courses'), name='teacher_courses'),
+    path('teacher/course/<int:course_id>/', lazy('teacher.course_detail'), name='course_detail'),
+    path('teacher/course/<int:course_id>/thresholds/', lazy('teacher.edit_course_threshold'), name='edit_course_threshold'),
+
+    path('teacher/course/<int:course_id>/add-lo/', lazy('teacher.add_lo'), name='add_lo'),
+    path('teacher/course/<int:course_id>/add-exam/', lazy('teacher.add_exam'), name='add_exam'),
+    path('teacher/exam/<int:exam_id>/', lazy('teacher.exam_detail'), name='exam_detail'),
+    path('teacher/exam/<int:exam_id>/add-lo-weight/', lazy('teacher.add_exam_lo_weight'), name='add_exam_lo_weight'),
+    path('teacher/lo/<int:lo_id>/add-po-weight/', lazy('teacher.add_lo_po_weight'), name='add_lo_po_weight'),
+    path('teacher/lo/<int:lo_id>/auto-po-weight/', lazy('teacher.auto_distribute_lo_po'), name='auto_distribute_lo_po'),
+    path('teacher/exam/<int:exam_id>/grades/', lazy('grading.manage_exam_scores'), name='manage_exam_scores'),
+    path('teacher/exam/<int:exam_id>/grades/mobile/', lazy('grading.manage_exam_scores_mobile'), name='manage_exam_scores_mobile'),
+    path('teacher/exam/<int:exam_id>/grades/qr.png', lazy('grading.exam_scores_qr'), name='exam_scores_qr'),
+    path('submission/<int:submission_id>/grade/', lazy('grading.grade_submission'), name='grade_submission'),
 ]
@@ -0,0 +1,25 @@
+"""
+View'lar alan bazında modüllere ayrılmıştır: accounts, student, teacher,
+grading, announcements, department, advisor, exports, notifications, search,
+feeds;
+ortak yardımcılar common'dadır.
+
+URLconf view'lara lazy() üzerinden bağlanır; bir modül (ve onun çektiği CSV,
+ZIP, QR gibi bağımlılıklar) yalnızca o alandaki bir sayfa ilk kez
+istendiğinde içe aktarılır.
+"""
+from importlib import import_module
+
+
+def lazy(path):
+    """'modül.view' yolunu, ilk çağrıda eys.views.<modül> modülünü yükleyen bir view'a çevirir."""
+    module_name, view_name = path.rsplit(".", 1)
+    module_name = f"{__name__}.{module_name}"
+
+    def view(request, *args, **kwargs):
+        return getattr(import_module(module_name), view_name)(request, *args, **kwargs)
+
+    # URLPattern.lookup_str ve hata sayfaları gerçek view'ın yolunu göstersin; modül yüklenmeden.
+    view.__module__ = module_name
+    view.__name__ = view.__qualname__ = view_name
+    return view
@@ -0,0 +1,112 @@
+"""
+Giriş, çıkış, parola/profil fotoğrafı ve rol bazlı ana sayfa yönlendirmesi.
+"""
+from django.shortcuts import render, redirect
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.contrib.auth import authenticate, login, logout
+
+from ..forms import PasswordChangeForm, ProfilePictureForm
+
+
+def user_login(request):
+    if request.method == "POST":
+        username = request.POST.get("username", "").strip()
+        password = request.POST.get("password", "").strip()
+        
+        user = authenticate(request, username=username, password=password)
+        
+        if user is not None:
+            login(request, user)
+            
+            # Role Check
+            if not user.role:
+                 messages.error(request, "Bu kullanıcının yetki rolü atanmamış.")
+                 return render(request, "eys/login.html", {"hide_navbar": True})
+                 
+            role_name = user.role.name
+            if role_name == "Student":
+                return redirect("student_dashboard")
+            elif role_name in ["Regular Instructor", "Advisor Instructor", "Head of Department"]:
+                return redirect("teacher_dashboard")
+            elif role_name == "Student Affairs":
+                return redirect("affairs_dashboard")
+            else:
+                messages.error(request, f"Bilinmeyen rol: {role_name}. Lütfen yöneticiyle iletişime geçin.")
+                # Yine de login kalsın mı? Güvenlik gereği logout yapılabilir.
+                # logout(request)
+        else:
+            messages.error(request, "Kullanıcı adı veya parola hatalı.")
+            
+    return render(request, "eys/login.html", {"hide_navbar": True})
+
+
+def user_logout(request):
+    logout(request)
+    return redirect("login")
+
+
+def change_password(request):
+    """Password change for unauthenticated users"""
+    if request.method == "POST":
+        form = PasswordChangeForm(request.POST)
+        if form.is_valid():
+            username = form.cleaned_data.get("username")
+            old_password = form.cleaned_data.get("old_password")
+            new_password = form.cleaned_data.get("new_password")
+            
+            # Authenticate user with old password
+            user = authenticate(request, username=username, password=old_password)
+            if user is not None:
+                # Set new password
+                user.set_password(new_password)
+                user.save()
+                messages.success(request, "Parolanız başarıyla değiştirildi. Yeni parolanızla giriş yapabilirsiniz.")
+                return redirect("login")
+            else:
+                messages.error(request, "Kullanıcı adı veya mevcut parola hatalı.")
+    else:
+        form = PasswordChangeForm()
+    
+    return render(request, "eys/change_password.html", {"hide_navbar": True, "form": form})
+
+
+@login_required
+def upload_profile_picture(request):
+    """Upload or update user profile picture"""
+    if request.method == "POST":
+        form = ProfilePictureForm(request.POST, request.FILES, instance=request.user)
+        if form.is_valid():
+            # Validate file size (max 5MB)
+            profile_picture = form.cleaned_data.get('profile_picture')
+            if profile_picture:
+                if profile_picture.size > 5 * 1024 * 1024:  # 5MB
+                    messages.error(request, "Dosya boyutu 5MB'dan büyük olamaz.")
+                else:
+                    form.save()
+                    messages.success(request, "Profil fotoğrafınız başarıyla güncellendi.")
+        else:
+            messages.error(request, "Profil fotoğrafı yüklenirken bir hata oluştu.")
+    
+    # Redirect back to the previous page or home
+    return redirect(request.META.get('HTTP_REFERER', 'home'))
+
+
+@login_required
+def settings_view(request):
+    """Settings page for user preferences"""
+    if request.method == "POST":
+        dark_mode = request.POST.get('dark_mode') == 'on'
+        # Since dark_mode is removed from the model, we can store it in the session
+        request.session['dark_mode'] = dark_mode
+        messages.success(request, "Ayarlar başarıyla kaydedildi.")
+        return redirect('settings')
+    
+    context = {
+        'dark_mode': request.session.get('dark_mode', False),
+    }
+    return render(request, "eys/settings.html", context)
+
+
+def home(request):
+    return render(request, "eys/home.html")
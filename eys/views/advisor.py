@@ -0,0 +1,101 @@
+"""
+Danışman öğretim elemanının öğrenci listesi ve öğrenci detayı.
+"""
+from django.shortcuts import render, redirect, get_object_or_404
+from django.contrib import messages
+from django.contrib.auth import get_user_model
+from django.contrib.auth.decorators import login_required
+
+User = get_user_model()
+
+from ..analytics import StudentAnalytics
+from ..models import StudentRisk
+from ..risk import top_at_risk
+
+
+@login_required
+def advisor_students(request):
+    if not request.user.role or request.user.role.name != "Advisor Instructor":
+        messages.error(request, "Bu sayfaya erisim yetkiniz yok.")
+        return redirect("teacher_dashboard")
+
+    advisees = (
+        User.objects.filter(advisor=request.user, role__name="Student")
+        .select_related("risk")
+        .prefetch_related("courses_taken")
+        .order_by("last_name", "first_name", "username")
+    )
+
+    analytics = StudentAnalytics.load_many(advisees)
+
+    student_cards = []
+    for student in advisees:
+        snapshot = analytics[student.id]
+        course_summaries = [
+            {"code": course.code, "name": course.name, "avg_score": snapshot.course_average(course.id)}
+            for course in student.courses_taken.all()
+        ]
+        counts = snapshot.submission_counts()
+
+        student_cards.append(
+            {
+                "student": student,
+                "overall_avg": snapshot.overall_average(),
+                "courses": course_summaries,
+                "submission_total": counts["total"],
+                "submission_graded": counts["graded"],
+            }
+        )
+
+    return render(
+        request,
+        "eys/advisor_students.html",
+        {
+            "student_cards": student_cards,
+            "at_risk": top_at_risk(limit=5, advisor=request.user),
+        },
+    )
+
+
+@login_required
+def advisor_student_detail(request, student_id):
+    if not request.user.role or request.user.role.name != "Advisor Instructor":
+        messages.error(request, "Bu sayfaya erisim yetkiniz yok.")
+        return redirect("teacher_dashboard")
+
+    student = get_object_or_404(
+        User.objects.select_related("risk"),
+        id=student_id,
+        role__name="Student",
+        advisor=request.user,
+    )
+
+    if request.method == "POST":
+        note = (request.POST.get("advisor_note") or "").strip()
+        student.advisor_note = note
+        student.save(update_fields=["advisor_note"])
+        messages.success(request, "Danisman notu guncellendi.")
+        return redirect("advisor_student_detail", student_id=student.id)
+
+    analytics = StudentAnalytics.load(student)
+    try:
+        risk = student.risk
+    except StudentRisk.DoesNotExist:
+        risk = None
+
+    return render(
+        request,
+        "eys/advisor_student_detail.html",
+        {
+            "student": student,
+            "course_avgs": analytics.course_averages(),
+            "risk": risk,
+            "exam_results": analytics.exam_results,
+            "submissions": analytics.submissions,
+            "recent_exam_results": analytics.recent_exam_results(),
+            "recent_assignment_results": analytics.recent_assignment_results(),
+            "buckets": analytics.histogram(),
+            "overdue_assignments": analytics.overdue_assignments(),
+            "late_submissions": analytics.late_submissions(),
+        },
+    )
@@ -0,0 +1,168 @@
+"""
+Duyuru oluşturma, düzenleme, silme, listeleme ve detay/yorumlar.
+"""
+from collections import defaultdict
+
+from django.shortcuts import render, redirect, get_object_or_404
+from django.contrib import messages
+from django.utils import timezone
+from django.urls import reverse
+from django.contrib.auth.decorators import login_required
+
+from ..models import Announcement
+from ..forms import AnnouncementForm, CommentForm
+from .common import MONTH_LABELS, TEACHER_ROLES, create_notification
+
+
+def teacher_create_announcement(request):
+    if not request.user.role or request.user.role.name not in TEACHER_ROLES:
+        messages.error(request, "Sadece öğretim elemanları duyuru oluşturabilir.")
+        return redirect("home")
+
+    recent_announcements = Announcement.objects.filter(author=request.user).order_by("-created_at")[:6]
+
+    if request.method == "POST":
+        form = AnnouncementForm(request.POST, request.FILES, user=request.user)
+        if form.is_valid():
+            ann = form.save(commit=False)
+            ann.author = request.user
+            ann.save()
+            messages.success(request, "Duyuru öğrencilerle paylaşıldı.")
+            return redirect("teacher_dashboard")
+    else:
+        form = AnnouncementForm(user=request.user)
+
+    return render(
+        request,
+        "eys/teacher_create_announcement.html",
+        {
+            "form": form,
+            "recent_announcements": recent_announcements,
+        },
+    )
+
+
+@login_required
+def edit_announcement(request, ann_id):
+    ann = get_object_or_404(Announcement, id=ann_id)
+    if ann.author != request.user:
+        messages.error(request, "Bu duyuruyu düzenleme yetkiniz yok.")
+        return redirect("teacher_dashboard")
+    
+    if request.method == "POST":
+        form = AnnouncementForm(request.POST, request.FILES, instance=ann, user=request.user)
+        if form.is_valid():
+            form.save()
+            messages.success(request, "Duyuru başarıyla güncellendi.")
+            return redirect("teacher_dashboard")
+    else:
+        form = AnnouncementForm(instance=ann, user=request.user)
+        
+    return render(request, "eys/edit_announcement.html", {"form": form, "ann": ann})
+
+
+@login_required
+def delete_announcement(request, ann_id):
+    ann = get_object_or_404(Announcement, id=ann_id)
+    if ann.author != request.user:
+        messages.error(request, "Bu duyuruyu silme yetkiniz yok.")
+        return redirect("teacher_dashboard")
+    
+    if request.method == "POST":
+        ann.delete()
+        messages.success(request, "Duyuru başarıyla silindi.")
+        return redirect("teacher_dashboard")
+    
+    return render(request, "eys/delete_announcement.html", {"ann": ann})
+
+
+@login_required
+def teacher_announcements(request):
+    if not request.user.role or request.user.role.name not in TEACHER_ROLES:
+        messages.error(request, "Bu sayfaya erişim yetkiniz yok.")
+        return redirect("home")
+
+    announcement_qs = Announcement.objects.filter(author=request.user).select_related("course").order_by("-pinned", "-created_at")
+
+    grouped = defaultdict(list)
+    for ann in announcement_qs:
+        local_created = timezone.localtime(ann.created_at)
+        date_key = local_created.date()
+        month_label = MONTH_LABELS[local_created.month - 1]
+        timestamp = f"{local_created.day} {month_label} {local_created.year} · {local_created.strftime('%H:%M')}"
+        
+        grouped[date_key].append(
+            {
+                "id": ann.id,
+                "title": ann.title,
+                "body": ann.body,
+                "attachment": ann.attachment,
+                "course_label": f"{ann.course.code} · {ann.course.name}" if ann.course else "Genel Duyuru",
+                "timestamp": timestamp,
+                "pinned": ann.pinned,
+            }
+        )
+
+    timeline = []
+    for day in sorted(grouped.keys(), reverse=True):
+        month_label = MONTH_LABELS[day.month - 1]
+        timeline.append(
+            {
+                "date_label": f"{day.day} {month_label} {day.year}",
+                "items": grouped[day],
+            }
+        )
+
+    return render(
+        request,
+        "eys/teacher_announcements.html",
+        {
+            "timeline": timeline,
+            "total_count": announcement_qs.count(),
+        },
+    )
+
+
+@login_required
+def announcement_detail(request, ann_id):
+    announcement = get_object_or_404(Announcement, id=ann_id)
+    comments = announcement.comments.select_related('author', 'author__role').all()
+
+    # Yetkilendirme: Öğrenciyse, kendi dersi mi veya genel duyuru mu?
+    if request.user.role.name == 'Student':
+        if announcement.course and announcement.course not in request.user.courses_taken.all():
+            messages.error(request, "Bu duyuruyu görüntüleme yetkiniz yok.")
+            return redirect('student_dashboard')
+    
+    # Yetkilendirme: Öğretmense, kendi dersi mi veya kendi duyurusu mu?
+    elif request.user.role.name in TEACHER_ROLES:
+        if announcement.course and announcement.course.instructor != request.user:
+            if announcement.author != request.user:
+                 messages.error(request, "Bu duyuruyu görüntüleme yetkiniz yok.")
+                 return redirect('teacher_dashboard')
+
+    if request.method == 'POST':
+        comment_form = CommentForm(request.POST)
+        if comment_form.is_valid():
+            new_comment = comment_form.save(commit=False)
+            new_comment.announcement = announcement
+            new_comment.author = request.user
+            new_comment.save()
+            if announcement.author and announcement.author != request.user:
+                url = reverse("announcement_detail", args=[announcement.id])
+                create_notification(
+                    announcement.author,
+                    "announcement_comment",
+                    f"{request.user.username} duyuruna yorum yaptı",
+                    url=url,
+                )
+            messages.success(request, "Yorumunuz eklendi.")
+            return redirect('announcement_detail', ann_id=announcement.id)
+    else:
+        comment_form = CommentForm()
+
+    return render(request, 'eys/announcement_detail.html', {
+        'announcement': announcement,
+        'comments': comments,
+        'comment_form': comment_form,
+    })
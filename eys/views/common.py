@@ -0,0 +1,157 @@
+"""
+Birden fazla view modülünün kullandığı sabitler ve yardımcılar.
+"""
+from datetime import timedelta
+from functools import lru_cache
+
+from django.utils import timezone
+
+from ..models import CourseThreshold, Notification
+
+
+DAY_LABELS = [
+    "Pazartesi",
+    "Salı",
+    "Çarşamba",
+    "Perşembe",
+    "Cuma",
+    "Cumartesi",
+    "Pazar",
+]
+
+MONTH_LABELS = [
+    "Ocak",
+    "Şubat",
+    "Mart",
+    "Nisan",
+    "Mayıs",
+    "Haziran",
+    "Temmuz",
+    "Ağustos",
+    "Eylül",
+    "Ekim",
+    "Kasım",
+    "Aralık",
+]
+
+TEACHER_ROLES = {"Regular Instructor", "Advisor Instructor", "Head of Department"}
+
+
+def create_notification(user, kind, message, url="", payload=""):
+    if not user:
+        return
+    Notification.objects.create(
+        user=user,
+        kind=kind,
+        message=message[:255],
+        url=url or "",
+        payload=payload or "",
+    )
+
+
+def get_course_threshold(course):
+    threshold, _ = CourseThreshold.objects.get_or_create(
+        course=course,
+        defaults={
+            "stable_min": 80,
+            "watch_min": 65,
+            "pass_min": 60,
+        },
+    )
+    return threshold
+
+
+COURSE_PALETTE = (
+    "#1db954",
+    "#2459c3",
+    "#b86a00",
+    "#ff6b6b",
+    "#7d5fff",
+    "#00a8e8",
+    "#e91e63",
+    "#2ecc71",
+    "#9c27b0",
+)
+
+# (etiket, ada göre anahtar kelimeler); ilk eşleşen kazanır.
+EXAM_TYPES = (
+    ("Vize", ("vize", "midterm")),
+    ("Final", ("final",)),
+    ("Quiz", ("quiz", "kısa")),
+)
+
+
+@lru_cache(maxsize=1024)
+def course_color(code):
+    """Ders koduna göre sabit renk; kod değişmedikçe hep aynıdır."""
+    return COURSE_PALETTE[sum(ord(ch) for ch in code) % len(COURSE_PALETTE)]
+
+
+@lru_cache(maxsize=4096)
+def exam_type_label(name):
+    lowered = (name or "").lower()
+    for label, keywords in EXAM_TYPES:
+        if any(keyword in lowered for keyword in keywords):
+            return label
+    return None
+
+
+class ExamSerializer:
+    """
+    İstek boyunca kullanılan sınav kartı üreticisi. Zamana bağlı sınırlar bir
+    kez hesaplanır ve her sınav bir kez serileştirilir; aynı sınav panelin
+    birden fazla bölümünde görünse de sonuç yeniden kullanılır. Puan sınava
+    özgü olduğundan kopya üzerinde eklenir.
+    """
+
+    def __init__(self, now=None):
+        self.now = now or timezone.now()
+        self.upcoming_window = self.now + timedelta(days=3)
+        today = timezone.localtime(self.now).date()
+        self.end_of_week = today + timedelta(days=(6 - today.weekday()))
+        self._cache = {}
+
+    def __call__(self, exam, score=None):
+        data = self._cache.get(exam.id)
+        if data is None:
+            data = self._cache[exam.id] = self._serialize(exam)
+        score = score if score is not None else getattr(exam, "score", None)
+        if score is not None:
+            return dict(data, score=score)
+        return data
+
+    def _status(self, scheduled_local):
+        if not scheduled_local:
+            return "future"
+        if scheduled_local < self.now:
+            return "past"
+        if scheduled_local <= self.upcoming_window:
+            return "soon"
+        if scheduled_local.date() <= self.end_of_week:
+            return "this_week"
+        return "future"
+
+    def _serialize(self, exam):
+        scheduled_local = timezone.localtime(exam.scheduled_at) if exam.scheduled_at else None
+        return {
+            "id": exam.id,
+            "name": exam.name,
+            "course_id": exam.course_id,
+            "course_name": exam.course.name,
+            "course_code": exam.course.code,
+            "description": exam.description or "",
+            "scheduled_local": scheduled_local,
+            "scheduled_date": scheduled_local.strftime("%d.%m.%Y") if scheduled_local else None,
+            "time_label": scheduled_local.strftime("%H:%M") if scheduled_local else None,
+            "display_label": scheduled_local.strftime("%d.%m.%Y · %H:%M") if scheduled_local else "Tarih bekleniyor",
+            "status": self._status(scheduled_local),
+            "has_schedule": scheduled_local is not None,
+            "day": scheduled_local.day if scheduled_local else None,
+            "month": scheduled_local.month if scheduled_local else None,
+            "year": scheduled_local.year if scheduled_local else None,
+            "weekday_index": scheduled_local.weekday() if scheduled_local else None,
+            "score": None,
+            "course_color": course_color(exam.course.code or str(exam.course_id)),
+            "type_label": exam_type_label(exam.name),
+        }
+
@@ -0,0 +1,256 @@
+"""
+Bölüm başkanı ve öğrenci işleri sayfaları.
+"""
+from django.db.models import Avg, Count, Q, Prefetch, F, Sum
+from django.shortcuts import render, redirect, get_object_or_404
+from django.contrib import messages
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from django.contrib.auth.decorators import login_required
+from django.views.decorators.http import require_POST
+
+User = get_user_model()
+
+from ..jobs import active_job, enqueue_job
+from ..models import (
+    Course,
+    CourseStats,
+    Exam,
+    Announcement,
+    ExamResult,
+    CourseMaterial,
+    StudentRisk,
+)
+from ..risk import top_at_risk
+from ..stats import overall_average, with_stats
+from .common import MONTH_LABELS, TEACHER_ROLES
+
+
+@login_required
+def department_overview(request):
+    if not request.user.role or request.user.role.name != "Head of Department":
+        messages.error(request, "Bu sayfaya erisim yetkiniz yok.")
+        return redirect("teacher_dashboard")
+
+    total_instructors = User.objects.filter(
+        role__name__in=["Regular Instructor", "Advisor Instructor", "Head of Department"]
+    ).count()
+    avg_score = overall_average()
+
+    courses_qs = with_stats(Course.objects.all()).select_related("instructor")
+
+    critical_courses = courses_qs.filter(avg_score__lt=50).order_by("avg_score")[:6]
+    top_courses = courses_qs.filter(avg_score__isnull=False).order_by(F("avg_score").desc())[:6]
+    low_courses = courses_qs.filter(avg_score__isnull=False).order_by("avg_score")[:6]
+    high_risk_count = StudentRisk.objects.filter(level=StudentRisk.LEVEL_HIGH).count()
+
+    return render(
+        request,
+        "eys/department_overview.html",
+        {
+            "total_instructors": total_instructors,
+            "average_score": avg_score,
+            "critical_courses": critical_courses,
+            "top_courses": top_courses,
+            "low_courses": low_courses,
+            "high_risk_count": high_risk_count,
+            "at_risk": top_at_risk(limit=10),
+        },
+    )
+
+
+@login_required
+@require_POST
+def department_refresh_risk(request):
+    if not request.user.role or request.user.role.name != "Head of Department":
+        messages.error(request, "Bu sayfaya erisim yetkiniz yok.")
+        return redirect("teacher_dashboard")
+    job = active_job("risk_refresh")
+    if job is None:
+        job = enqueue_job(request.user, "risk_refresh")
+    elif job.created_by_id != request.user.id:
+        messages.info(request, "Risk skorlari zaten yenileniyor.")
+        return redirect("department_overview")
+    return redirect("job_detail", job_id=job.id)
+
+
+@login_required
+def department_instructors(request):
+    if not request.user.role or request.user.role.name != "Head of Department":
+        messages.error(request, "Bu sayfaya erisim yetkiniz yok.")
+        return redirect("teacher_dashboard")
+
+    instructors = (
+        User.objects.filter(
+            role__name__in=["Regular Instructor", "Advisor Instructor", "Head of Department"]
+        )
+        .order_by("last_name", "first_name", "username")
+        .prefetch_related(
+            Prefetch("courses_given", queryset=with_stats(Course.objects.all()).order_by("code"))
+        )
+    )
+
+    return render(
+        request,
+        "eys/department_instructors.html",
+        {"instructors": instructors},
+    )
+
+
+@login_required
+def department_courses(request):
+    if not request.user.role or request.user.role.name != "Head of Department":
+        messages.error(request, "Bu sayfaya erisim yetkiniz yok.")
+        return redirect("teacher_dashboard")
+
+    courses = with_stats(Course.objects.all()).select_related("instructor").order_by("code")
+    critical_count = CourseStats.objects.filter(avg_score__lt=50).count()
+
+    return render(
+        request,
+        "eys/department_courses.html",
+        {
+            "courses": courses,
+            "critical_count": critical_count,
+        },
+    )
+
+
+@login_required
+def department_course_detail(request, course_id):
+    if not request.user.role or request.user.role.name != "Head of Department":
+        messages.error(request, "Bu sayfaya erisim yetkiniz yok.")
+        return redirect("teacher_dashboard")
+
+    course = get_object_or_404(
+        Course.objects.select_related("instructor").prefetch_related("students"),
+        id=course_id,
+    )
+    materials = CourseMaterial.objects.filter(course=course).order_by("week", "-created_at")
+    sort = request.GET.get("sort", "date").strip().lower()
+    exams_qs = Exam.objects.filter(course=course).annotate(
+        avg_score=Avg("results__score"),
+    )
+    if sort == "score":
+        exams_qs = exams_qs.order_by("-avg_score", "scheduled_at", "id")
+    else:
+        sort = "date"
+        exams_qs = exams_qs.order_by("scheduled_at", "id")
+    exams = list(exams_qs)
+
+    student_sort = request.GET.get("student_sort", "name").strip().lower()
+    students_qs = course.students.annotate(
+        avg_score=Avg(
+            "exam_results__score",
+            filter=Q(exam_results__exam__course=course),
+        ),
+        exam_count=Count(
+            "exam_results",
+            filter=Q(exam_results__exam__course=course),
+            distinct=True,
+        ),
+    ).order_by("last_name", "first_name", "username")
+    if student_sort == "avg":
+        students_qs = students_qs.order_by(F("avg_score").desc(nulls_last=True), "last_name", "first_name")
+    else:
+        student_sort = "name"
+        students_qs = students_qs.order_by("last_name", "first_name", "username")
+    students = list(students_qs)
+
+    results = ExamResult.objects.filter(exam__course=course).select_related("exam", "student")
+    score_map = {(res.student_id, res.exam_id): res.score for res in results}
+    for student in students:
+        student.exam_scores = [
+            {
+                "exam": exam,
+                "score": score_map.get((student.id, exam.id)),
+            }
+            for exam in exams
+        ]
+
+    return render(
+        request,
+        "eys/department_course_detail.html",
+        {
+            "course": course,
+            "materials": materials,
+            "exams": exams,
+            "students": students,
+            "sort": sort,
+            "student_sort": student_sort,
+        },
+    )
+
+
+@login_required
+def department_instructor_detail(request, instructor_id):
+    if not request.user.role or request.user.role.name != "Head of Department":
+        messages.error(request, "Bu sayfaya erisim yetkiniz yok.")
+        return redirect("teacher_dashboard")
+
+    instructor = get_object_or_404(
+        User,
+        id=instructor_id,
+        role__name__in=["Regular Instructor", "Advisor Instructor", "Head of Department"],
+    )
+    courses = with_stats(instructor.courses_given.all()).order_by("code")
+    critical_only = request.GET.get("critical") == "1"
+    threshold = 50.0
+    threshold_raw = request.GET.get("threshold")
+    if threshold_raw:
+        try:
+            threshold = float(threshold_raw)
+        except ValueError:
+            threshold = 50.0
+    if critical_only:
+        courses = courses.filter(avg_score__lt=threshold)
+
+    course_ids = list(courses.values_list("id", flat=True))
+    summary = CourseStats.objects.filter(course_id__in=course_ids).aggregate(
+        avg_score=Avg("avg_score"),
+        total_exams=Sum("exam_count"),
+    )
+    # Birden fazla derse kayıtlı öğrenci bir kez sayılır; yalnızca kayıt tablosu okunur.
+    summary["total_students"] = (
+        Course.students.through.objects.filter(course_id__in=course_ids).values("user_id").distinct().count()
+    )
+    summary["total_exams"] = summary["total_exams"] or 0
+
+    return render(
+        request,
+        "eys/department_instructor_detail.html",
+        {
+            "instructor": instructor,
+            "courses": courses,
+            "summary": summary,
+            "critical_only": critical_only,
+            "threshold": threshold,
+        },
+    )
+
+
+@login_required
+def affairs_dashboard(request):
+    # İstatistikler
+    student_count = User.objects.filter(role__name='Student').count()
+    teacher_count = User.objects.filter(role__name__in=TEACHER_ROLES).count()
+    course_count = Course.objects.count()
+    
+    # Son Duyurular (Global olanlar veya hepsi)
+    recent_announcements = Announcement.objects.all().order_by('-created_at')[:5]
+    
+    # Format last login time
+    last_login = None
+    if request.user.last_login:
+        last_login_local = timezone.localtime(request.user.last_login)
+        month_label = MONTH_LABELS[last_login_local.month - 1]
+        last_login = f"{last_login_local.day} {month_label} {last_login_local.year} · {last_login_local.strftime('%H:%M')}"
+    
+    context = {
+        'student_count': student_count,
+        'teacher_count': teacher_count,
+        'course_count': course_count,
+        'recent_announcements': recent_announcements,
+        'last_login': last_login,
+    }
+    return render(request, "eys/affairs_dashboard.html", context)
@@ -0,0 +1,108 @@
+"""
+CSV/ZIP dışa aktarmaları ve arka plan işlerinin durumu/indirmesi.
+"""
+from django.db.models import Q, FilteredRelation
+from django.shortcuts import render, redirect, get_object_or_404
+from django.http import FileResponse, Http404, JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.urls import reverse
+from django.contrib.auth.decorators import login_required
+
+from ..models import Exam, Assignment, BackgroundJob
+from ..exports import QUERY_CHUNK_SIZE, stream_csv, stream_zip, submission_zip_entries
+from ..jobs import enqueue_job
+
+
+def export_exam_scores_csv(request, exam_id):
+    exam = get_object_or_404(
+        Exam.objects.select_related("course__instructor"), id=exam_id, course__instructor=request.user
+    )
+    rows = (
+        exam.course.students.annotate(
+            result=FilteredRelation("exam_results", condition=Q(exam_results__exam=exam))
+        )
+        .order_by("first_name", "last_name", "username")
+        .values_list("id", "username", "first_name", "last_name", "email", "result__score", "result__feedback")
+        .iterator(chunk_size=QUERY_CHUNK_SIZE)
+    )
+
+    def csv_rows():
+        for student_id, username, first_name, last_name, email, score, feedback in rows:
+            yield [
+                student_id,
+                username,
+                f"{first_name} {last_name}".strip(),
+                email or "",
+                score if score is not None else "",
+                feedback if score is not None else "",
+            ]
+
+    resp = StreamingHttpResponse(
+        stream_csv(["student_id", "username", "full_name", "email", "score", "feedback"], csv_rows()),
+        content_type="text/csv",
+    )
+    resp["Content-Disposition"] = f"attachment; filename=exam-{exam.id}-scores.csv"
+    return resp
+
+
+def export_submissions_csv(request, assignment_id):
+    assignment = get_object_or_404(Assignment, id=assignment_id, course__instructor=request.user)
+    rows = assignment.submissions.values_list(
+        "student__first_name", "student__last_name", "student__username", "score", "feedback", "submitted_at"
+    ).iterator(chunk_size=QUERY_CHUNK_SIZE)
+
+    def csv_rows():
+        for first_name, last_name, username, score, feedback, submitted_at in rows:
+            yield [
+                f"{first_name} {last_name}".strip() or username,
+                username,
+                score or "",
+                (feedback or "").replace("\n", " "),
+                timezone.localtime(submitted_at).strftime("%d.%m.%Y %H:%M"),
+            ]
+
+    response = StreamingHttpResponse(
+        stream_csv(["Öğrenci", "Kullanıcı adı", "Puan", "Geri bildirim", "Gönderim Tarihi"], csv_rows()),
+        content_type="text/csv",
+    )
+    response["Content-Disposition"] = f'attachment; filename="assignment-{assignment_id}-submissions.csv"'
+    return response
+
+
+@login_required
+def export_submissions_zip(request, assignment_id):
+    assignment = get_object_or_404(Assignment, id=assignment_id, course__instructor=request.user)
+    if request.method == "POST" and request.POST.get("background"):
+        job = enqueue_job(request.user, "submissions_zip", {"assignment_id": assignment.id})
+        return redirect("job_detail", job_id=job.id)
+    resp = StreamingHttpResponse(stream_zip(submission_zip_entries(assignment)), content_type="application/zip")
+    resp["Content-Disposition"] = f'attachment; filename="assignment-{assignment_id}-submissions.zip"'
+    return resp
+
+
+@login_required
+def job_detail(request, job_id):
+    job = get_object_or_404(BackgroundJob, id=job_id, created_by=request.user)
+    download_url = reverse("job_download", args=[job.id]) if job.result_file else ""
+    if request.GET.get("format") == "json":
+        return JsonResponse(
+            {
+                "id": job.id,
+                "kind": job.kind,
+                "status": job.status,
+                "message": job.result_message,
+                "error": job.error,
+                "download_url": download_url,
+            }
+        )
+    return render(request, "eys/job_detail.html", {"job": job, "download_url": download_url})
+
+
+@login_required
+def job_download(request, job_id):
+    job = get_object_or_404(BackgroundJob, id=job_id, created_by=request.user)
+    if not job.result_file:
+        raise Http404("Sonuç dosyası yok.")
+    return FileResponse(
+        job.result_file.open("rb"), as_attachment=True, filename=job.result_file.name.split("/")[-1]
+    )
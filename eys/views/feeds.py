@@ -0,0 +1,56 @@
+"""
+Takvim beslemeleri: oturumla indirilen öğretmen .ics dosyası ve tüm roller
+için gizli anahtarlı abonelik adresi.
+"""
+from django.contrib import messages
+from django.contrib.auth import get_user_model
+from django.contrib.auth.decorators import login_required
+from django.http import Http404
+from django.shortcuts import redirect
+from django.views.decorators.http import require_POST
+
+User = get_user_model()
+
+from ..ics import CalendarFeed, feed_response, reset_calendar_token
+from .common import TEACHER_ROLES
+
+
+def _course_ids(request):
+    course_ids = []
+    for raw in request.GET.getlist("course_id"):
+        try:
+            course_ids.append(int(raw))
+        except ValueError:
+            pass
+    return course_ids
+
+
+@login_required
+def teacher_calendar_ics(request):
+    feed = CalendarFeed(
+        request.user,
+        course_ids=_course_ids(request),
+        include_assignments=request.GET.get("include_assignments") == "1",
+    )
+    return feed_response(request, feed, filename="teacher-calendar.ics")
+
+
+def calendar_feed(request, token):
+    user = User.objects.select_related("role").filter(calendar_token=token, is_active=True).first()
+    if user is None:
+        raise Http404("Takvim beslemesi bulunamadı.")
+    feed = CalendarFeed(
+        user,
+        course_ids=_course_ids(request),
+        include_assignments=request.GET.get("include_assignments") != "0",
+    )
+    return feed_response(request, feed, filename="eys-calendar.ics")
+
+
+@login_required
+@require_POST
+def reset_calendar_feed(request):
+    reset_calendar_token(request.user)
+    messages.success(request, "Takvim abonelik adresi yenilendi; eski adres artik calismaz.")
+    is_teacher = request.user.role and request.user.role.name in TEACHER_ROLES
+    return redirect("teacher_calendar" if is_teacher else "student_calendar")
@@ -0,0 +1,177 @@
+"""
+Sınav notu girişi (tablo, mobil/QR, CSV içe aktarma) ve ödev değerlendirme.
+"""
+from django.shortcuts import render, redirect, get_object_or_404
+from django.contrib import messages
+from django.utils import timezone
+from django.urls import reverse
+from django.contrib.auth.decorators import login_required
+from django.http import Http404, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+
+from ..models import (
+    Exam,
+    ExamResult,
+    Submission,
+    SubmissionCriterionScore,
+)
+from ..forms import GradeSubmissionForm
+from ..grades import format_import_counts, import_exam_scores_csv, save_grade_grid
+from ..jobs import enqueue_job
+from ..qr import qr_available, qr_etag, qr_png
+from .common import create_notification
+
+QR_MAX_AGE = 30 * 24 * 60 * 60
+
+
+def manage_exam_scores(request, exam_id):
+    exam = get_object_or_404(
+        Exam.objects.select_related("course__instructor"), id=exam_id, course__instructor=request.user
+    )
+    students = exam.course.students.all().order_by("first_name", "last_name", "username")
+    existing = {
+        res.student_id: res for res in ExamResult.objects.filter(exam=exam).select_related("student")
+    }
+
+    if request.method == "POST":
+        if request.FILES.get("csv_file") and request.POST.get("background"):
+            job = enqueue_job(
+                request.user, "exam_scores_import", {"exam_id": exam.id}, input_file=request.FILES["csv_file"]
+            )
+            messages.info(request, "CSV içe aktarma arka planda çalışacak.")
+            return redirect("job_detail", job_id=job.id)
+        if request.FILES.get("csv_file"):
+            counts, errors = import_exam_scores_csv(exam, request.FILES["csv_file"], existing)
+            if errors:
+                for err in errors:
+                    messages.error(request, err)
+                messages.error(request, "Dosyada hata olduğu için hiçbir not kaydedilmedi.")
+            else:
+                messages.success(request, format_import_counts(counts))
+            return redirect("manage_exam_scores", exam_id=exam.id)
+
+        errors = save_grade_grid(
+            exam, students, existing, request.POST, "{name} için skor değeri sayı olmalı."
+        )
+        if errors:
+            for err in errors:
+                messages.error(request, err)
+        else:
+            messages.success(request, "Sınav notları güncellendi.")
+            return redirect("exam_detail", exam_id=exam.id)
+
+
+    mobile_url = request.build_absolute_uri(reverse("manage_exam_scores_mobile", args=[exam.id]))
+    qr_url = reverse("exam_scores_qr", args=[exam.id]) if qr_available() else None
+
+    student_rows = [{"student": student, "result": existing.get(student.id)} for student in students]
+
+    return render(
+        request,
+        "eys/teacher_manage_exam_scores.html",
+        {
+            "exam": exam,
+            "student_rows": student_rows,
+            "mobile_url": mobile_url,
+            "qr_url": qr_url,
+        },
+    )
+
+
+def manage_exam_scores_mobile(request, exam_id):
+    exam = get_object_or_404(
+        Exam.objects.select_related("course__instructor"), id=exam_id, course__instructor=request.user
+    )
+    students = exam.course.students.all().order_by("first_name", "last_name", "username")
+    existing = {
+        res.student_id: res for res in ExamResult.objects.filter(exam=exam).select_related("student")
+    }
+
+    if request.method == "POST":
+        errors = save_grade_grid(
+            exam, students, existing, request.POST, "{name} icin skor sayi olmali."
+        )
+        if errors:
+            for err in errors:
+                messages.error(request, err)
+        else:
+            messages.success(request, "Notlar guncellendi.")
+            return redirect("manage_exam_scores_mobile", exam_id=exam.id)
+
+    student_rows = [{"student": student, "result": existing.get(student.id)} for student in students]
+
+    return render(
+        request,
+        "eys/teacher_manage_exam_scores_mobile.html",
+        {
+            "exam": exam,
+            "student_rows": student_rows,
+        },
+    )
+
+
+@login_required
+def exam_scores_qr(request, exam_id):
+    exam = get_object_or_404(Exam.objects.only("id"), id=exam_id, course__instructor=request.user)
+    mobile_url = request.build_absolute_uri(reverse("manage_exam_scores_mobile", args=[exam.id]))
+    etag = qr_etag(mobile_url)
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        png = qr_png(mobile_url)
+        if png is None:
+            raise Http404("QR kodu üretilemedi.")
+        response = HttpResponse(png, content_type="image/png")
+    response["ETag"] = etag
+    # Görüntü yalnızca bağlantıya bağlı; oturum gerektirdiği için paylaşılan önbelleklere girmez.
+    patch_cache_control(response, private=True, max_age=QR_MAX_AGE, immutable=True)
+    return response
+
+
+@login_required
+def grade_submission(request, submission_id):
+    submission = get_object_or_404(
+        Submission.objects.select_related("assignment", "assignment__course"),
+        id=submission_id,
+    )
+    if submission.assignment.course.instructor != request.user:
+        messages.error(request, "Bu teslimi notlama yetkiniz yok.")
+        return redirect("home")
+
+    criteria = list(submission.assignment.criteria.all())
+    existing_scores = {
+        sc.criterion_id: sc for sc in SubmissionCriterionScore.objects.filter(submission=submission)
+    }
+    if request.method == "POST":
+        form = GradeSubmissionForm(request.POST, instance=submission, criteria=criteria)
+        if form.is_valid():
+            graded = form.save(commit=False)
+            graded.graded_by = request.user
+            graded.graded_at = timezone.now()
+            graded.save()
+            # Kriter bazlı puanları kaydet
+            for crit in criteria:
+                score_val = form.cleaned_data.get(f"criterion_{crit.id}")
+                feedback_val = form.cleaned_data.get(f"criterion_{crit.id}_feedback")
+                if score_val is None:
+                    continue
+                SubmissionCriterionScore.objects.update_or_create(
+                    submission=submission,
+                    criterion=crit,
+                    defaults={"score": score_val, "feedback": feedback_val or ""},
+                )
+            url = reverse("student_assignment_detail", args=[submission.assignment.id])
+            create_notification(
+                submission.student,
+                "submission_graded",
+                f"{submission.assignment.title} ödevin notlandı",
+                url=url,
+            )
+            messages.success(request, "Puan güncellendi.")
+            return redirect("teacher_assignment_detail", assignment_id=submission.assignment.id)
+    else:
+        form = GradeSubmissionForm(instance=submission, criteria=criteria, existing_scores=existing_scores)
+    return render(
+        request,
+        "eys/grade_submission.html",
+        {"form": form, "submission": submission, "criteria": criteria},
+    )
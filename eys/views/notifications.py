@@ -0,0 +1,70 @@
+"""
+Bildirim listesi, okundu işaretleme ve toplu hatırlatma gönderimi.
+"""
+from django.shortcuts import render, redirect, get_object_or_404
+from django.contrib import messages
+from django.utils import timezone
+from django.contrib.auth.decorators import login_required
+
+from ..models import Exam, Assignment, Notification
+from ..context_processors import invalidate_navbar
+from ..jobs import enqueue_job
+from ..notifications import inbox_page, send_assignment_reminders_for, send_exam_reminders_for
+
+
+@login_required
+def notifications(request):
+    unread_only = bool(request.GET.get("unread"))
+    cursor = request.GET.get("cursor")
+    notifs, next_cursor = inbox_page(request.user, cursor=cursor, unread_only=unread_only)
+    return render(
+        request,
+        "eys/notifications.html",
+        {
+            "notifications": notifs,
+            "next_cursor": next_cursor,
+            "is_first_page": not cursor,
+            "unread_only": unread_only,
+        },
+    )
+
+
+@login_required
+def mark_notification_read(request, notif_id):
+    notif = get_object_or_404(Notification, id=notif_id, user=request.user)
+    if not notif.is_read:
+        notif.is_read = True
+        notif.read_at = timezone.now()
+        notif.save(update_fields=["is_read", "read_at"])
+    if notif.url:
+        return redirect(notif.url)
+    return redirect("notifications")
+
+
+@login_required
+def mark_all_notifications_read(request):
+    Notification.objects.filter(user=request.user, is_read=False).update(is_read=True, read_at=timezone.now())
+    invalidate_navbar([request.user.id])
+    return redirect("notifications")
+
+
+@login_required
+def send_assignment_reminders(request, assignment_id):
+    assignment = get_object_or_404(Assignment, id=assignment_id, course__instructor=request.user)
+    if request.method == "POST" and request.POST.get("background"):
+        job = enqueue_job(request.user, "assignment_reminders", {"assignment_id": assignment.id})
+        return redirect("job_detail", job_id=job.id)
+    count = send_assignment_reminders_for(assignment)
+    messages.success(request, f"Hatirlatma gonderildi ({count} ogrenci).")
+    return redirect("teacher_assignment_detail", assignment_id=assignment.id)
+
+
+@login_required
+def send_exam_reminders(request, exam_id):
+    exam = get_object_or_404(Exam, id=exam_id, course__instructor=request.user)
+    if request.method == "POST" and request.POST.get("background"):
+        job = enqueue_job(request.user, "exam_reminders", {"exam_id": exam.id})
+        return redirect("job_detail", job_id=job.id)
+    count = send_exam_reminders_for(exam)
+    messages.success(request, f"Sinav hatirlatmasi gonderildi ({count} ogrenci).")
+    return redirect("teacher_dashboard")
@@ -0,0 +1,31 @@
+"""
+Küresel arama sayfası.
+"""
+from django.shortcuts import render, redirect
+from django.contrib import messages
+
+from ..search import scoped_querysets, search
+
+
+def global_search(request):
+    if not request.user.is_authenticated:
+        messages.info(request, "Arama yapabilmek için giriş yapmalısın.")
+        return redirect("login")
+
+    query = request.GET.get("q", "").strip()
+    role_name = request.user.role.name if getattr(request.user, "role", None) else None
+    results = {}
+    if query:
+        scoped, course_ids = scoped_querysets(request.user, role_name)
+        results = search(query, scoped, course_ids)
+
+    context = {
+        "query": query,
+        "results_courses": results.get("course", []),
+        "results_exams": results.get("exam", []),
+        "results_announcements": results.get("announcement", []),
+        "results_materials": results.get("material", []),
+        "results_assignments": results.get("assignment", []),
+        "role_name": role_name,
+    }
+    return render(request, "eys/global_search.html", context)
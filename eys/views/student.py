@@ -0,0 +1,511 @@
+"""
+Öğrenci paneli, dersler, takvim, duyurular, materyaller ve ödevler.
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db.models import Q
+from django.shortcuts import render, redirect, get_object_or_404
+from django.contrib import messages
+from django.contrib.auth import update_session_auth_hash
+from django.utils import timezone
+from django.urls import reverse
+from django.contrib.auth.decorators import login_required
+
+from ..models import (
+    Course,
+    LearningOutcome,
+    Exam,
+    ProgrammingOutcome,
+    Announcement,
+    ExamResult,
+    Assignment,
+    Submission,
+    SubmissionAttachment,
+    CourseMaterial,
+)
+from ..forms import ProfileUpdateForm, SubmissionForm
+from ..calendars import (
+    WEEKDAY_LABELS,
+    exams_between,
+    group_by_date,
+    has_events,
+    month_grid,
+    month_window,
+    shift_month,
+    upcoming_exams,
+)
+from ..dashboard import StudentDashboardData
+from ..ics import ensure_calendar_token
+from ..outcomes import OutcomeEngine, stored_course_outcomes
+from .common import DAY_LABELS, MONTH_LABELS, ExamSerializer, create_notification
+
+
+def student_dashboard(request):
+    data = StudentDashboardData.load(request.user)
+    now = timezone.now()
+
+    lo_success_data = [{"label": label, "percent": percent} for label, percent in data.lo_success()]
+    if not lo_success_data:
+        lo_success_data = [
+            {"label": "LO 1", "percent": 80},
+            {"label": "LO 2", "percent": 65},
+            {"label": "LO 3", "percent": 92},
+        ]
+
+    # Her sınav bir kez serileştirilir; bölümler aynı kartları paylaşır.
+    serialize = ExamSerializer(now)
+    exam_results = [serialize(exam, score=data.results.get(exam.id)) for exam in data.latest_exams()]
+    upcoming_exams = [serialize(exam) for exam in data.upcoming_exams(now)]
+
+    # Sınavlar tarih sırasında olduğundan ilk dört gün bulununca durulur.
+    calendar_buckets = defaultdict(list)
+    for exam in data.scheduled_exams:
+        card = serialize(exam)
+        day = card["scheduled_local"].date()
+        if day not in calendar_buckets and len(calendar_buckets) == 4:
+            break
+        calendar_buckets[day].append(card)
+
+    calendar_days = []
+    for day in sorted(calendar_buckets.keys()):
+        month_label = MONTH_LABELS[day.month - 1]
+        day_label = DAY_LABELS[day.weekday()]
+        calendar_days.append(
+            {
+                "date_label": f"{day.day} {month_label} {day.year}",
+                "day_label": day_label,
+                "items": calendar_buckets[day],
+            }
+        )
+
+    announcement_cards = []
+    for ann in data.announcements:
+        local_created = timezone.localtime(ann.created_at)
+        month_label = MONTH_LABELS[local_created.month - 1]
+        created_label = f"{local_created.day} {month_label} {local_created.year} · {local_created.strftime('%H:%M')}"
+        author_name = (
+            ann.author.get_full_name()
+            if ann.author and ann.author.get_full_name()
+            else getattr(ann.author, "username", "Sistem")
+        )
+        announcement_cards.append(
+            {
+                "id": ann.id,
+                "title": ann.title,
+                "body": ann.body,
+                "attachment": ann.attachment,
+                "meta": f"{author_name} • {created_label}",
+                "course_label": f"{ann.course.code} · {ann.course.name}"
+                if ann.course
+                else "Genel Duyuru",
+            }
+        )
+    if not announcement_cards:
+        announcement_cards = [
+            {
+                "id": None,
+                "title": "Henüz duyuru yok",
+                "meta": "Takipte kal",
+                "body": "Öğretim elemanlarınız duyuru paylaştığında burada göreceksin.",
+                "course_label": "",
+                "attachment": None,
+            }
+        ]
+
+    # Format last login time
+    last_login = None
+    if request.user.last_login:
+        last_login_local = timezone.localtime(request.user.last_login)
+        month_label = MONTH_LABELS[last_login_local.month - 1]
+        last_login = f"{last_login_local.day} {month_label} {last_login_local.year} · {last_login_local.strftime('%H:%M')}"
+    
+    return render(
+        request,
+        "eys/student_dashboard.html",
+        {
+            "course_count": len(data.course_ids),
+            "lo_total": len(data.learning_outcomes),
+            "exam_total": len(data.exams),
+            "lo_success_data": lo_success_data,
+            "exam_results": exam_results,
+            "upcoming_exams": upcoming_exams,
+            "calendar_days": calendar_days,
+            "announcement_cards": announcement_cards,
+            "last_login": last_login,
+        },
+    )
+
+
+def student_courses(request):
+    courses_qs = (
+        request.user.courses_taken.all()
+        .select_related("instructor")
+        .prefetch_related("learningoutcome_set", "exam_set", "students")
+    )
+    courses = list(courses_qs)
+    now = timezone.now()
+    serialize = ExamSerializer(now)
+
+    for course in courses:
+        serialized_next = None
+        exam_list = sorted(
+            [exam for exam in course.exam_set.all() if exam.scheduled_at],
+            key=lambda exam: exam.scheduled_at,
+        )
+        if exam_list:
+            upcoming = [exam for exam in exam_list if exam.scheduled_at >= now]
+            next_exam = upcoming[0] if upcoming else exam_list[0]
+            serialized_next = serialize(next_exam)
+        course.next_exam_card = serialized_next
+        course.student_total = course.students.count()
+
+    return render(request, "eys/student_courses.html", {"courses": courses})
+
+
+def student_course_detail(request, course_id):
+    course = get_object_or_404(
+        Course.objects.select_related("instructor"), id=course_id, students=request.user
+    )
+    los = LearningOutcome.objects.filter(course=course).prefetch_related(
+        "examloweight_set__exam",
+        "po_weights__programming_outcome",
+    )
+    exams = (
+        Exam.objects.filter(course=course)
+        .select_related("course")
+        .prefetch_related("examloweight_set__learning_outcome")
+        .order_by("scheduled_at", "id")
+    )
+    now = timezone.now()
+    student_result_map = {
+        res.exam_id: res.score
+        for res in ExamResult.objects.filter(student=request.user, exam__in=exams)
+    }
+    serialize = ExamSerializer(now)
+    exam_cards = [serialize(exam, score=student_result_map.get(exam.id)) for exam in exams]
+    los = list(los)
+    # Skorlar StudentOutcomeScore'dan okunur; motor yalnızca ağırlık kapsamı için.
+    lo_matrix, po_matrix = stored_course_outcomes(course.id, [request.user.id])
+    engine = OutcomeEngine.from_learning_outcomes(los)
+    # Öğrenci ekranlarında toplamı 0 olan LO skoru gösterilmez.
+    lo_scores = {
+        lo_id: score for lo_id, score in lo_matrix.get(request.user.id, {}).items() if score > 0
+    }
+    for lo in los:
+        lo.student_score = lo_scores.get(lo.id)
+        lo.score_coverage = engine.lo_weight_totals[lo.id]
+    po_scores = po_matrix.get(request.user.id, {})
+    po_coverage = engine.po_coverage(lo_scores)
+
+    po_cards = []
+    for po in ProgrammingOutcome.objects.filter(id__in=engine.po_ids).order_by("code", "id"):
+        total_weight = po_coverage.get(po.id, Decimal("0"))
+        display_score = po_scores.get(po.id) if total_weight > 0 else None
+        po_cards.append(
+            {
+                "code": po.code,
+                "title": po.title,
+                "description": po.description,
+                "score": display_score,
+                "coverage": total_weight,
+            }
+        )
+
+    context = {
+        "course": course,
+        "los": los,
+        "exams": exams,
+        "exam_cards": exam_cards,
+        "po_cards": po_cards,
+        "student_count": course.students.count(),
+        "term_label": getattr(course, "term", None) or "Belirtilmedi",
+        "instructor_name": course.instructor.get_full_name()
+        if course.instructor and course.instructor.get_full_name()
+        else getattr(course.instructor, "username", "Atanmadı"),
+    }
+    return render(request, "eys/student_course_detail.html", context)
+
+
+def student_announcements(request):
+    courses = request.user.courses_taken.all()
+    show_pinned_only = request.GET.get("pinned") == "1"
+    base_qs = Announcement.objects.filter(Q(course__in=courses) | Q(course__isnull=True))
+    if show_pinned_only:
+        base_qs = base_qs.filter(pinned=True)
+    announcement_qs = (
+        base_qs.select_related("course", "author").order_by("-pinned", "-created_at")
+    )
+
+    grouped = defaultdict(list)
+    for ann in announcement_qs:
+        local_created = timezone.localtime(ann.created_at)
+        date_key = local_created.date()
+        month_label = MONTH_LABELS[local_created.month - 1]
+        timestamp = f"{local_created.day} {month_label} {local_created.year} · {local_created.strftime('%H:%M')}"
+        author_name = (
+            ann.author.get_full_name()
+            if ann.author and ann.author.get_full_name()
+            else getattr(ann.author, "username", "Sistem")
+        )
+        grouped[date_key].append(
+            {
+                "id": ann.id,
+                "title": ann.title,
+                "body": ann.body,
+                "attachment": ann.attachment,
+                "course_label": f"{ann.course.code} · {ann.course.name}" if ann.course else "Genel Duyuru",
+                "timestamp": timestamp,
+                "author_name": author_name,
+                "author_initials": author_name[:2].upper(),
+            }
+        )
+
+    timeline = []
+    for day in sorted(grouped.keys(), reverse=True):
+        month_label = MONTH_LABELS[day.month - 1]
+        timeline.append(
+            {
+                "date_label": f"{day.day} {month_label} {day.year}",
+                "items": grouped[day],
+            }
+        )
+
+    return render(
+        request,
+        "eys/student_announcements.html",
+        {
+            "timeline": timeline,
+            "total_count": announcement_qs.count(),
+            "show_pinned_only": show_pinned_only,
+        },
+    )
+
+
+def student_profile(request):
+    if not request.user.is_authenticated:
+        return redirect("login")
+    if not request.user.role or request.user.role.name != "Student":
+        messages.error(request, "Bu alan yalnızca öğrenciler içindir.")
+        return redirect("home")
+
+    initial_data = {
+        "first_name": request.user.first_name,
+        "last_name": request.user.last_name,
+        "email": request.user.email,
+    }
+
+    if request.method == "POST":
+        form = ProfileUpdateForm(request.POST, instance=request.user)
+        if form.is_valid():
+            user = form.save()
+            new_password = form.cleaned_data.get("new_password")
+            if new_password:
+                user.set_password(new_password)
+                user.save()
+                update_session_auth_hash(request, user)
+            messages.success(request, "Profil bilgilerin güncellendi.")
+            return redirect("student_profile")
+    else:
+        form = ProfileUpdateForm(initial=initial_data, instance=request.user)
+
+    last_login = (
+        timezone.localtime(request.user.last_login).strftime("%d.%m.%Y · %H:%M")
+        if request.user.last_login
+        else "Henüz giriş yapılmadı"
+    )
+    joined_date = timezone.localtime(request.user.date_joined).strftime("%d.%m.%Y")
+
+    role_name = request.user.role.name if request.user.role else "Tanimsiz"
+    advisor = request.user.advisor
+    advisor_name = None
+    advisor_email = None
+    advisor_username = None
+    if advisor:
+        advisor_name = advisor.get_full_name() or advisor.username
+        advisor_email = advisor.email or ""
+        advisor_username = advisor.username
+
+    role_name = request.user.role.name if request.user.role else "Tanımsız"
+
+    context = {
+        "form": form,
+        "last_login": last_login,
+        "joined_date": joined_date,
+        "role_name": role_name,
+        "username": request.user.username,
+        "advisor_name": advisor_name,
+        "advisor_email": advisor_email,
+        "advisor_username": advisor_username,
+    }
+    return render(request, "eys/student_profile.html", context)
+
+
+def student_calendar(request):
+    now = timezone.localtime(timezone.now())
+    today = timezone.localdate()
+
+    try:
+        selected_month = int(request.GET.get("month", now.month))
+        selected_year = int(request.GET.get("year", now.year))
+    except ValueError:
+        selected_month = now.month
+        selected_year = now.year
+
+    if selected_month < 1 or selected_month > 12:
+        selected_month = now.month
+    if selected_year < 1900 or selected_year > 2100:
+        selected_year = now.year
+
+    prev_year, prev_month = shift_month(selected_year, selected_month, -1)
+    next_year, next_month = shift_month(selected_year, selected_month, 1)
+
+    course_ids = list(request.user.courses_taken.values_list("id", flat=True))
+    serialize = ExamSerializer(now)
+    month_exams = exams_between(course_ids, *month_window(selected_year, selected_month))
+    calendar_rows = month_grid(
+        selected_year, selected_month, group_by_date(serialize(exam) for exam in month_exams), today
+    )
+    upcoming_list = [serialize(exam) for exam in upcoming_exams(course_ids, today)]
+
+    return render(
+        request,
+        "eys/student_calendar.html",
+        {
+            "month_name": MONTH_LABELS[selected_month - 1],
+            "selected_year": selected_year,
+            "prev_month": {"month": prev_month, "year": prev_year},
+            "next_month": {"month": next_month, "year": next_year},
+            "weekday_labels": WEEKDAY_LABELS,
+            "calendar_rows": calendar_rows,
+            "has_events": has_events(calendar_rows),
+            "upcoming_list": upcoming_list,
+            "feed_url": request.build_absolute_uri(reverse("calendar_feed", args=[ensure_calendar_token(request.user)])),
+        },
+    )
+
+
+@login_required
+def student_materials(request):
+    if not request.user.role or request.user.role.name != "Student":
+        messages.error(request, "Bu sayfaya erişim yetkiniz yok.")
+        return redirect("home")
+    courses = list(request.user.courses_taken.all())
+    if not courses:
+        return render(request, "eys/student_materials.html", {"courses": [], "materials": []})
+    try:
+        selected_course_id = int(request.GET.get("course_id", courses[0].id))
+    except ValueError:
+        selected_course_id = courses[0].id
+    selected_course = None
+    for c in courses:
+        if c.id == selected_course_id:
+            selected_course = c
+            break
+    if selected_course is None:
+        selected_course = courses[0]
+    materials_qs = CourseMaterial.objects.filter(course=selected_course).order_by("week", "-created_at")
+    weeks = sorted({m.week for m in materials_qs})
+    try:
+        selected_week = int(request.GET.get("week")) if request.GET.get("week") else None
+    except ValueError:
+        selected_week = None
+    if selected_week:
+        materials_qs = materials_qs.filter(week=selected_week)
+    return render(
+        request,
+        "eys/student_materials.html",
+        {
+            "courses": courses,
+            "selected_course": selected_course,
+            "weeks": weeks,
+            "selected_week": selected_week,
+            "materials": materials_qs,
+        },
+    )
+
+
+@login_required
+def student_assignments(request):
+    if not request.user.role or request.user.role.name != "Student":
+        messages.error(request, "Bu sayfaya erişim yetkiniz yok.")
+        return redirect("home")
+    assignments_qs = Assignment.objects.filter(course__students=request.user, published_at__isnull=False).select_related("course").distinct()
+    submission_map = {
+        sub.assignment_id: sub
+        for sub in Submission.objects.filter(assignment__in=assignments_qs, student=request.user)
+    }
+    upcoming = []
+    past = []
+    now = timezone.now()
+    for assignment in assignments_qs:
+        assignment.user_submission = submission_map.get(assignment.id)
+        assignment.status_label = "Teslim edilmedi"
+        if assignment.user_submission:
+            if assignment.user_submission.score is not None:
+                assignment.status_label = "Notlandı"
+            else:
+                assignment.status_label = "Teslim edildi"
+        target_list = upcoming if (assignment.due_at and assignment.due_at >= now) else past
+        target_list.append(assignment)
+    upcoming = sorted(upcoming, key=lambda a: a.due_at or now)
+    past = sorted(past, key=lambda a: a.due_at or now, reverse=True)
+    return render(request, "eys/student_assignments.html", {"upcoming": upcoming, "past": past})
+
+
+@login_required
+def student_assignment_detail(request, assignment_id):
+    assignment = get_object_or_404(
+        Assignment.objects.select_related("course", "created_by"),
+        id=assignment_id,
+        course__students=request.user,
+    )
+    submission = Submission.objects.filter(assignment=assignment, student=request.user).first()
+    user_groups = assignment.groups.filter(members=request.user)
+    initial_group = user_groups.first() if user_groups.exists() else None
+
+    if request.method == "POST":
+        form = SubmissionForm(request.POST, request.FILES, instance=submission)
+        if form.is_valid():
+            submission_obj = form.save(commit=False)
+            submission_obj.assignment = assignment
+            submission_obj.student = request.user
+            if assignment.is_group:
+                submission_obj.group = initial_group
+            now = timezone.now()
+            if assignment.due_at and now > assignment.due_at:
+                messages.error(request, "Son teslim tarihi geçtiği için gönderilemedi.")
+                return redirect("student_assignment_detail", assignment_id=assignment.id)
+            submission_obj.version = (submission.version + 1) if submission else 1
+            submission_obj.save()
+            # Çoklu dosya ekleri
+            files = request.FILES.getlist("attachments")
+            for f in files:
+                SubmissionAttachment.objects.create(
+                    submission=submission_obj,
+                    file=f,
+                    version=submission_obj.version,
+                )
+            if assignment.course.instructor:
+                url = reverse("teacher_assignment_detail", args=[assignment.id])
+                create_notification(
+                    assignment.course.instructor,
+                    "submission_received",
+                    f"{request.user.username} {assignment.title} ödevini teslim etti",
+                    url=url,
+                )
+            messages.success(request, "Gönderimin kaydedildi.")
+            return redirect("student_assignment_detail", assignment_id=assignment.id)
+    else:
+        form = SubmissionForm(instance=submission)
+
+    return render(
+        request,
+        "eys/student_assignment_detail.html",
+        {
+            "assignment": assignment,
+            "submission": submission,
+            "form": form,
+            "user_group": initial_group if assignment.is_group else None,
+        },
+    )
@@ -0,0 +1,884 @@
+"""
+Öğretim elemanı paneli, ders/LO/sınav yönetimi, takvim, ödev ve materyaller.
+"""
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+import json
+
+from django.db.models import Avg, Count, Q, Prefetch
+from django.shortcuts import render, redirect, get_object_or_404
+from django.contrib.auth import get_user_model
+from django.contrib import messages
+from django.utils import timezone
+from django.urls import reverse
+from django.contrib.auth.decorators import login_required
+
+User = get_user_model()
+
+from ..models import (
+    Course,
+    CourseStats,
+    LearningOutcome,
+    Exam,
+    ExamLOWeight,
+    ProgrammingOutcome,
+    LOPOWeight,
+    Announcement,
+    ExamResult,
+    Assignment,
+    AssignmentCriterion,
+    CourseMaterial,
+    AssignmentTemplate,
+)
+from ..calendars import (
+    WEEKDAY_LABELS,
+    exams_between,
+    group_by_date,
+    has_events,
+    month_grid,
+    month_window,
+    shift_month,
+    upcoming_exams,
+    week_days,
+    week_window,
+)
+from ..forms import (
+    LOForm,
+    ExamForm,
+    ExamLOWeightForm,
+    LOPOWeightForm,
+    AssignmentForm,
+    AssignmentCriterionForm,
+    AssignmentGroupForm,
+    CourseMaterialForm,
+    CourseThresholdForm,
+)
+from ..ics import ensure_calendar_token
+from ..notifications import notify_users
+from ..outcomes import stored_course_outcomes
+from ..stats import overall_average, with_stats
+from .common import DAY_LABELS, MONTH_LABELS, TEACHER_ROLES, ExamSerializer, get_course_threshold
+
+
+def teacher_dashboard(request):
+    if not request.user.is_authenticated:
+        return redirect("user_login")
+    courses = Course.objects.filter(instructor_id=request.user.id)
+    course_ids = courses.values_list("id", flat=True)
+    lo_total = LearningOutcome.objects.filter(course_id__in=course_ids).count()
+    exam_total = Exam.objects.filter(course_id__in=course_ids).count()
+    connection_total = ExamLOWeight.objects.filter(exam__course_id__in=course_ids).count()
+
+    now = timezone.now()
+    exams_qs = (
+        Exam.objects.filter(course_id__in=course_ids, scheduled_at__isnull=False)
+        .select_related("course")
+        .order_by("scheduled_at")
+    )
+    serialize = ExamSerializer(now)
+    serialized_exams = [serialize(exam) for exam in exams_qs]
+    upcoming_exams = [
+        data for data in serialized_exams
+        if data["scheduled_local"] and data["scheduled_local"] >= now
+    ][:5]
+
+    # Takvim verilerini hazırla
+    calendar_buckets = defaultdict(list)
+    for data in serialized_exams:
+        if data["scheduled_local"]:
+            calendar_buckets[data["scheduled_local"].date()].append(data)
+
+    calendar_days = []
+    for day in sorted(calendar_buckets.keys()):
+        month_label = MONTH_LABELS[day.month - 1]
+        day_label = DAY_LABELS[day.weekday()]
+        calendar_days.append(
+            {
+                "date_label": f"{day.day} {month_label} {day.year}",
+                "day_label": day_label,
+                "items": calendar_buckets[day],
+            }
+        )
+    calendar_days = calendar_days[:4]
+
+    announcement_qs = (
+        Announcement.objects.filter(Q(course_id__in=course_ids) | Q(author=request.user))
+        .select_related("course", "author")
+        .order_by("-created_at")[:3]
+    )
+    announcement_cards = []
+    for ann in announcement_qs:
+        local_created = timezone.localtime(ann.created_at)
+        month_label = MONTH_LABELS[local_created.month - 1]
+        created_label = f"{local_created.day} {month_label} {local_created.year} · {local_created.strftime('%H:%M')}"
+        author_name = (
+            ann.author.get_full_name()
+            if ann.author and ann.author.get_full_name()
+            else getattr(ann.author, "username", "Sistem")
+        )
+        announcement_cards.append(
+            {
+                "id": ann.id,
+                "title": ann.title,
+                "body": ann.body,
+                "attachment": ann.attachment,
+                "meta": f"{author_name} • {created_label}",
+                "course_label": f"{ann.course.code} · {ann.course.name}"
+                if ann.course
+                else "Genel Duyuru",
+            }
+        )
+
+    # Bölüm Başkanı için Ekstra Veriler
+    department_stats = None
+    if request.user.role and request.user.role.name == "Head of Department":
+        # 1. Akademik Personel Say?s?
+        total_instructors = User.objects.filter(
+            role__name__in=["Regular Instructor", "Advisor Instructor", "Head of Department"]
+        ).count()
+
+        # 2. Genel Ba?ar? Ortalamas?
+        avg_score = overall_average()
+
+        # 3. Kritik Dersler (Ortalamas? 50'nin alt?nda olanlar)
+        all_courses = Course.objects.all()
+        critical_count = CourseStats.objects.filter(avg_score__lt=50).count()
+        # Son eklenen 5 ders
+        recent_courses = all_courses.only("id", "code").order_by("-id")[:5]
+
+        # Akademik kadro ve ders performans ozetleri
+        instructors = (
+            User.objects.filter(
+                role__name__in=["Regular Instructor", "Advisor Instructor", "Head of Department"]
+            )
+            .order_by("last_name", "first_name", "username")
+            .prefetch_related(
+                Prefetch("courses_given", queryset=with_stats(Course.objects.all()).order_by("code"))
+            )
+        )
+
+        department_stats = {
+            "all_courses_count": all_courses.count(),
+            "total_instructors": total_instructors,
+            "average_score": avg_score,
+            "critical_course_count": critical_count,
+            "recent_courses": recent_courses,
+            "instructors": instructors,
+        }
+
+    # Format last login time
+    last_login = None
+    if request.user.last_login:
+        last_login_local = timezone.localtime(request.user.last_login)
+        month_label = MONTH_LABELS[last_login_local.month - 1]
+        last_login = f"{last_login_local.day} {month_label} {last_login_local.year} · {last_login_local.strftime('%H:%M')}"
+    
+    return render(
+        request,
+        "eys/teacher_dashboard.html",
+        {
+            "course_count": courses.count(),
+            "lo_total": lo_total,
+            "exam_total": exam_total,
+            "connection_total": connection_total,
+            "upcoming_exams": upcoming_exams,
+            "announcement_cards": announcement_cards,
+            "department_stats": department_stats,  # Yeni eklenen veri
+            "last_login": last_login,
+            "calendar_days": calendar_days, # Takvim verisi eklendi
+        },
+    )
+
+
+def teacher_courses(request):
+    courses = (
+        Course.objects.filter(instructor=request.user)
+        .prefetch_related("learningoutcome_set", "exam_set", "students")
+    )
+    return render(request, "eys/teacher_courses.html", {"courses": courses})
+
+
+@login_required
+def edit_course_threshold(request, course_id):
+    course = get_object_or_404(Course, id=course_id)
+    if course.instructor != request.user:
+        messages.error(request, "Bu ders için puan bantlarını sadece dersten sorumlu öğretim elemanı düzenleyebilir.")
+        return redirect("course_detail", course_id=course.id)
+    threshold = get_course_threshold(course)
+    if request.method == "POST":
+        form = CourseThresholdForm(request.POST, instance=threshold)
+        if form.is_valid():
+            form.save()
+            messages.success(request, "Puan bantları güncellendi.")
+            return redirect("course_detail", course_id=course.id)
+    else:
+        form = CourseThresholdForm(instance=threshold)
+    return render(
+        request,
+        "eys/edit_course_threshold.html",
+        {"form": form, "course": course},
+    )
+
+
+def course_detail(request, course_id):
+    course = get_object_or_404(Course, id=course_id)
+    los = LearningOutcome.objects.filter(course=course).prefetch_related(
+        "examloweight_set__exam",
+        "po_weights__programming_outcome",
+    )
+    los = list(los)
+    exams = Exam.objects.filter(course=course).prefetch_related("examloweight_set__learning_outcome")
+    materials_qs = CourseMaterial.objects.filter(course=course).order_by("week", "-created_at")
+    weeks = sorted({m.week for m in materials_qs})
+    try:
+        selected_week = int(request.GET.get("week")) if request.GET.get("week") else None
+    except ValueError:
+        selected_week = None
+    if selected_week:
+        materials_qs = materials_qs.filter(week=selected_week)
+    instructor = course.instructor
+    if instructor:
+        instructor_name = instructor.get_full_name() or instructor.username
+    else:
+        instructor_name = "Atanmadı"
+    now = timezone.now()
+    upcoming_exam_obj = (
+        exams.filter(scheduled_at__isnull=False, scheduled_at__gte=now).order_by("scheduled_at").first()
+    )
+    upcoming_exam_label = (
+        timezone.localtime(upcoming_exam_obj.scheduled_at).strftime("%d.%m.%Y · %H:%M")
+        if upcoming_exam_obj
+        else "Tarih bekleniyor"
+    )
+
+    announcement_qs = (
+        Announcement.objects.filter(course=course)
+        .select_related("author")
+        .order_by("-pinned", "-created_at")[:6]
+    )
+    announcement_cards = []
+    for ann in announcement_qs:
+        created_local = timezone.localtime(ann.created_at)
+        author_name = ann.author.get_full_name() if ann.author and ann.author.get_full_name() else getattr(ann.author, "username", "Sistem")
+        initials = "".join([part[0] for part in author_name.split()[:2]]).upper() if author_name else "?"
+        announcement_cards.append(
+            {
+                "id": ann.id,
+                "title": ann.title,
+                "body": ann.body,
+                "attachment": ann.attachment,
+                "author": author_name,
+                "initials": initials,
+                "timestamp": created_local.strftime("%d.%m.%Y · %H:%M"),
+            }
+        )
+
+    threshold = get_course_threshold(course)
+    threshold_values = threshold.as_dict()
+
+    student_qs = (
+        course.students.all()
+        .select_related("role")
+        .annotate(course_load=Count("courses_taken", distinct=True))
+        .order_by("first_name", "last_name", "username")
+    )
+    exam_results = ExamResult.objects.filter(exam__course=course).values_list("student_id", "score")
+    results_by_student = defaultdict(list)
+    for student_id, score in exam_results:
+        try:
+            results_by_student[student_id].append(float(score))
+        except (TypeError, ValueError):
+            continue
+
+    lo_score_matrix, po_score_matrix = stored_course_outcomes(course.id)
+
+    po_defs = list(ProgrammingOutcome.objects.all().order_by("code", "id"))
+    student_cards = []
+    for student in student_qs:
+        full_name = student.get_full_name() or student.username
+        initials = "".join([part[0] for part in full_name.split()[:2]]).upper() if full_name else student.username[:2].upper()
+        last_login = (
+            timezone.localtime(student.last_login).strftime("%d.%m.%Y · %H:%M")
+            if student.last_login
+            else "Henüz giriş yapmadı"
+        )
+        date_joined = timezone.localtime(student.date_joined).strftime("%d.%m.%Y")
+        scores = results_by_student.get(student.id, [])
+        average_score = round(sum(scores) / len(scores), 2) if scores else None
+        score_for_status = average_score if average_score is not None else 0
+
+        if score_for_status >= threshold_values["stable_min"]:
+            status = "İstikrarlı"
+            status_color = "#1db954"
+        elif score_for_status >= threshold_values["watch_min"]:
+            status = "Takipte"
+            status_color = "#ffb347"
+        else:
+            status = "Destek Gerekli"
+            status_color = "#ff6b6b"
+
+        if average_score is None:
+            pass_label = "Henüz not yok"
+            display_score = "-"
+        elif average_score >= threshold_values["pass_min"]:
+            pass_label = "Geçiyor"
+            display_score = f"{average_score}"
+        else:
+            pass_label = "Geçemeyebilir"
+            display_score = f"{average_score}"
+
+
+        student_lo_scores = lo_score_matrix.get(student.id, {})
+        lo_scores = []
+        for lo in los:
+            lo_score = student_lo_scores.get(lo.id)
+            lo_scores.append(
+                {
+                    "id": lo.id,
+                    "title": lo.title or f"LO {lo.id}",
+                    "score": float(lo_score) if lo_score is not None else None,
+                }
+            )
+
+        student_po_scores = po_score_matrix.get(student.id, {})
+        po_scores = []
+        for po in po_defs:
+            po_score = student_po_scores.get(po.id)
+            po_scores.append(
+                {
+                    "id": po.id,
+                    "code": po.code,
+                    "title": po.title,
+                    "score": float(po_score) if po_score is not None else None,
+                }
+            )
+
+        student_cards.append(
+            {
+                "id": student.id,
+                "name": full_name,
+                "initials": initials,
+                "email": student.email or "Belirtilmedi",
+                "username": student.username,
+                "last_login": last_login,
+                "date_joined": date_joined,
+                "course_load": student.course_load,
+                "average_score": display_score,
+                "status": status,
+                "status_color": status_color,
+                "pass_label": pass_label,
+                "pass_min": threshold_values["pass_min"],
+                "upcoming_exam": upcoming_exam_label,
+                "lo_scores_json": json.dumps(lo_scores, ensure_ascii=True),
+                "po_scores_json": json.dumps(po_scores, ensure_ascii=True),
+            }
+        )
+
+    context = {
+        "course": course,
+        "los": los,
+        "exams": exams,
+        "announcement_cards": announcement_cards,
+        "student_cards": student_cards,
+        "materials": materials_qs,
+        "weeks": weeks,
+        "selected_week": selected_week,
+        "upcoming_exam_label": upcoming_exam_label,
+        "student_count": course.students.count(),
+        "term_label": getattr(course, "term", None) or "Belirtilmedi",
+        "instructor_name": instructor_name,
+        "threshold": threshold,
+    }
+    return render(request, "eys/course_detail.html", context)
+
+
+def add_lo(request, course_id):
+    course = get_object_or_404(Course, id=course_id)
+    if request.method == "POST":
+        form = LOForm(request.POST)
+        if form.is_valid():
+            lo = form.save(commit=False)
+            lo.course = course
+            lo.save()
+            messages.success(request, "LO başarıyla eklendi!")
+            return redirect("course_detail", course_id=course.id)
+    form = LOForm()
+    return render(request, "eys/add_lo.html", {"form": form, "course": course})
+
+
+def add_exam(request, course_id):
+    course = get_object_or_404(Course, id=course_id)
+    if request.method == "POST":
+        form = ExamForm(request.POST)
+        if form.is_valid():
+            exam = form.save(commit=False)
+            exam.course = course
+            exam.save()
+            messages.success(request, "Sınav başarıyla oluşturuldu!")
+            return redirect("course_detail", course_id=course.id)
+    else:
+        form = ExamForm()
+    return render(request, "eys/add_exam.html", {"form": form, "course": course})
+
+
+def add_exam_lo_weight(request, exam_id):
+    exam = get_object_or_404(Exam, id=exam_id)
+    if request.method == "POST":
+        form = ExamLOWeightForm(request.POST)
+        if form.is_valid():
+            weight = form.save(commit=False)
+            weight.exam = exam
+            weight.save()
+            messages.success(request, "Learning Outcome bağlantısı kaydedildi!")
+            return redirect("course_detail", course_id=exam.course.id)
+    form = ExamLOWeightForm()
+    form.fields['learning_outcome'].queryset = LearningOutcome.objects.filter(course=exam.course)
+    return render(request, "eys/add_exam_lo_weight.html", {"form": form, "exam": exam})
+
+
+def add_lo_po_weight(request, lo_id):
+    learning_outcome = get_object_or_404(LearningOutcome.objects.select_related("course"), id=lo_id)
+    if request.method == "POST":
+        form = LOPOWeightForm(request.POST)
+        if form.is_valid():
+            weight = form.save(commit=False)
+            LOPOWeight.objects.update_or_create(
+                learning_outcome=learning_outcome,
+                programming_outcome=weight.programming_outcome,
+                defaults={"weight": weight.weight},
+            )
+            messages.success(request, "Programming Outcome baglantisi kaydedildi!")
+            return redirect("course_detail", course_id=learning_outcome.course.id)
+    form = LOPOWeightForm()
+    return render(
+        request,
+        "eys/add_lo_po_weight.html",
+        {"form": form, "learning_outcome": learning_outcome},
+    )
+
+
+@login_required
+def auto_distribute_lo_po(request, lo_id):
+    learning_outcome = get_object_or_404(LearningOutcome.objects.select_related("course"), id=lo_id)
+    if not request.user.role or request.user.role.name not in TEACHER_ROLES:
+        messages.error(request, "Bu sayfaya erisim yetkiniz yok.")
+        return redirect("home")
+    if learning_outcome.course.instructor != request.user:
+        messages.error(request, "Bu LO icin yetkiniz yok.")
+        return redirect("course_detail", course_id=learning_outcome.course.id)
+    if request.method != "POST":
+        return redirect("course_detail", course_id=learning_outcome.course.id)
+
+    pos = list(ProgrammingOutcome.objects.order_by("code"))
+    if not pos:
+        messages.error(request, "PO tanimi bulunamadi.")
+        return redirect("course_detail", course_id=learning_outcome.course.id)
+
+    count = len(pos)
+    base = (Decimal("100") / Decimal(count)).quantize(Decimal("0.01"))
+    weights = [base] * count
+    diff = Decimal("100.00") - sum(weights)
+    if diff != 0:
+        weights[-1] = (weights[-1] + diff).quantize(Decimal("0.01"))
+
+    for po, weight in zip(pos, weights):
+        LOPOWeight.objects.update_or_create(
+            learning_outcome=learning_outcome,
+            programming_outcome=po,
+            defaults={"weight": float(weight)},
+        )
+
+    messages.success(request, "PO yuzdeleri otomatik dagitildi.")
+    return redirect("course_detail", course_id=learning_outcome.course.id)
+
+
+def exam_detail(request, exam_id):
+    exam = get_object_or_404(Exam, id=exam_id)
+    weights = ExamLOWeight.objects.filter(exam=exam)
+    results = ExamResult.objects.filter(exam=exam).select_related("student").order_by("score")
+    graded_count = results.count()
+    avg_score = results.aggregate(avg=Avg("score"))["avg"] if graded_count else None
+    student_total = exam.course.students.count() if exam.course else 0
+    return render(
+        request,
+        "eys/exam_detail.html",
+        {
+            "exam": exam,
+            "weights": weights,
+            "results": results,
+            "graded_count": graded_count,
+            "average_score": avg_score,
+            "student_total": student_total,
+        },
+    )
+
+
+def teacher_calendar(request):
+    now = timezone.localtime(timezone.now())
+    today = timezone.localdate()
+    state = request.session.get("teacher_calendar_state", {})
+    has_any_params = bool(request.GET)
+
+    def pick_param(key, default):
+        if key in request.GET:
+            return request.GET.get(key)
+        if not has_any_params:
+            return state.get(key, default)
+        return state.get(key, default)
+
+    view_mode = (pick_param("view", "month") or "month").strip().lower()
+
+    try:
+        selected_month = int(pick_param("month", now.month))
+    except (TypeError, ValueError):
+        selected_month = now.month
+    try:
+        selected_year = int(pick_param("year", now.year))
+    except (TypeError, ValueError):
+        selected_year = now.year
+
+    if selected_month < 1 or selected_month > 12:
+        selected_month = now.month
+    if selected_year < 1900 or selected_year > 2100:
+        selected_year = now.year
+
+    prev_year, prev_month = shift_month(selected_year, selected_month, -1)
+    next_year, next_month = shift_month(selected_year, selected_month, 1)
+
+    raw_ids = None
+    if "course_id" in request.GET:
+        raw_ids = request.GET.getlist("course_id")
+    elif has_any_params:
+        raw_ids = []
+    else:
+        raw_ids = state.get("course_ids", [])
+    selected_course_ids = []
+    for rid in raw_ids:
+        try:
+            selected_course_ids.append(int(rid))
+        except (TypeError, ValueError):
+            pass
+
+    courses = Course.objects.filter(instructor=request.user).order_by("code")
+    course_ids = [course.id for course in courses]
+    if selected_course_ids:
+        course_ids = [course_id for course_id in course_ids if course_id in selected_course_ids]
+    serialize = ExamSerializer(now)
+    upcoming_list = [serialize(exam) for exam in upcoming_exams(course_ids, today)]
+
+    if view_mode == "week":
+        week_date_str = pick_param("date", today.isoformat())
+        try:
+            base_date = date.fromisoformat(week_date_str) if week_date_str else today
+        except ValueError:
+            base_date = today
+        start_of_week = base_date - timedelta(days=base_date.weekday())
+        week_exams = exams_between(course_ids, *week_window(start_of_week))
+        days = week_days(start_of_week, group_by_date(serialize(exam) for exam in week_exams), today, MONTH_LABELS)
+        prev_week = (start_of_week - timedelta(days=7)).isoformat()
+        next_week = (start_of_week + timedelta(days=7)).isoformat()
+        current_week = base_date.isoformat()
+        request.session["teacher_calendar_state"] = {
+            "view": view_mode,
+            "month": selected_month,
+            "year": selected_year,
+            "date": current_week,
+            "course_ids": selected_course_ids,
+        }
+        return render(
+            request,
+            "eys/teacher_calendar.html",
+            {
+                "view_mode": "week",
+                "weekday_labels": WEEKDAY_LABELS,
+                "week_days": days,
+                "prev_week": prev_week,
+                "next_week": next_week,
+                "current_week": current_week,
+                "courses": courses,
+                "selected_course_ids": selected_course_ids,
+                "upcoming_list": upcoming_list,
+                "feed_url": request.build_absolute_uri(reverse("calendar_feed", args=[ensure_calendar_token(request.user)])),
+            },
+        )
+    else:
+        month_exams = exams_between(course_ids, *month_window(selected_year, selected_month))
+        calendar_rows = month_grid(
+            selected_year, selected_month, group_by_date(serialize(exam) for exam in month_exams), today
+        )
+
+        request.session["teacher_calendar_state"] = {
+            "view": view_mode,
+            "month": selected_month,
+            "year": selected_year,
+            "date": state.get("date", today.isoformat()),
+            "course_ids": selected_course_ids,
+        }
+        return render(
+            request,
+            "eys/teacher_calendar.html",
+            {
+                "view_mode": "month",
+                "month_name": MONTH_LABELS[selected_month - 1],
+                "selected_year": selected_year,
+                "selected_month": selected_month,
+                "prev_month": {"month": prev_month, "year": prev_year},
+                "next_month": {"month": next_month, "year": next_year},
+                "weekday_labels": WEEKDAY_LABELS,
+                "calendar_rows": calendar_rows,
+                "has_events": has_events(calendar_rows),
+                "upcoming_list": upcoming_list,
+                "feed_url": request.build_absolute_uri(reverse("calendar_feed", args=[ensure_calendar_token(request.user)])),
+                "courses": courses,
+                "selected_course_ids": selected_course_ids,
+            },
+        )
+
+
+@login_required
+def teacher_assignments(request):
+    if not request.user.role or request.user.role.name not in TEACHER_ROLES:
+        messages.error(request, "Bu sayfaya erişim yetkiniz yok.")
+        return redirect("home")
+    assignments = (
+        Assignment.objects.filter(course__instructor=request.user)
+        .select_related("course")
+        .order_by("-published_at", "-created_at")
+    )
+    templates = AssignmentTemplate.objects.filter(created_by=request.user)
+    return render(
+        request,
+        "eys/teacher_assignments.html",
+        {"assignments": assignments, "templates": templates},
+    )
+
+
+@login_required
+def teacher_assignment_create(request):
+    if not request.user.role or request.user.role.name not in TEACHER_ROLES:
+        messages.error(request, "Bu sayfaya erişim yetkiniz yok.")
+        return redirect("home")
+
+    initial = {}
+    try:
+        preferred_course_id = int(request.GET.get("course_id"))
+        course = Course.objects.filter(instructor=request.user, id=preferred_course_id).first()
+        if course:
+            initial["course"] = course
+    except (TypeError, ValueError):
+        pass
+    copy_id = request.GET.get("copy_id")
+    copy_assignment = None
+    if copy_id:
+        copy_assignment = Assignment.objects.filter(
+            id=copy_id,
+            course__instructor=request.user,
+        ).first()
+        if copy_assignment:
+            if "course" not in initial:
+                initial["course"] = copy_assignment.course
+            initial.update(
+                {
+                    "title": copy_assignment.title,
+                    "description": copy_assignment.description,
+                    "max_score": copy_assignment.max_score,
+                    "due_at": copy_assignment.due_at,
+                    "is_group": copy_assignment.is_group,
+                }
+            )
+    template_id = request.GET.get("template_id")
+    template_obj = None
+    if template_id and not copy_assignment:
+        template_obj = AssignmentTemplate.objects.filter(id=template_id, created_by=request.user).first()
+        if template_obj:
+            initial.update(
+                {
+                    "title": template_obj.title,
+                    "description": template_obj.description,
+                    "max_score": template_obj.max_score,
+                }
+            )
+
+    if request.method == "POST":
+        form = AssignmentForm(request.POST, request.FILES, user=request.user)
+        if form.is_valid():
+            assignment = form.save(commit=False)
+            assignment.created_by = request.user
+            if not assignment.published_at:
+                assignment.published_at = timezone.now()
+            assignment.save()
+            # Kriterleri şablondan klonla
+            if template_obj:
+                for crit in template_obj.assignmentcriterion_set.all():
+                    AssignmentCriterion.objects.create(
+                        assignment=assignment,
+                        title=crit.title,
+                        max_score=crit.max_score,
+                        order=crit.order,
+                    )
+            if copy_assignment:
+                for crit in copy_assignment.criteria.all():
+                    AssignmentCriterion.objects.create(
+                        assignment=assignment,
+                        title=crit.title,
+                        max_score=crit.max_score,
+                        order=crit.order,
+                    )
+            notify_users(
+                assignment.course.students.all(),
+                "new_assignment",
+                f"{assignment.course.code} için yeni ödev: {assignment.title}",
+                url=reverse("student_assignment_detail", args=[assignment.id]),
+            )
+            messages.success(request, "Ödev kaydedildi.")
+            return redirect("teacher_assignments")
+    else:
+        form = AssignmentForm(user=request.user, initial=initial)
+    return render(request, "eys/teacher_assignment_form.html", {"form": form})
+
+
+@login_required
+def teacher_assignment_detail(request, assignment_id):
+    assignment = get_object_or_404(
+        Assignment.objects.select_related("course", "created_by"),
+        id=assignment_id,
+        course__instructor=request.user,
+    )
+    status_filter = request.GET.get("status", "").strip()
+    submissions_qs = assignment.submissions.select_related("student").prefetch_related("attachments", "criterion_scores__criterion")
+    if status_filter == "pending":
+        submissions_qs = submissions_qs.filter(score__isnull=True)
+    elif status_filter == "graded":
+        submissions_qs = submissions_qs.filter(score__isnull=False)
+    submissions = submissions_qs.order_by("-submitted_at")
+    submitted_count = submissions.count()
+    total_students = assignment.course.students.count()
+    graded_count = submissions.exclude(score__isnull=True).count()
+    avg_score = submissions.aggregate(avg=Avg("score"))["avg"] if graded_count else None
+    scores = list(submissions.exclude(score__isnull=True).values_list("score", flat=True))
+    min_score = min(scores) if scores else None
+    max_score = max(scores) if scores else None
+    median_score = None
+    std_score = None
+    if scores:
+        sorted_scores = sorted(scores)
+        n = len(sorted_scores)
+        mid = n // 2
+        if n % 2 == 0:
+            median_score = (sorted_scores[mid - 1] + sorted_scores[mid]) / 2
+        else:
+            median_score = sorted_scores[mid]
+        mean_val = float(avg_score) if avg_score is not None else 0
+        variance = sum((float(s) - mean_val) ** 2 for s in sorted_scores) / n
+        std_score = variance ** 0.5
+    missing_students = assignment.course.students.exclude(id__in=submissions.values_list("student_id", flat=True))
+    context = {
+        "assignment": assignment,
+        "submissions": submissions,
+        "submitted_count": submitted_count,
+        "total_students": total_students,
+        "graded_count": graded_count,
+        "average_score": avg_score,
+        "min_score": min_score,
+        "max_score": max_score,
+        "median_score": median_score,
+        "std_score": std_score,
+        "missing_students": missing_students,
+        "status_filter": status_filter,
+        "criteria": assignment.criteria.all(),
+    }
+    return render(request, "eys/teacher_assignment_detail.html", context)
+
+
+@login_required
+def teacher_materials(request):
+    if not request.user.role or request.user.role.name not in TEACHER_ROLES:
+        messages.error(request, "Bu sayfaya erişim yetkiniz yok.")
+        return redirect("home")
+    materials = (
+        CourseMaterial.objects.filter(course__instructor=request.user)
+        .select_related("course")
+        .order_by("course__code", "week", "-created_at")
+    )
+    return render(
+        request,
+        "eys/teacher_materials.html",
+        {"materials": materials},
+    )
+
+
+@login_required
+def create_material(request):
+    if not request.user.role or request.user.role.name not in TEACHER_ROLES:
+        messages.error(request, "Bu sayfaya erişim yetkiniz yok.")
+        return redirect("home")
+    initial = {}
+    try:
+        cid = int(request.GET.get("course_id"))
+        course = Course.objects.filter(instructor=request.user, id=cid).first()
+        if course:
+            initial["course"] = course
+            last_week = CourseMaterial.objects.filter(course=course).order_by("-week").first()
+            if last_week:
+                initial["week"] = last_week.week
+    except (TypeError, ValueError):
+        pass
+    if request.method == "POST":
+        form = CourseMaterialForm(request.POST, request.FILES, user=request.user)
+        if form.is_valid():
+            mat = form.save(commit=False)
+            mat.created_by = request.user
+            mat.save()
+            messages.success(request, "Materyal eklendi.")
+            next_url = request.GET.get("next")
+            if next_url:
+                return redirect(next_url)
+            return redirect("teacher_materials")
+    else:
+        form = CourseMaterialForm(user=request.user, initial=initial)
+    return render(request, "eys/create_material.html", {"form": form})
+
+
+@login_required
+def manage_assignment_criteria(request, assignment_id):
+    assignment = get_object_or_404(Assignment, id=assignment_id, course__instructor=request.user)
+    if request.method == "POST":
+        form = AssignmentCriterionForm(request.POST)
+        if form.is_valid():
+            crit = form.save(commit=False)
+            crit.assignment = assignment
+            crit.save()
+            messages.success(request, "Kriter eklendi.")
+            return redirect("manage_assignment_criteria", assignment_id=assignment.id)
+    else:
+        form = AssignmentCriterionForm()
+    criteria = assignment.criteria.all()
+    return render(
+        request,
+        "eys/manage_assignment_criteria.html",
+        {"assignment": assignment, "form": form, "criteria": criteria},
+    )
+
+
+@login_required
+def manage_assignment_groups(request, assignment_id):
+    assignment = get_object_or_404(Assignment, id=assignment_id, course__instructor=request.user)
+    students_qs = assignment.course.students.all()
+    if request.method == "POST":
+        form = AssignmentGroupForm(request.POST, students_qs=students_qs)
+        if form.is_valid():
+            group = form.save(commit=False)
+            group.assignment = assignment
+            group.save()
+            form.save_m2m()
+            messages.success(request, "Grup kaydedildi.")
+            return redirect("manage_assignment_groups", assignment_id=assignment.id)
+    else:
+        form = AssignmentGroupForm(students_qs=students_qs)
+    groups = assignment.groups.prefetch_related("members")
+    return render(
+        request,
+        "eys/manage_assignment_groups.html",
+        {"assignment": assignment, "form": form, "groups": groups},
+    )
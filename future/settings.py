@@ -31,10 +31,6 @@ ALLOWED_HOSTS = []
 
 # Application definition
 
-print("=" * 80)
-print("DEBUG: future/settings.py is being loaded")
-print("=" * 80)
-
 INSTALLED_APPS = [
     'django.contrib.admin',
     'django.contrib.auth',
@@ -46,10 +42,8 @@ INSTALLED_APPS = [
     'ckeditor',
 ]
 
-print(f"DEBUG: INSTALLED_APPS = {INSTALLED_APPS}")
-print(f"DEBUG: 'eys' in INSTALLED_APPS = {'eys' in INSTALLED_APPS}")
-
 MIDDLEWARE = [
+    'eys.middleware.PerformanceTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',
@@ -60,11 +54,28 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# İsteğe bağlı performans ölçümü (Server-Timing başlığı + "eys.performance" logları).
+# Kapalıyken PerformanceTimingMiddleware zincire hiç eklenmez.
+EYS_PERF_TIMING = os.environ.get('EYS_PERF_TIMING') == '1'
+EYS_PERF_NPLUSONE_THRESHOLD = int(os.environ.get('EYS_PERF_NPLUSONE_THRESHOLD', '5'))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'eys.performance': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
+}
+
 ROOT_URLCONF = 'future.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates ile aynı; EYS_PERF_TIMING açıkken şablon süresini ölçer.
+        'BACKEND': 'eys.middleware.TimedTemplates',
         'DIRS': [],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -92,6 +103,26 @@ DATABASES = {
 }
 
 
+# Cache
+# Navbar sayıları ve ICS gövdeleri önbellekte tutulur ve değişikliklerde
+# silinir (eys.context_processors.invalidate_navbar). Silme tüm süreçlerde
+# görünsün diye önbellek worker'lar arasında paylaşılmalıdır; süreç içi
+# LocMemCache'te diğer worker'lar eski sayıları TTL dolana kadar gösterir.
+# Varsayılan dosya tabanlı önbellek aynı makinedeki süreçlerce paylaşılır;
+# birden fazla makinede EYS_CACHE_BACKEND/EYS_CACHE_LOCATION ile Redis
+# (django.core.cache.backends.redis.RedisCache) veya Memcached verilmelidir.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('EYS_CACHE_BACKEND', 'django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': os.environ.get('EYS_CACHE_LOCATION', str(BASE_DIR / 'cache')),
+    }
+}
+
+# Testler paylaşılan önbellek yerine süreç içi ayrı bir önbellek kullanır.
+TEST_RUNNER = 'eys.test_runner.EYSTestRunner'
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -148,9 +179,3 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = 'eys.User'
-print(f"DEBUG: AUTH_USER_MODEL = {AUTH_USER_MODEL}")
-print("DEBUG: Note: Cannot access User model here - models not loaded yet during settings initialization")
-
-print("=" * 80)
-print("DEBUG: future/settings.py loading complete")
-print("=" * 80)